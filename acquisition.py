@@ -0,0 +1,740 @@
+"""
+Цикл приема и обработки без зависимости от Qt: источник отсчетов, DSP, детектор и запись IQ
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+import dsp
+from bursts import BurstDetector
+from dsp import SpectrumEngine, SpectrumAverager
+from dsp_pool import DSPWorkerPool
+from channelizer import Channelizer
+from iq_recorder import IQRecorder
+from occupancy import OccupancyStats
+from sample_ring import SampleRing, ContinuousReceiver
+from sample_sources import SourceExhausted, open_pluto
+from sdr_config import SDRConfig
+from sweep import SweepPlan
+from zoom import ZoomFFT
+
+
+class Acquisition:
+    """Прием с ADALM-PLUTO (или другого источника) и обработка блоков в кадры спектра"""
+
+    # run() выполняется в вызывающем потоке до stop(), конца файла или ошибки.
+    # Результаты передаются через методы report_* и deliver_frame, которые
+    # переопределяют GUI (PlutoThread) и фоновый монитор (monitor.py).
+
+    def __init__(self):
+        self.sdr = None
+        self.running = False
+        self.center_freq = SDRConfig.DEFAULT_FREQUENCY
+        self.sample_rate = SDRConfig.DEFAULT_SAMPLE_RATE
+        self.bandwidth = SDRConfig.DEFAULT_BANDWIDTH
+        self.gain = SDRConfig.DEFAULT_GAIN
+        self.buffer_size = SDRConfig.DEFAULT_BUFFER_SIZE
+        # Источник отсчетов: функция, возвращающая объект с интерфейсом adi.Pluto
+        self.source_factory = open_pluto
+
+        # Окно, оси и планы FFT пересчитываются только в update_settings
+        self.engine = SpectrumEngine(SDRConfig.FFT_WINDOW, SDRConfig.FFT_WORKERS)
+        self.engine.configure(self.sample_rate, self.buffer_size, self.center_freq)
+        self.averager = SpectrumAverager(
+            SDRConfig.AVERAGING_MODE, SDRConfig.AVERAGING_FRAMES, SDRConfig.WELCH_OVERLAP
+        )
+        self.adaptive = None
+        self.set_detection_mode(SDRConfig.DETECTION_MODE, SDRConfig.CFAR_OFFSET)
+
+        # Непрерывный захват (применяется при следующем подключении)
+        self.continuous_mode = SDRConfig.CONTINUOUS_CAPTURE
+        self.ring = None
+        self.receiver = None
+        self._restart_capture = False
+
+        # Панорамный обзор: (начало, конец) в Гц или None (применяется при следующем подключении)
+        self.sweep_span = None
+        self.sweep_plan = None
+
+        # Масштабирование спектра: (начало, конец) полосы в Гц или None - вся полоса приема
+        self.zoom_span = None
+        self.zoom = None
+        self._zoom_failed = None  # ключ полосы, для которой ZoomFFT не создан (сообщено один раз)
+
+        # План каналов (ключ SDRConfig.CHANNEL_PLANS) или None - мощность каналов не считается
+        self.channel_plan = SDRConfig.CHANNEL_PLAN
+        self.channelizer = None
+        # Занятость каналов в скользящих окнах (по каждому блоку; сбрасывается при смене плана)
+        self.occupancy = None
+
+        # Пакеты во временной области: найденные пакеты и огибающая всех блоков
+        # копятся до отправки кадра и едут в dominant_freq_info['bursts'] и ['envelope']
+        self.burst_detection = SDRConfig.BURST_DETECTION
+        self.burst_detector = None
+        self._pending_bursts = []
+        self._pending_envelope = []
+
+        # Обработка в пуле процессов (применяется при следующем подключении)
+        self.dsp_workers = SDRConfig.DSP_WORKERS
+        self.dsp_pool = None
+        self._local_frames = []
+        self._pool_extras = deque()  # метки и мощности каналов кадров в пуле, в порядке подачи блоков
+
+        # Замеры задержек: метки time.monotonic() этапов едут в dominant_freq_info['timing']
+        self.instrument = SDRConfig.PIPELINE_INSTRUMENTATION
+        self.frames_emitted = 0
+        # Минимальный интервал отправки кадров в непрерывном режиме (0 - каждый кадр)
+        self.emit_interval = SDRConfig.FRAME_EMIT_INTERVAL
+        # Спектр кадра для отображения: минимум и максимум на столбец (0 - полный спектр)
+        self.display_columns = SDRConfig.DISPLAY_COLUMNS
+        self.display_decimator = None
+
+        # Запись сырых отсчетов (только во время сеанса)
+        self.recorder = None
+
+    def connect_pluto(self):
+        """Подключение к ADALM-PLUTO"""
+        try:
+            self.sdr = self.source_factory()
+            self.sdr.rx_rf_bandwidth = int(self.bandwidth)
+            self.sdr.rx_lo = int(self.center_freq)
+            self.sdr.sample_rate = int(self.sample_rate)
+            self.sdr.rx_hardwaregain_chan0 = self.gain
+            self.sdr.rx_buffer_size = self.buffer_size
+            if self.continuous_mode:
+                self.set_kernel_buffers()
+            return True
+        except Exception as e:
+            self.report_error(f"Ошибка подключения к PLUTO: {str(e)}")
+            return False
+
+    def set_kernel_buffers(self):
+        """Увеличить очередь буферов IIO в ядре, чтобы прием не прерывался между rx()"""
+        rxadc = getattr(self.sdr, "_rxadc", None)
+        if rxadc is not None and hasattr(rxadc, "set_kernel_buffers_count"):
+            try:
+                rxadc.set_kernel_buffers_count(SDRConfig.KERNEL_BUFFERS)
+            except Exception:
+                pass  # буфер уже создан - остаемся с количеством по умолчанию
+
+    def disconnect_pluto(self):
+        """Отключение от ADALM-PLUTO"""
+        if self.sdr:
+            close = getattr(self.sdr, "close", None)
+            if close is not None:
+                close()
+            del self.sdr
+            self.sdr = None
+
+    def update_settings(self, freq, sr, bw, gain, buf_size, window=None):
+        """Обновление настроек SDR"""
+        self.center_freq = freq
+        self.sample_rate = sr
+        self.bandwidth = bw
+        self.gain = gain
+        self.buffer_size = buf_size
+        self.engine.configure(sr, buf_size, freq, window)
+        # Шумовой пол после смены усиления или частоты набирается заново
+        self.set_detection_mode(self.detection_mode, self.cfar_offset)
+
+        # В одной записи SigMF частота дискретизации постоянна - запись завершается
+        recorder = self.recorder
+        if recorder is not None:
+            if recorder.sample_rate != float(sr):
+                self.stop_recording("sample_rate")
+            else:
+                recorder.retune(freq, gain)
+
+        # В непрерывном режиме и при обзоре настройки применяет сам поток
+        if (self.continuous_mode or self.sweep_span is not None) and self.running:
+            self._restart_capture = True
+            return
+
+        if self.sdr:
+            try:
+                self.apply_sdr_settings()
+            except Exception as e:
+                self.report_error(f"Ошибка обновления настроек: {str(e)}")
+
+    def apply_sdr_settings(self):
+        """Запись текущих настроек в устройство"""
+        self.sdr.rx_lo = int(self.center_freq)
+        self.sdr.sample_rate = int(self.sample_rate)
+        self.sdr.rx_rf_bandwidth = int(self.bandwidth)
+        self.sdr.rx_hardwaregain_chan0 = self.gain
+        self.sdr.rx_buffer_size = self.buffer_size
+
+    def calculate_rssi(self, samples):
+        """Расчет RSSI"""
+        return dsp.calculate_rssi(samples)
+
+    def calculate_peak_power(self, fft_data):
+        """Расчет пиковой мощности из FFT"""
+        return dsp.calculate_peak_power(fft_data)
+
+    def find_dominant_frequency(self, fft_data, freq_axis, threshold_db=None):
+        """Найти доминирующую частоту в спектре"""
+        if threshold_db is None:
+            threshold_db = SDRConfig.SIGNAL_DETECTION_THRESHOLD
+        return dsp.find_dominant_frequency(fft_data, freq_axis, self.center_freq, threshold_db)
+
+    def set_averaging(self, mode, frames, overlap):
+        """Смена режима усреднения (накопленные данные сбрасываются)"""
+        # Новый объект подменяется целиком, поток обработки не видит полуобновленное состояние
+        self.averager = SpectrumAverager(mode, frames, overlap)
+
+    def set_detection_mode(self, mode, offset_db):
+        """Смена режима порога обнаружения (фиксированный или адаптивный CFAR)"""
+        self.detection_mode = mode
+        self.cfar_offset = offset_db
+        if mode == "adaptive":
+            self.adaptive = dsp.AdaptiveThreshold(
+                offset_db, SDRConfig.CFAR_TRAINING_CELLS, SDRConfig.CFAR_GUARD_CELLS, SDRConfig.NOISE_FLOOR_FRAMES
+            )
+        else:
+            self.adaptive = None
+
+    def zoom_for(self, size):
+        """ZoomFFT для выбранной полосы (пересоздается при смене полосы или настроек) или None"""
+        span = self.zoom_span
+        if span is None or self.sweep_span is not None:
+            return None
+        zoom = self.zoom
+        key = (span, float(self.sample_rate), size, float(self.center_freq), self.engine.window_name)
+        if zoom is None or zoom.key != key:
+            if key == self._zoom_failed:
+                return None
+            try:
+                zoom = ZoomFFT(
+                    span[0], span[1], self.sample_rate, size, self.center_freq, self.engine.window_name,
+                    SDRConfig.ZOOM_TAPS_PER_PHASE, SDRConfig.ZOOM_OVERSAMPLE
+                )
+            except ValueError as e:
+                # Полоса вне полосы приема (после перестройки) - обрабатывается вся полоса;
+                # ключ запоминается, чтобы не пересоздавать ZoomFFT и не сообщать на каждом блоке
+                self._zoom_failed = key
+                self.report_error(
+                    f"Масштабирование {span[0] / 1e6:.3f}-{span[1] / 1e6:.3f} МГц недоступно ({e}): "
+                    "обрабатывается вся полоса"
+                )
+                return None
+            self.zoom = zoom
+        return zoom
+
+    def channelizer_for(self, size):
+        """Банк фильтров для выбранного плана каналов (пересоздается при смене настроек) или None"""
+        plan = SDRConfig.CHANNEL_PLANS.get(self.channel_plan)
+        if plan is None or self.sweep_span is not None:
+            return None
+        channelizer = self.channelizer
+        key = (tuple(plan['channels']), float(plan['spacing']), float(self.sample_rate), size, float(self.center_freq))
+        if channelizer is None or channelizer.key != key:
+            channelizer = Channelizer(
+                plan['channels'], plan['spacing'], self.sample_rate, size, self.center_freq,
+                SDRConfig.CHANNEL_TAPS, SDRConfig.CHANNEL_BUSY_MARGIN
+            )
+            self.channelizer = channelizer
+            occupancy = self.occupancy
+            if occupancy is None or not np.array_equal(occupancy.frequencies, plan['channels']):
+                self.occupancy = OccupancyStats(plan['channels'], SDRConfig.OCCUPANCY_WINDOWS)
+        return channelizer
+
+    def measure_channels(self, samples):
+        """Мощность каналов плана по блоку: (каналы, порог занятости) или None"""
+        channelizer = self.channelizer_for(len(samples))
+        if channelizer is None:
+            return None
+        channels = channelizer.process(samples)
+        self.occupancy.update(channels, len(samples) / self.sample_rate, time.time())
+        return channels, channelizer.threshold
+
+    def detect_bursts(self, samples, contiguous):
+        """Пакеты и огибающая блока (в очередь до отправки кадра)"""
+        if not self.burst_detection:
+            self.burst_detector = None
+            return
+        detector = self.burst_detector
+        if detector is None or detector.sample_rate != float(self.sample_rate):
+            detector = self.burst_detector = BurstDetector(
+                self.sample_rate, SDRConfig.BURST_WINDOW, SDRConfig.BURST_MARGIN,
+                SDRConfig.BURST_FLOOR_RISE, SDRConfig.BURST_ENVELOPE_POINTS
+            )
+            contiguous = False
+        bursts, times, levels = detector.process(samples, contiguous, time.time())
+        if len(bursts):
+            self._pending_bursts.append(bursts)
+        if len(times):
+            self._pending_envelope.append((times, levels))
+
+    def attach_extras(self, frame, timing, channels):
+        """Добавить к кадру метки этапов и мощность каналов"""
+        if timing is not None:
+            timing['dsp_end'] = time.monotonic()
+            frame[3]['timing'] = timing
+        if channels is not None:
+            frame[3]['channels'], frame[3]['channel_threshold'] = channels
+        return frame
+
+    def process_zoom(self, samples, zoom):
+        """Обработка блока в режиме масштабирования: спектр, порог и пики только выбранной полосы"""
+        power = zoom.power(samples)
+        if self.averager.active:
+            power = self.averager.combine(power)
+        fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis = dsp.analyze_spectrum(
+            dsp.power_to_db(power), dsp.calculate_rssi(samples), zoom.freq_axis, self.center_freq,
+            SDRConfig.get_detection_params(), self.adaptive
+        )
+        return fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, self.center_freq
+
+    def process_samples(self, samples, contiguous=True):
+        """Обработка одного блока: кадр в формате сигнала data_ready"""
+        zoom = self.zoom_for(len(samples))
+        if zoom is not None:
+            return self.process_zoom(samples, zoom)
+        fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis = dsp.process_block(
+            samples, self.engine, self.center_freq, SDRConfig.get_detection_params(),
+            self.averager, contiguous, self.adaptive
+        )
+        return fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, self.center_freq
+
+    def start_dsp(self):
+        """Запуск пула процессов DSP, если он включен"""
+        if self.dsp_workers > 0:
+            self.dsp_pool = DSPWorkerPool(max(self.buffer_size, SDRConfig.DSP_POOL_MIN_BLOCK), self.dsp_workers)
+
+    def stop_dsp(self):
+        """Остановка пула процессов DSP"""
+        if self.dsp_pool is not None:
+            self.dsp_pool.close()
+            self.dsp_pool = None
+        self._local_frames = []
+        self._pool_extras.clear()
+
+    def submit_samples(self, samples, contiguous=True, timing=None):
+        """Передать блок на обработку (в пул процессов или в текущий поток)"""
+        # timing - метки приема блока, если включены замеры задержек (иначе None)
+        if timing is not None:
+            timing['dsp_start'] = time.monotonic()
+        # Банк фильтров и огибающая стоят примерно по одному FFT и считаются здесь же,
+        # до передачи блока в пул
+        channels = self.measure_channels(samples)
+        self.detect_bursts(samples, contiguous)
+        # Масштабирование дешевле полного FFT и считается в текущем потоке, как и короткие
+        # блоки: для них передача через пул дороже самой обработки
+        if self.dsp_pool is None or self.zoom_for(len(samples)) is not None or len(samples) < SDRConfig.DSP_POOL_MIN_BLOCK:
+            if self.dsp_pool is not None:
+                # Блоки, поданные в пул раньше, должны выйти раньше этого кадра
+                self._local_frames.extend(self.drain_pool())
+            frame = self.process_samples(samples, contiguous)
+            self._local_frames.append(self.attach_extras(frame, timing, channels))
+            return
+
+        # Размер слотов разделяемой памяти задается при создании пула; блоки не длиннее слота
+        # идут в прежний пул, а перед пересозданием дорабатываются уже поданные
+        if len(samples) > self.dsp_pool.block_size:
+            self._local_frames.extend(self.drain_pool())
+            self.dsp_pool.close()
+            self.dsp_pool = DSPWorkerPool(len(samples), self.dsp_workers)
+
+        if timing is not None:
+            timing['pool_depth'] = self.dsp_pool.pending()
+        self._pool_extras.append((timing, channels))
+
+        detection = SDRConfig.get_detection_params()
+        averager = self.averager
+        if averager.active or self.adaptive is not None:
+            # Усреднение и адаптивный порог зависят от порядка кадров - пул возвращает мощность.
+            # Хвост для сегментов Уэлча готовится здесь, пока блоки идут по порядку
+            stream = averager.prepare(samples, contiguous)
+            self.dsp_pool.submit(samples, self.engine, detection, stream, averager.hop(len(samples)))
+        else:
+            self.dsp_pool.submit(samples, self.engine, detection)
+
+    def collect_frames(self, timeout=0.0):
+        """Готовые кадры в порядке поступления блоков"""
+        frames, self._local_frames = self._local_frames, []
+        if self.dsp_pool is None:
+            return frames
+        # Кадры текущего потока поданы раньше блоков, которые сейчас в пуле
+        frames.extend(self.collect_pool(timeout if not frames else 0.0))
+        return frames
+
+    def collect_pool(self, timeout=0.0):
+        """Готовые кадры пула с метками и мощностями каналов"""
+        frames = []
+        for frame in self.dsp_pool.collect(timeout):
+            timing, channels = self._pool_extras.popleft()
+            frames.append(self.attach_extras(self.finish_pool_frame(frame), timing, channels))
+        return frames
+
+    def drain_pool(self):
+        """Дождаться всех блоков, поданных в пул (кадры в порядке подачи)"""
+        frames = []
+        while self.dsp_pool.pending():
+            frames.extend(self.collect_pool(timeout=0.5))
+        return frames
+
+    def drain_frames(self):
+        """Все оставшиеся кадры, включая блоки, которые еще обрабатываются в пуле"""
+        frames = self.collect_frames()
+        while self.dsp_pool is not None and self.dsp_pool.pending():
+            frames.extend(self.collect_frames(timeout=0.5))
+        return frames
+
+    def finish_pool_frame(self, frame):
+        """Усреднение кадра из пула: пул вернул мощность, остальное считается здесь по порядку"""
+        if frame[2] is not None:
+            return frame
+        power, rssi, _, _, freq_axis, center_freq = frame
+        fft_magnitude = dsp.power_to_db(self.averager.combine(power))
+        fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis = dsp.analyze_spectrum(
+            fft_magnitude, rssi, freq_axis, center_freq, SDRConfig.get_detection_params(), self.adaptive
+        )
+        return fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, center_freq
+
+    def reduce_for_display(self, frame):
+        """Кадр с прореженными спектром, порогом и осью (пики остаются в полном разрешении)"""
+        fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, center_freq = frame
+        decimator = self.display_decimator
+        if decimator is None or decimator.columns != self.display_columns:
+            decimator = self.display_decimator = dsp.DisplayDecimator(self.display_columns)
+        if not decimator.active(len(fft_magnitude)):
+            return frame
+        display_axis = decimator.axis(freq_axis)
+        if dominant_freq_info['threshold'] is not None:
+            dominant_freq_info['threshold'] = decimator.reduce(dominant_freq_info['threshold'])
+        return decimator.reduce(fft_magnitude), rssi, peak_power, dominant_freq_info, display_axis, center_freq
+
+    def emit_frame(self, frame):
+        """Передать кадр получателю (с меткой отправки, если кадр несет метки этапов)"""
+        if self.display_columns:
+            frame = self.reduce_for_display(frame)
+        if self._pending_envelope:
+            times, levels = zip(*self._pending_envelope)
+            frame[3]['envelope'] = (np.concatenate(times), np.concatenate(levels))
+            self._pending_envelope = []
+        if self._pending_bursts:
+            frame[3]['bursts'] = np.concatenate(self._pending_bursts)
+            self._pending_bursts = []
+        timing = frame[3].get('timing')
+        if timing is not None:
+            timing['emit'] = time.monotonic()
+        self.frames_emitted += 1
+        self.deliver_frame(frame)
+
+    def run(self):
+        """Основной цикл получения данных"""
+        if not self.connect_pluto():
+            return
+
+        self.running = True
+
+        try:
+            self.start_dsp()
+        except Exception as e:
+            self.report_error(f"Ошибка запуска DSP: {str(e)}")
+            self.disconnect_pluto()
+            return
+
+        # Обзор перестраивает устройство сам; файл без темпа реального времени
+        # воспроизводится через кольцо без потерь
+        if self.sweep_span is not None:
+            self.run_sweep()
+            self.running = False
+            self.stop_recording()
+            self.stop_dsp()
+            self.disconnect_pluto()
+            return
+        if self.continuous_mode or not getattr(self.sdr, "realtime", True):
+            self.run_continuous()
+            self.running = False
+            self.stop_recording()
+            self.stop_dsp()
+            self.disconnect_pluto()
+            return
+
+        last_stats = time.monotonic()
+        while self.running:
+            try:
+                # Получение данных с PLUTO
+                instrument = self.instrument
+                rx_start = time.monotonic() if instrument else None
+                samples = self.sdr.rx()
+                timing = {'rx_start': rx_start, 'rx_end': time.monotonic()} if instrument else None
+                recorder = self.recorder
+                if recorder is not None:
+                    recorder.submit(samples, contiguous=False)
+
+                # Обработка и отправка данных в основной поток
+                # (между вызовами rx() есть пауза, поэтому блоки не примыкают друг к другу)
+                self.submit_samples(samples, contiguous=False, timing=timing)
+                for frame in self.collect_frames(timeout=0.5):
+                    self.emit_frame(frame)
+
+                now = time.monotonic()
+                if now - last_stats >= SDRConfig.CAPTURE_STATS_INTERVAL:
+                    self.emit_record_stats()
+                    last_stats = now
+
+                # Небольшая пауза
+                time.sleep(0.05)
+
+            except SourceExhausted:
+                self.report_source_finished()
+                break
+            except Exception as e:
+                self.report_error(f"Ошибка получения данных: {str(e)}")
+                break
+
+        # Цикл мог завершиться сам (конец файла, ошибка) - настройки снова применяются напрямую
+        self.running = False
+        self.stop_recording()
+        self.stop_dsp()
+        self.disconnect_pluto()
+
+    def run_continuous(self):
+        """Непрерывный захват: приемник наполняет кольцо, DSP обрабатывает каждый блок"""
+        self.start_receiver()
+        pending_frame = None
+        last_emit = last_stats = time.monotonic()
+
+        while self.running:
+            try:
+                if self._restart_capture:
+                    self.restart_receiver()
+                    pending_frame = None
+
+                samples = self.ring.read(timeout=0.5)
+                if samples is None:
+                    if self.receiver.error is not None:
+                        raise self.receiver.error
+                    continue
+
+                timing = None
+                if self.instrument:
+                    # Время приема блока записал поток приема; ожидание в кольце - этап ring
+                    timing = {'rx_end': float(self.ring.last_read_time), 'ring_depth': self.ring.pending()}
+                self.submit_samples(samples, self.ring.last_read_contiguous, timing)
+
+                # Между отправками в GUI оставляем кадр с наибольшей пиковой мощностью,
+                # чтобы короткие пакеты не терялись при прореживании отображения
+                for frame in self.collect_frames():
+                    if pending_frame is None or frame[2] > pending_frame[2]:
+                        pending_frame = frame
+
+                now = time.monotonic()
+                if pending_frame is not None and now - last_emit >= self.emit_interval:
+                    self.emit_frame(pending_frame)
+                    pending_frame = None
+                    last_emit = now
+
+                if now - last_stats >= SDRConfig.CAPTURE_STATS_INTERVAL:
+                    self.report_capture_stats(self.receiver.stats())
+                    self.emit_record_stats()
+                    last_stats = now
+
+            except SourceExhausted:
+                # Файл закончился: дообрабатываем блоки в пуле и показываем последний кадр
+                for frame in self.drain_frames():
+                    if pending_frame is None or frame[2] > pending_frame[2]:
+                        pending_frame = frame
+                if pending_frame is not None:
+                    self.emit_frame(pending_frame)
+                self.report_capture_stats(self.receiver.stats())
+                self.report_source_finished()
+                break
+            except Exception as e:
+                self.report_error(f"Ошибка получения данных: {str(e)}")
+                break
+
+        self.stop_receiver()
+
+    def run_sweep(self):
+        """Панорамный обзор: шаг за шагом перестраивает rx_lo и сшивает спектры в один кадр"""
+        # Конвейер: сразу после приема шага устройство перестраивается на следующий, и FFT
+        # принятого шага считается, пока синтезатор устанавливается, а в буферы идут
+        # отбрасываемые отсчеты. Скорость обзора ограничивается приемом, а не обработкой.
+        settle = SDRConfig.SWEEP_SETTLE_BUFFERS
+        dwell = max(1, SDRConfig.SWEEP_DWELL_BUFFERS)
+        plan = None
+        pending = None  # (шаг, блоки) - принято, но еще не обработано
+        step = 0
+        tuned_lo = None
+        sweep_started = last_stats = time.monotonic()
+        sweeps = 0
+
+        while self.running:
+            try:
+                if self._restart_capture:
+                    self._restart_capture = False
+                    if hasattr(self.sdr, "rx_destroy_buffer"):
+                        self.sdr.rx_destroy_buffer()
+                    self.apply_sdr_settings()
+                    tuned_lo = None
+                key = (min(self.sweep_span), max(self.sweep_span), float(self.sample_rate), int(self.buffer_size))
+                if plan is None or plan.key != key:
+                    plan = SweepPlan(*self.sweep_span, self.sample_rate, self.buffer_size,
+                                     SDRConfig.SWEEP_USABLE_FRACTION)
+                    self.sweep_plan = plan
+                    pending = None
+                    step = 0
+                    sweep_started = time.monotonic()
+
+                lo = int(round(plan.centers[step]))
+                retuned = lo != tuned_lo
+                if retuned:
+                    self.sdr.rx_lo = lo
+                    tuned_lo = lo
+
+                if pending is not None:
+                    done_step, blocks = pending
+                    pending = None
+                    self.add_sweep_segment(plan, done_step, blocks)
+                    if done_step == plan.steps - 1:
+                        now = time.monotonic()
+                        self.emit_sweep_frame(plan, sweep_started, now)
+                        sweeps += 1
+                        if now - last_stats >= SDRConfig.CAPTURE_STATS_INTERVAL:
+                            self.report_sweep_stats({
+                                'sweep_time': now - sweep_started,
+                                'steps': plan.steps,
+                                'span': plan.stop - plan.start,
+                                'rate': (plan.stop - plan.start) / max(now - sweep_started, 1e-9),
+                                'sweeps': sweeps,
+                            })
+                            last_stats = now
+                        sweep_started = now
+
+                # Буферы, начатые до перестройки, отбрасываются
+                if retuned:
+                    for _ in range(settle):
+                        self.sdr.rx()
+                pending = (step, [self.sdr.rx() for _ in range(dwell)])
+                step = (step + 1) % plan.steps
+
+            except SourceExhausted:
+                self.report_source_finished()
+                break
+            except Exception as e:
+                self.report_error(f"Ошибка получения данных: {str(e)}")
+                break
+
+    def add_sweep_segment(self, plan, step, blocks):
+        """Спектр мощности шага (среднее по блокам шага) - в панораму"""
+        samples = blocks[0] if len(blocks) == 1 else np.stack(blocks)
+        power = self.engine.power(samples)
+        if power.ndim > 1:
+            power = power.mean(axis=0)
+        plan.add_segment(step, power, float(np.mean(samples.real ** 2 + samples.imag ** 2)))
+
+    def emit_sweep_frame(self, plan, sweep_started, sweep_finished):
+        """Кадр панорамы в формате data_ready (центр - середина диапазона обзора)"""
+        dsp_start = time.monotonic()
+        fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis = dsp.analyze_spectrum(
+            plan.spectrum_db(), plan.rssi(), plan.offset_axis, plan.center_freq,
+            SDRConfig.get_detection_params(), self.adaptive
+        )
+        if self.instrument:
+            dominant_freq_info['timing'] = {
+                'rx_start': sweep_started, 'rx_end': sweep_finished,
+                'dsp_start': dsp_start, 'dsp_end': time.monotonic(),
+            }
+        self.emit_frame((fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, plan.center_freq))
+
+    def start_receiver(self):
+        """Создать кольцо под текущий размер буфера и запустить поток приема"""
+        # Источник без темпа реального времени ждет обработку, а не перезаписывает кольцо
+        overwrite = getattr(self.sdr, "realtime", True)
+        # Для больших буферов число блоков ограничено объемом кольца в отсчетах
+        num_blocks = max(4, min(SDRConfig.RING_BUFFER_BLOCKS, SDRConfig.RING_BUFFER_SAMPLES // self.buffer_size))
+        self.ring = SampleRing(self.buffer_size, num_blocks, overwrite=overwrite)
+        self.receiver = ContinuousReceiver(self.sdr, self.ring, self.sample_rate, self.recorder)
+        self.receiver.start()
+
+    def stop_receiver(self):
+        """Остановить поток приема"""
+        if self.receiver is not None:
+            self.receiver.stop()
+            self.receiver = None
+
+    def restart_receiver(self):
+        """Применить новые настройки: остановить прием, перенастроить устройство и запустить снова"""
+        self._restart_capture = False
+        self.stop_receiver()
+        try:
+            # Буфер IIO нужно пересоздать, иначе новый размер буфера не применится
+            if hasattr(self.sdr, "rx_destroy_buffer"):
+                self.sdr.rx_destroy_buffer()
+            self.apply_sdr_settings()
+            self.set_kernel_buffers()
+        except Exception as e:
+            self.report_error(f"Ошибка обновления настроек: {str(e)}")
+        self.start_receiver()
+
+    def start_recording(self, path, fmt, max_seconds):
+        """Начать запись сырых отсчетов в path.sigmf-data / path.sigmf-meta"""
+        recorder = IQRecorder(
+            path, self.sample_rate, self.center_freq, self.gain, fmt, max_seconds,
+            self.bandwidth, SDRConfig.IQ_RECORD_QUEUE_SECONDS, on_finished=self.on_recording_finished
+        )
+        recorder.start()
+        self.recorder = recorder
+        receiver = self.receiver
+        if receiver is not None:
+            receiver.recorder = recorder
+        return recorder
+
+    def stop_recording(self, reason="stopped", timeout=None):
+        """Завершить запись; файл дописывается и закрывается в потоке записи"""
+        recorder, self.recorder = self.recorder, None
+        receiver = self.receiver
+        if receiver is not None:
+            receiver.recorder = None
+        if recorder is not None:
+            recorder.stop(reason, timeout)
+
+    def on_recording_finished(self, recorder):
+        """Запись завершилась (вызывается из потока записи)"""
+        if self.recorder is recorder:
+            # Файл заполнен или ошибка записи - отключаем запись от приема
+            self.stop_recording()
+        stats = recorder.stats()
+        stats['error'] = str(recorder.error) if recorder.error is not None else None
+        self.report_recording_finished(stats)
+
+    def emit_record_stats(self):
+        """Отправить статистику записи, если она идет"""
+        recorder = self.recorder
+        if recorder is not None:
+            self.report_record_stats(recorder.stats())
+
+    def stop(self):
+        """Остановка цикла приема"""
+        self.running = False
+
+    # Уведомления из цикла приема. По умолчанию ничего не делают: PlutoThread
+    # переводит их в сигналы Qt, фоновый монитор - в записи журнала.
+
+    def deliver_frame(self, frame):
+        """Готовый кадр: fft_data, rssi, peak_power, dominant_freq_info, freq_axis, center_freq"""
+
+    def report_error(self, message):
+        """Ошибка подключения, настройки или приема"""
+
+    def report_capture_stats(self, stats):
+        """Статистика непрерывного захвата (ContinuousReceiver.stats)"""
+
+    def report_record_stats(self, stats):
+        """Статистика записи IQ (IQRecorder.stats)"""
+
+    def report_recording_finished(self, stats):
+        """Итог записи IQ; reason - причина завершения, error - текст ошибки"""
+
+    def report_sweep_stats(self, stats):
+        """Скорость обзора: sweep_time, steps, span, rate (Гц/с), sweeps"""
+
+    def report_source_finished(self):
+        """Воспроизведение файла дошло до конца"""
@@ -0,0 +1,4 @@
+"""
+Бенчмарки анализатора (запуск из корня репозитория: python -m benchmarks.<модуль>)
+Автор: ADALM-PLUTO Power Analyzer
+"""
@@ -0,0 +1,92 @@
+"""
+Сравнение временного фильтра частот: прежний линейный поиск по словарю и индекс по корзинам
+Запуск: python -m benchmarks.bench_frequency_log [--active 10000] [--lookups 20000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from frequency_log import FrequencyLogFilter
+from sdr_config import SDRConfig
+
+
+class LinearFrequencyLog:
+    """Прежний алгоритм PowerAnalyzer.should_log_frequency (эталон для сравнения)"""
+
+    def __init__(self, tolerance, timeout):
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.history = {}
+
+    def should_log(self, frequency, now):
+        for logged_freq, last_time in list(self.history.items()):
+            if abs(frequency - logged_freq) <= self.tolerance:
+                if now - last_time < self.timeout:
+                    return False
+                del self.history[logged_freq]
+                self.history[frequency] = now
+                return True
+        self.history[frequency] = now
+        cutoff_time = now - 3600
+        self.history = {freq: log_time for freq, log_time in self.history.items() if log_time > cutoff_time}
+        return True
+
+
+def make_workload(active, lookups, tolerance, seed=0):
+    """Активные передатчики на сетке шире допуска и поток обнаружений с дрожанием частоты"""
+    rng = np.random.default_rng(seed)
+    channels = 863e6 + np.arange(active) * 2.5 * tolerance
+    detections = rng.choice(channels, lookups) + rng.uniform(-0.4, 0.4, lookups) * tolerance
+    # Часть обнаружений - новые частоты между каналами
+    new = rng.random(lookups) < 0.1
+    detections[new] += 1.25 * tolerance
+    return channels, detections
+
+
+def run(log, channels, detections, start_time):
+    """Заполнить индекс активными частотами и измерить время проверок"""
+    for i, frequency in enumerate(channels):
+        log.should_log(frequency, start_time + i * 1e-4)
+    now = start_time + len(channels) * 1e-4
+    logged = 0
+    start = time.perf_counter()
+    for i, frequency in enumerate(detections):
+        logged += log.should_log(frequency, now + i * 1e-3)
+    elapsed = time.perf_counter() - start
+    return elapsed, logged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение временного фильтра частот")
+    parser.add_argument("--active", type=int, default=10000, help="активных частот в истории")
+    parser.add_argument("--lookups", type=int, default=20000, help="проверок для индекса по корзинам")
+    parser.add_argument("--linear-lookups", type=int, default=500, help="проверок для линейного поиска")
+    args = parser.parse_args()
+
+    tolerance = SDRConfig.FREQUENCY_TOLERANCE
+    timeout = SDRConfig.FREQUENCY_LOG_TIMEOUT
+    channels, detections = make_workload(args.active, args.lookups, tolerance)
+    start_time = time.time()
+
+    indexed_time, indexed_logged = run(FrequencyLogFilter(tolerance, timeout), channels, detections, start_time)
+    # Линейный поиск на 10k частотах медленный - меряем на префиксе того же потока
+    linear_count = min(args.linear_lookups, args.lookups)
+    linear_time, linear_logged = run(
+        LinearFrequencyLog(tolerance, timeout), channels, detections[:linear_count], start_time
+    )
+    check_time, check_logged = run(
+        FrequencyLogFilter(tolerance, timeout), channels, detections[:linear_count], start_time
+    )
+
+    print(f"active frequencies: {args.active}")
+    print(f"{'algorithm':<10} {'lookups':>8} {'us/lookup':>10} {'logged':>8}")
+    print(f"{'linear':<10} {linear_count:8d} {linear_time / linear_count * 1e6:10.2f} {linear_logged:8d}")
+    print(f"{'indexed':<10} {linear_count:8d} {check_time / linear_count * 1e6:10.2f} {check_logged:8d}")
+    print(f"{'indexed':<10} {args.lookups:8d} {indexed_time / args.lookups * 1e6:10.2f} {indexed_logged:8d}")
+    print(f"speedup: x{(linear_time / linear_count) / (indexed_time / args.lookups):.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Сравнение скорости отрисовки профилей quality и performance (offscreen Qt)
+Запуск: python -m benchmarks.bench_render [--frames 300] [--size 8192] [--history 1000000] [--waterfall-depth 1000]
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+import dsp
+from rssi_868 import PowerAnalyzer, SDRConfig, apply_render_profile
+
+
+def make_frames(count, size, sample_rate, center_freq, seed=0):
+    """Набор кадров с тоном над порогом обнаружения и шумом"""
+    engine = dsp.SpectrumEngine(SDRConfig.FFT_WINDOW)
+    engine.configure(sample_rate, size, center_freq)
+    rng = np.random.default_rng(seed)
+    t = np.arange(size) / sample_rate
+    frames = []
+    for i in range(count):
+        tone_freq = (0.05 + 0.3 * i / count) * sample_rate
+        samples = 2000 * np.exp(2j * np.pi * tone_freq * t)
+        samples += 20 * (rng.standard_normal(size) + 1j * rng.standard_normal(size))
+        frame = dsp.process_block(samples, engine, center_freq, SDRConfig.get_detection_params())
+        frames.append(frame + (center_freq,))
+    return frames
+
+
+def render_plots(window):
+    """Принудительная отрисовка графиков (offscreen-платформа сама не перерисовывает окно)"""
+    for plot in (window.fft_plot, window.waterfall_plot, window.rssi_plot, window.power_plot):
+        plot.grab()
+
+
+def run_profile(app, profile, frames, count, history=0):
+    """Отрисовать count кадров в заданном профиле и измерить частоту кадров"""
+    SDRConfig.RENDER_PROFILE = profile
+    apply_render_profile(profile)
+    window = PowerAnalyzer()
+    window.resize(1200, 800)
+    window.show()
+    # Кадры подаются напрямую, таймер планировщика не нужен
+    window.render_scheduler.render_timer.stop()
+    window.hold_checkbox.setChecked(True)
+    # Заполненная история RSSI: стоимость отрисовки не должна от нее зависеть
+    for i in range(history):
+        window.history.append(i * 0.01, frames[i % len(frames)][1], frames[i % len(frames)][2])
+    window.start_time -= history * 0.01
+    app.processEvents()
+
+    # Прогрев: первая отрисовка создает кэши шрифтов и путей
+    for frame in frames[:10]:
+        window.record_history(frame[1], frame[2])
+        window.record_waterfall(frame[0], frame[4], frame[5])
+        window.update_data(*frame)
+        render_plots(window)
+
+    update_time = 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        frame = frames[i % len(frames)]
+        frame_start = time.perf_counter()
+        window.record_history(frame[1], frame[2])
+        window.record_waterfall(frame[0], frame[4], frame[5])
+        window.update_data(*frame)
+        update_time += time.perf_counter() - frame_start
+        render_plots(window)
+    elapsed = time.perf_counter() - start
+
+    window.close()
+    app.processEvents()
+    return {
+        'profile': profile,
+        'fps': count / elapsed,
+        'update_ms': update_time / count * 1e3,
+        'frame_ms': elapsed / count * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение профилей отрисовки")
+    parser.add_argument("--frames", type=int, default=300, help="количество отрисованных кадров")
+    parser.add_argument("--size", type=int, default=SDRConfig.DEFAULT_BUFFER_SIZE, help="точек FFT")
+    parser.add_argument("--history", type=int, default=0, help="точек истории RSSI до начала замера")
+    parser.add_argument("--waterfall-depth", type=int, default=SDRConfig.WATERFALL_DEPTH,
+                        help="строк водопада (0 - без водопада)")
+    args = parser.parse_args()
+    SDRConfig.WATERFALL_ENABLED = args.waterfall_depth > 0
+    SDRConfig.WATERFALL_DEPTH = max(args.waterfall_depth, 1)
+
+    app = QApplication([])
+    frames = make_frames(32, args.size, SDRConfig.DEFAULT_SAMPLE_RATE, SDRConfig.DEFAULT_FREQUENCY)
+
+    results = [run_profile(app, profile, frames, args.frames, args.history) for profile in SDRConfig.RENDER_PROFILES]
+
+    print(f"FFT size: {args.size}, frames: {args.frames}, history: {args.history}, waterfall: {args.waterfall_depth}")
+    print(f"{'profile':<12} {'fps':>8} {'update_data, ms':>16} {'frame, ms':>10}")
+    for result in results:
+        print(f"{result['profile']:<12} {result['fps']:8.1f} {result['update_ms']:16.2f} {result['frame_ms']:10.2f}")
+    baseline = results[0]['fps']
+    for result in results[1:]:
+        print(f"{result['profile']}: x{result['fps'] / baseline:.2f} vs {results[0]['profile']}")
+
+
+if __name__ == "__main__":
+    main()
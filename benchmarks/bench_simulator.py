@@ -0,0 +1,43 @@
+"""
+Скорость генерации блоков симулятором эфира относительно реального времени
+Запуск: python -m benchmarks.bench_simulator [--seconds 1.0] [--sample-rate 56e6]
+"""
+
+import argparse
+import time
+
+from rf_simulator import SimulatedPluto
+from sdr_config import SDRConfig
+
+
+def measure(sample_rate, buffer_size, seconds, center_freq=868e6):
+    """Отсчетов в секунду при генерации без темпа реального времени"""
+    sdr = SimulatedPluto(realtime=False)
+    sdr.rx_lo = int(center_freq)
+    sdr.sample_rate = int(sample_rate)
+    sdr.rx_rf_bandwidth = int(sample_rate)
+    sdr.rx_buffer_size = buffer_size
+    sdr.rx()  # таблицы излучателей строятся на первом блоке
+    generated = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        sdr.rx()
+        generated += buffer_size
+    return generated / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость генерации симулятора эфира")
+    parser.add_argument("--seconds", type=float, default=1.0, help="длительность замера для каждого размера буфера")
+    parser.add_argument("--sample-rate", type=float, default=56e6, help="частота дискретизации, Гц")
+    args = parser.parse_args()
+
+    print(f"sample rate: {args.sample_rate / 1e6:.1f} MS/s")
+    print(f"{'buffer':>8} {'MS/s':>8} {'x realtime':>11}")
+    for buffer_size in map(int, SDRConfig.GUI_CONFIG["buffer_sizes"]):
+        rate = measure(args.sample_rate, buffer_size, args.seconds)
+        print(f"{buffer_size:8d} {rate / 1e6:8.1f} {rate / args.sample_rate:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Набор замеров горячего пути: этапы DSP и отрисовка для всех размеров буфера и частот дискретизации предустановок
+Запуск: python -m benchmarks.bench_suite [--frames 200] [--output bench_suite.json] [--compare old.json] [--no-render]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import dsp
+from bursts import BurstDetector
+from channelizer import Channelizer
+from occupancy import OccupancyStats
+from rf_simulator import SimulatedPluto
+from sdr_config import SDRConfig
+from zoom import ZoomFFT
+
+BLOCKS = 16  # разных блоков на конфигурацию (кадры подаются по кругу)
+
+
+def buffer_sizes():
+    return [int(size) for size in SDRConfig.GUI_CONFIG["buffer_sizes"]]
+
+
+def preset_sample_rates():
+    """Различные частоты дискретизации предустановок, Гц"""
+    rates = {preset["sample_rate"]["default"] for preset in SDRConfig.get_presets().values()}
+    return [rate * 1e6 for rate in sorted(rates)]
+
+
+def make_blocks(sample_rate, buffer_size, center_freq, count=BLOCKS):
+    """Блоки симулятора эфира (сцена по умолчанию, фиксированный seed)"""
+    sdr = SimulatedPluto(seed=0, realtime=False)
+    sdr.rx_lo = int(center_freq)
+    sdr.sample_rate = int(sample_rate)
+    sdr.rx_rf_bandwidth = int(sample_rate)
+    sdr.rx_buffer_size = buffer_size
+    return [sdr.rx().copy() for _ in range(count)]
+
+
+def make_stages(blocks, sample_rate, buffer_size, center_freq):
+    """Этапы обработки: имя -> функция от номера кадра"""
+    engine = dsp.SpectrumEngine(SDRConfig.FFT_WINDOW, SDRConfig.FFT_WORKERS)
+    engine.configure(sample_rate, buffer_size, center_freq)
+    detection = SDRConfig.get_detection_params()
+    axis = engine.axis_for(buffer_size)
+    spectra = [engine.magnitude_db(block) for block in blocks]
+    adaptive = dsp.AdaptiveThreshold(
+        SDRConfig.CFAR_OFFSET, SDRConfig.CFAR_TRAINING_CELLS, SDRConfig.CFAR_GUARD_CELLS, SDRConfig.NOISE_FLOOR_FRAMES
+    )
+    decimator = dsp.DisplayDecimator(SDRConfig.DISPLAY_COLUMNS)
+    decimator.axis(axis)
+    zoom = ZoomFFT(
+        center_freq - SDRConfig.ZOOM_SPAN / 2, center_freq + SDRConfig.ZOOM_SPAN / 2, sample_rate, buffer_size,
+        center_freq, SDRConfig.FFT_WINDOW, SDRConfig.ZOOM_TAPS_PER_PHASE, SDRConfig.ZOOM_OVERSAMPLE
+    )
+    plan = SDRConfig.CHANNEL_PLANS["eu868_lora"]
+    channelizer = Channelizer(
+        plan["channels"], plan["spacing"], sample_rate, buffer_size, center_freq,
+        SDRConfig.CHANNEL_TAPS, SDRConfig.CHANNEL_BUSY_MARGIN
+    )
+    occupancy = OccupancyStats(plan["channels"], SDRConfig.OCCUPANCY_WINDOWS)
+    channel_blocks = [channelizer.process(block) for block in blocks]
+    duration = buffer_size / sample_rate
+    bursts = BurstDetector(
+        sample_rate, SDRConfig.BURST_WINDOW, SDRConfig.BURST_MARGIN, SDRConfig.BURST_FLOOR_RISE,
+        SDRConfig.BURST_ENVELOPE_POINTS
+    )
+    n = len(blocks)
+    return {
+        'rssi': lambda i: dsp.calculate_rssi(blocks[i % n]),
+        'fft_db': lambda i: engine.magnitude_db(blocks[i % n]),
+        'find_dominant': lambda i: dsp.find_dominant_frequency(
+            spectra[i % n], axis, center_freq, SDRConfig.SIGNAL_DETECTION_THRESHOLD
+        ),
+        'find_peaks': lambda i: dsp.find_peaks(spectra[i % n], axis, center_freq, detection),
+        'cfar': lambda i: adaptive.update(spectra[i % n]),
+        'process_block': lambda i: dsp.process_block(blocks[i % n], engine, center_freq, detection),
+        'display_reduce': lambda i: decimator.reduce(spectra[i % n]),
+        'zoom_block': lambda i: dsp.analyze_spectrum(
+            dsp.power_to_db(zoom.power(blocks[i % n])), 0.0, zoom.freq_axis, center_freq, detection
+        ),
+        'channelizer': lambda i: channelizer.process(blocks[i % n]),
+        'occupancy': lambda i: occupancy.update(channel_blocks[i % n], duration, i * duration),
+        'burst_detect': lambda i: bursts.process(blocks[i % n], True, i * duration),
+    }
+
+
+def make_render_stage(window, frames):
+    """Этап отрисовки: update_data и перерисовка графиков"""
+    from benchmarks.bench_render import render_plots
+
+    def render(i):
+        frame = frames[i % len(frames)]
+        window.record_history(frame[1], frame[2])
+        window.record_waterfall(frame[0], frame[4], frame[5])
+        window.update_data(*frame)
+        render_plots(window)
+    return render
+
+
+def time_stage(stage, frames, warmup=5):
+    """Время одного кадра: среднее, минимум, медиана и 95-й процентиль (мкс)"""
+    for i in range(warmup):
+        stage(i)
+    times = np.empty(frames)
+    for i in range(frames):
+        start = time.perf_counter()
+        stage(i)
+        times[i] = time.perf_counter() - start
+    mean = float(times.mean())
+    return {
+        'mean_us': mean * 1e6,
+        'min_us': float(times.min()) * 1e6,
+        'median_us': float(np.median(times)) * 1e6,
+        'p95_us': float(np.percentile(times, 95)) * 1e6,
+        'fps': 1.0 / mean if mean > 0 else 0.0,
+    }
+
+
+def trace_stage(stage, frames):
+    """Память на кадр по tracemalloc: пик временных выделений и остаток после кадра (байты)"""
+    # tracemalloc замедляет выполнение, поэтому этот проход отделен от замера времени
+    transient = retained = 0
+    for i in range(frames):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        stage(i)
+        current, peak = tracemalloc.get_traced_memory()
+        transient = max(transient, peak - baseline)
+        retained += current - baseline
+    return {'alloc_bytes': transient, 'retained_bytes': retained / frames}
+
+
+def max_rss_kb():
+    """Пиковый резидентный объем процесса (КБ), если доступно"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_config(sample_rate, buffer_size, frames, trace_frames, window=None):
+    """Все этапы для одной пары (частота дискретизации, размер буфера)"""
+    center_freq = SDRConfig.DEFAULT_FREQUENCY
+    blocks = make_blocks(sample_rate, buffer_size, center_freq)
+    stages = make_stages(blocks, sample_rate, buffer_size, center_freq)
+    if window is not None:
+        engine = dsp.SpectrumEngine(SDRConfig.FFT_WINDOW)
+        engine.configure(sample_rate, buffer_size, center_freq)
+        detection = SDRConfig.get_detection_params()
+        # Окну передаются кадры, прореженные для отображения, как из потока приема
+        render_frames = [
+            window.pluto_thread.reduce_for_display(dsp.process_block(block, engine, center_freq, detection) + (center_freq,))
+            for block in blocks
+        ]
+        stages['render'] = make_render_stage(window, render_frames)
+
+    results = {name: time_stage(stage, frames) for name, stage in stages.items()}
+
+    tracemalloc.start()
+    for name, stage in stages.items():
+        results[name].update(trace_stage(stage, trace_frames))
+    peak_traced = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'sample_rate': sample_rate,
+        'buffer_size': buffer_size,
+        'stages': results,
+        'peak_traced_bytes': peak_traced,
+        'max_rss_kb': max_rss_kb(),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Сравнить медианное время этапов с прошлым прогоном; вернуть число замедлений сверх допуска"""
+    # Медиана устойчивее среднего к единичным задержкам планировщика ОС
+    previous = {(r['sample_rate'], r['buffer_size']): r['stages'] for r in baseline['results']}
+    regressions = 0
+    print(f"\ncompare with {baseline['meta'].get('revision')} ({baseline['meta'].get('time')})")
+    print(f"{'rate':>6} {'buffer':>7} {'stage':<14} {'old p50':>9} {'new p50':>9} {'ratio':>6}")
+    for result in results:
+        old_stages = previous.get((result['sample_rate'], result['buffer_size']))
+        if old_stages is None:
+            continue
+        for name, stage in result['stages'].items():
+            if name not in old_stages:
+                continue
+            old, new = old_stages[name]['median_us'], stage['median_us']
+            ratio = new / old if old > 0 else float("inf")
+            mark = " REGRESSION" if ratio > 1 + tolerance else ""
+            regressions += bool(mark)
+            print(f"{result['sample_rate'] / 1e6:6.1f} {result['buffer_size']:7d} {name:<14} "
+                  f"{old:9.1f} {new:9.1f} {ratio:6.2f}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры этапов DSP и отрисовки")
+    parser.add_argument("--frames", type=int, default=200, help="кадров на замер времени этапа")
+    parser.add_argument("--trace-frames", type=int, default=20, help="кадров на замер памяти этапа")
+    parser.add_argument("--buffer-sizes", type=int, nargs="+", default=buffer_sizes(), help="размеры буфера")
+    parser.add_argument("--sample-rates", type=float, nargs="+", default=preset_sample_rates(),
+                        help="частоты дискретизации, Гц")
+    parser.add_argument("--no-render", action="store_true", help="без замера отрисовки (без окна Qt)")
+    parser.add_argument("--output", default="bench_suite.json", help="файл результатов JSON")
+    parser.add_argument("--compare", help="результаты прошлого прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="допустимое замедление при сравнении")
+    args = parser.parse_args()
+
+    window = app = None
+    if not args.no_render:
+        from PyQt5.QtWidgets import QApplication
+        from rssi_868 import PowerAnalyzer
+        app = QApplication([])
+        window = PowerAnalyzer()
+        window.resize(1200, 800)
+        window.show()
+        window.render_scheduler.render_timer.stop()
+        app.processEvents()
+
+    results = []
+    print(f"{'rate':>6} {'buffer':>7} {'stage':<14} {'mean us':>9} {'p95 us':>9} {'fps':>9} {'alloc KB':>9}")
+    for sample_rate in args.sample_rates:
+        for buffer_size in args.buffer_sizes:
+            result = run_config(sample_rate, buffer_size, args.frames, args.trace_frames, window)
+            results.append(result)
+            for name, stage in result['stages'].items():
+                print(f"{sample_rate / 1e6:6.1f} {buffer_size:7d} {name:<14} {stage['mean_us']:9.1f} "
+                      f"{stage['p95_us']:9.1f} {stage['fps']:9.0f} {stage['alloc_bytes'] / 1024:9.1f}")
+
+    if window is not None:
+        window.close()
+        app.processEvents()
+
+    report = {
+        'meta': {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'fft_backend': dsp.fft_backend(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+            'cpu_count': os.cpu_count(),
+            'frames': args.frames,
+        },
+        'results': results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=1)
+    print(f"\nresults: {args.output}, peak RSS: {max_rss_kb()} KB")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
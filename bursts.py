@@ -0,0 +1,241 @@
+"""
+Обнаружение пакетов во временной области: огибающая мощности скользящим окном по кумулятивным суммам
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import numpy as np
+
+# Пакет: время начала (Unix, с), номера первого и следующего за последним отсчета
+# в потоке принятых отсчетов, длительность (с), пиковая мощность огибающей и порог (дБм)
+BURST_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("start", "<i8"),
+    ("end", "<i8"),
+    ("duration", "<f8"),
+    ("peak_power", "<f4"),
+    ("threshold", "<f4"),
+])
+
+BURST_CSV_FORMAT = ("%.6f", "%d", "%d", "%.9f", "%.2f", "%.2f")
+
+
+def power_envelope(power, window):
+    """Средняя мощность в окне window, сдвигаемом на один отсчет (len(power) - window + 1 значений)"""
+    # Разность кумулятивных сумм: O(N) при любой длине окна. Суммы в float64 -
+    # при миллионе отсчетов float32 теряет точность на шумовом полу
+    sums = np.empty(len(power) + 1)
+    sums[0] = 0.0
+    np.cumsum(power, out=sums[1:])
+    envelope = sums[window:] - sums[:-window]
+    envelope *= 1.0 / window
+    return envelope
+
+
+class BurstDetector:
+    """Пакеты выше шумового пола во всех принятых отсчетах, с точностью до отсчета"""
+
+    # Огибающая env[i] - средняя мощность отсчетов [i, i + W). Пакет мощностью P на
+    # шуме N дает линейный фронт огибающей шириной W, и уровень (P + N) / 2 фронт
+    # проходит ровно через W/2 отсчетов от края пакета - по этим точкам и уточняются
+    # начало и конец (для пакетов не короче окна). Решения о пересечении порога
+    # принимаются на отсчетах, для которых уже есть W отсчетов огибающей вперед;
+    # остаток блока переносится в следующий, поэтому в непрерывном потоке пакеты на
+    # границе блоков не делятся. Шумовой пол - процентиль огибающей блока; растет он не
+    # быстрее floor_rise дБ в секунду (а не за блок - иначе результат зависел бы от
+    # размера буфера), так что пакет в сотни миллисекунд не поднимает порог до себя.
+    # Пол - нижний процентиль, а не медиана: в блоке, где пакеты занимают больше
+    # половины времени, медиана - уже уровень пакетов.
+
+    FLOOR_PERCENTILE = 10
+
+    def __init__(self, sample_rate, window=64, margin_db=6.0, floor_rise_db=3.0, envelope_points=256):
+        self.sample_rate = float(sample_rate)
+        self.window = max(2, int(window) // 2 * 2)  # четное: середина фронта - целый отсчет
+        self.margin = 10 ** (margin_db / 10)
+        self.floor_rise = floor_rise_db / 10  # декад мощности в секунду
+        self.envelope_points = int(envelope_points)
+        self.floor = None
+        self.threshold = None
+        self.position = 0        # отсчетов принято (номер следующего)
+        self._tail = None        # мощность отсчетов, начиная с _tail_start, нужная следующему блоку
+        self._tail_start = 0
+        self._decided = 0        # номер отсчета огибающей, с которого принимаются следующие решения
+        self._active = False     # пакет продолжается с прошлого блока
+        self._burst_start = 0
+        self._burst_peak = 0.0
+        self._burst_level = 0.0
+        self._last_end = 0       # конец последнего выданного пакета
+
+    def process(self, samples, contiguous=True, now=0.0):
+        """Блок отсчетов: (завершенные пакеты BURST_DTYPE, времена и уровни огибающей в дБм)"""
+        # now - время приема последнего отсчета блока (Unix); по нему считаются времена пакетов
+        bursts = []
+        if not contiguous or self._tail is None:
+            # Предыдущие отсчеты не примыкают к блоку - дорешиваем их и закрываем пакет
+            bursts.append(self.flush(now - len(samples) / self.sample_rate))
+        power = samples.real ** 2 + samples.imag ** 2
+        buffer = np.concatenate((self._tail, power)) if len(self._tail) else power
+        base = self._tail_start
+        self.position += len(samples)
+
+        w = self.window
+        if len(buffer) < 2 * w + 1:
+            self._tail = buffer
+            return self._merge(bursts), np.zeros(0), np.zeros(0)
+        envelope = power_envelope(buffer, w)
+        # Решения - до отсчета, за которым огибающая известна еще на W вперед
+        stop = len(envelope) - w
+        bursts.append(self._decide(envelope, base, stop, now))
+
+        # Следующему блоку нужны W + 1 отсчетов огибающей до границы решений (уточнение спада)
+        keep = max(0, stop - w - 1)
+        self._tail = buffer[keep:]
+        self._tail_start = base + keep
+        times, levels = self._display(envelope[-len(samples):], now)
+        return self._merge(bursts), times, levels
+
+    def flush(self, now):
+        """Дорешить отложенные отсчеты и закрыть продолжающийся пакет (конец потока или разрыв)"""
+        bursts = np.zeros(0, dtype=BURST_DTYPE)
+        tail = self._tail
+        if tail is not None and len(tail) > self.window:
+            envelope = power_envelope(tail, self.window)
+            bursts = self._decide(envelope, self._tail_start, len(envelope), now)
+        if self._active:
+            # Пакет обрывается на последнем принятом отсчете
+            end = self.position
+            bursts = np.concatenate((bursts, self._records(
+                np.array([self._burst_start]), np.array([end]), np.array([self._burst_peak]), now, end
+            )))
+            self._active = False
+            self._last_end = end
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._tail_start = self._decided = self.position
+        return bursts
+
+    def _decide(self, envelope, base, stop, now):
+        """Пересечения порога на отсчетах огибающей [_decided, base + stop); завершенные пакеты"""
+        first = self._decided - base
+        if stop <= first:
+            return np.zeros(0, dtype=BURST_DTYPE)
+        region = envelope[first:stop]
+        # Шумовой пол блока, рост ограничен floor_rise за время решаемых отсчетов
+        rank = len(region) * self.FLOOR_PERCENTILE // 100
+        floor = float(np.partition(region, rank)[rank])
+        if self.floor is not None:
+            floor = min(floor, self.floor * 10 ** (self.floor_rise * len(region) / self.sample_rate))
+        self.floor = floor
+        self.threshold = floor * self.margin
+        above = region > self.threshold
+
+        # Смены состояния; первая сравнивается с состоянием на конце прошлого блока
+        changes = np.flatnonzero(above[1:] != above[:-1]) + 1
+        if above[0] != self._active:
+            changes = np.concatenate(([0], changes))
+        changes += first
+        rising = above[changes - first]
+        rises, falls = changes[rising], changes[~rising]
+        self._decided = base + stop
+
+        # Отрезки пакетов: продолжение с прошлого блока и пакет до конца решений
+        seg_starts = np.concatenate(([first], rises)) if self._active else rises
+        seg_ends = np.concatenate((falls, [stop])) if len(seg_starts) > len(falls) else falls
+        if not len(seg_starts):
+            return np.zeros(0, dtype=BURST_DTYPE)
+        # Пик отрезка [s, e) - maximum.reduceat по чередующимся границам
+        bounds = np.column_stack((seg_starts, seg_ends)).ravel()
+        peaks = np.maximum.reduceat(envelope[:stop], bounds[:-1] if bounds[-1] == stop else bounds)[::2]
+        if self._active:
+            peaks[0] = max(peaks[0], self._burst_peak)
+        # Уровень пакета - медиана плоской части отрезка (без фронтов по W отсчетов): пик
+        # завышен флуктуациями огибающей. У пакета короче окна плоской части нет - берется пик.
+        # Незавершенный отрезок оценивается по всей огибающей за границей решений: фронт,
+        # начатый у границы, еще не дошел до уровня пакета. Короткое продолжение пакета с прошлого
+        # блока - это его спад, уровень берется с прошлого блока (цикл по пакетам, а не по отсчетам)
+        w = self.window
+        level_ends = seg_ends.copy()
+        if len(seg_starts) > len(falls):
+            level_ends[-1] = len(envelope)
+        levels = np.array([
+            np.median(envelope[start + w:end - w]) if end - start > 3 * w else envelope[start:max(end, start + 1)].max()
+            for start, end in zip(seg_starts, level_ends)
+        ])
+        if self._active and level_ends[0] - first <= 3 * w:
+            levels[0] = self._burst_level
+        half = (levels + floor) / 2
+
+        starts = self._edges(base, rises, half[len(seg_starts) - len(rises):], envelope, forward=True)
+        if self._active:
+            starts = np.concatenate(([self._burst_start], starts))
+        ends = self._edges(base, falls, half[:len(falls)], envelope, forward=False)
+        ends = np.maximum(ends, starts[:len(ends)] + 1)
+        starts, ends, peaks = self._join(starts, ends, peaks)
+
+        self._active = len(starts) > len(ends)
+        if self._active:
+            self._burst_start = int(starts[-1])
+            self._burst_peak = float(peaks[-1])
+            self._burst_level = float(levels[-1])
+        if len(ends):
+            self._last_end = int(ends[-1])
+        return self._records(starts[:len(ends)], ends, peaks[:len(ends)], now, self.position)
+
+    def _join(self, starts, ends, peaks):
+        """Слить отрезки, чей фронт раньше спада предыдущего пакета (провал огибающей внутри пакета)"""
+        # Последний отрезок без спада (len(ends) < len(starts)) - пакет, продолжающийся в следующий блок.
+        # Пакет прошлого блока уже выдан - фронт отрезка не раньше его конца
+        count = len(starts)
+        starts = np.maximum(starts, self._last_end)
+        previous = np.concatenate(([self._last_end], ends[:count - 1]))
+        groups = np.flatnonzero(starts >= previous)
+        if len(groups) == count:
+            return starts, ends, peaks
+        last = np.append(groups[1:], count) - 1
+        if len(ends) < count:
+            last = last[:-1]
+        return starts[groups], ends[last], np.maximum.reduceat(peaks, groups)
+
+    def _edges(self, base, crossings, half, envelope, forward):
+        """Номера отсчетов краев пакетов по прохождению огибающей через половину уровня"""
+        # Поиск в W отсчетах по обе стороны от пересечения порога: у слабого пакета
+        # половина уровня ниже порога и проходится раньше него (или позже - для спада)
+        w = self.window
+        if not len(crossings):
+            return np.zeros(0, dtype=np.int64)
+        steps = np.arange(-w, w + 1)
+        # Фронт - первый отсчет не ниже половины уровня, спад - последний (поиск с конца)
+        index = crossings[:, None] + (steps if forward else -steps)
+        inside = (index >= 0) & (index < len(envelope))
+        hit = inside & (envelope[np.clip(index, 0, len(envelope) - 1)] >= half[:, None])
+        edges = index[np.arange(len(crossings)), np.argmax(hit, axis=1)]
+        edges = np.where(hit.any(axis=1), edges, crossings)
+        if forward:
+            # Огибающая выше половины уровня с первого отсчета - пакет начался раньше блока
+            return np.where(edges > 0, base + edges + w // 2, base)
+        return base + edges + w // 2
+
+    def _records(self, starts, ends, peaks, now, position):
+        """Записи пакетов; время начала отсчитывается назад от последнего принятого отсчета"""
+        records = np.zeros(len(starts), dtype=BURST_DTYPE)
+        records["start"] = starts
+        records["end"] = ends
+        records["duration"] = (ends - starts) / self.sample_rate
+        records["time"] = now - (position - starts) / self.sample_rate
+        records["peak_power"] = 10 * np.log10(np.maximum(peaks, 1e-30)) + 30
+        records["threshold"] = 10 * np.log10(max(self.threshold or 0.0, 1e-30)) + 30
+        return records
+
+    def _merge(self, parts):
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return np.zeros(0, dtype=BURST_DTYPE)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def _display(self, envelope, now):
+        """Огибающая блока для графика: максимум на интервал, не больше envelope_points точек (дБм)"""
+        points = min(self.envelope_points, len(envelope))
+        step = len(envelope) // points
+        levels = envelope[:points * step].reshape(points, step).max(axis=1)
+        duration = len(envelope) / self.sample_rate
+        times = now - duration + (np.arange(points) + 0.5) * (duration / points)
+        return times, 10 * np.log10(np.maximum(levels, 1e-30)) + 30
@@ -0,0 +1,107 @@
+"""
+Многофазный банк фильтров: мощность каналов плана частот за один проход по блоку отсчетов
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import numpy as np
+
+# Мощность канала плана: центральная частота (Гц), мощность (дБм, шкала RSSI),
+# занятость (выше порога) и признак попадания канала в полосу приема
+CHANNEL_DTYPE = np.dtype([
+    ("frequency", np.float64),
+    ("power", np.float64),
+    ("busy", np.bool_),
+    ("in_band", np.bool_),
+])
+
+
+class Channelizer:
+    """Банк фильтров с шагом каналов плана: мощность каждого канала по блоку"""
+
+    # До такого числа каналов банка DFT по строкам - умножение на матрицу (M x M):
+    # np.fft по короткой оси тратит больше на накладные расходы каждой строки
+    DFT_MATRIX_MAX = 32
+
+    # Полоса делится на M = fs / spacing равных каналов. Блок как матрица (K x M)
+    # взвешивается L фазами фильтра-прототипа (sinc с окном, срез spacing/2), суммы
+    # L соседних строк дают (K-L+1) x M, и одно FFT длины M по строкам переводит их
+    # в отсчеты каналов. Это N*L умножений и N*log2(M) на FFT - против N*log2(N)
+    # на каждый канал при отдельных FFT. Если центры каналов не лежат на сетке
+    # fs/M от центральной частоты, блок сдвигается по частоте таблицей NCO.
+    # Прототип нормирован на единичное усиление: тон в центре канала дает ту же
+    # мощность, что и RSSI блока, а мощности всех каналов в сумме дают RSSI шума.
+
+    def __init__(self, channels, spacing, sample_rate, block_size, center_freq,
+                 taps_per_channel=8, busy_margin=10.0):
+        self.key = (tuple(channels), float(spacing), float(sample_rate), int(block_size), float(center_freq))
+        self.sample_rate = float(sample_rate)
+        self.block_size = int(block_size)
+        self.size = max(2, int(round(sample_rate / spacing)))
+        self.bin_width = self.sample_rate / self.size
+        self.busy_margin = busy_margin
+
+        frequencies = np.asarray(channels, dtype=np.float64)
+        offsets = frequencies - center_freq
+        in_band = np.abs(offsets) <= (self.sample_rate - self.bin_width) / 2
+        # Сдвиг сетки банка под первый канал в полосе (остальные - в ближайший бин)
+        reference = offsets[in_band][0] if in_band.any() else 0.0
+        self.shift = reference - round(reference / self.bin_width) * self.bin_width
+        n = np.arange(self.block_size)
+        self.nco = np.exp(-2j * np.pi * self.shift / self.sample_rate * n).astype(np.complex64) if self.shift else None
+        # Номер бина FFT (0..M-1) для каждого канала
+        self.bins = np.round((offsets - self.shift) / self.bin_width).astype(np.int64) % self.size
+
+        self.result = np.zeros(len(frequencies), dtype=CHANNEL_DTYPE)
+        self.result["frequency"] = frequencies
+        self.result["in_band"] = in_band
+        self.result["power"] = np.nan
+
+        # Фильтр-прототип: L фаз по M отсчетов, сумма коэффициентов - 1
+        # В коротком блоке при широкой полосе фильтр укорачивается (не меньше половины блока на выход)
+        self.taps_per_channel = max(1, min(int(taps_per_channel), self.block_size // self.size // 2))
+        taps = self.taps_per_channel * self.size
+        t = np.arange(taps) - (taps - 1) / 2
+        h = np.sinc(t / self.size) * np.hamming(taps)
+        h /= h.sum()
+        self.phases = h.reshape(self.taps_per_channel, self.size).astype(np.float32)
+        self.dft = None
+        if self.size <= self.DFT_MATRIX_MAX:
+            k = np.arange(self.size)
+            self.dft = np.exp(-2j * np.pi * np.outer(k, k) / self.size).astype(np.complex64)
+        self.threshold = None
+
+    def bank_power(self, samples):
+        """Средняя мощность всех M каналов банка (порядок бинов FFT)"""
+        size = self.size
+        rows = len(samples) // size
+        x = samples[:rows * size]
+        if self.nco is not None:
+            x = x * self.nco[:rows * size]
+        blocks = x.reshape(rows, size)
+        count = rows - self.taps_per_channel + 1
+        # Взвешенная сумма L соседних строк (WOLA): L векторных операций над (K x M)
+        folded = blocks[:count] * self.phases[0]
+        for tap in range(1, self.taps_per_channel):
+            folded += blocks[tap:tap + count] * self.phases[tap]
+        spectrum = folded @ self.dft if self.dft is not None else np.fft.fft(folded, axis=1)
+        real, imag = spectrum.real, spectrum.imag
+        return (np.einsum("ij,ij->j", real, real) + np.einsum("ij,ij->j", imag, imag)) / count
+
+    def process(self, samples):
+        """Мощность и занятость каналов плана (новый массив CHANNEL_DTYPE)"""
+        bank = 10 * np.log10(self.bank_power(samples) + 1e-24) + 30
+        # Порог занятости - медиана каналов банка (шум) плюс запас
+        self.threshold = float(np.median(bank)) + self.busy_margin
+        result = self.result.copy()
+        in_band = result["in_band"]
+        result["power"][in_band] = bank[self.bins[in_band]]
+        result["busy"] = in_band & (result["power"] > self.threshold)
+        return result
+
+
+def channel_onsets(previous, channels):
+    """Каналы, перешедшие из свободных в занятые с прошлого кадра (previous - прошлые флаги или None)"""
+    busy = channels["busy"]
+    if previous is None or len(previous) != len(busy):
+        return channels[busy]
+    return channels[busy & ~previous]
@@ -0,0 +1,212 @@
+"""
+Фоновая запись журналов на диск: текст, CSV, JSON Lines и двоичный файл записей фиксированной длины
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+
+import numpy as np
+
+# Запись обнаружения (частоты в Гц, уровни в дБ/дБм); порядок байт фиксирован,
+# чтобы двоичный файл читался np.memmap на любой машине
+DETECTION_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("frequency", "<f8"),
+    ("freq_offset", "<f8"),
+    ("rssi", "<f4"),
+    ("peak_power", "<f4"),
+    ("signal_power", "<f4"),
+    ("threshold", "<f4"),
+])
+
+DETECTION_CSV_FORMAT = ("%.3f", "%.1f", "%.1f", "%.2f", "%.2f", "%.2f", "%.1f")
+
+
+def _open_for_append(path, mode):
+    """Открыть файл на дозапись, создав каталог"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, mode)
+
+
+class TextSink:
+    """Текстовый файл: одна отформатированная строка на запись"""
+
+    def __init__(self, path, formatter):
+        self.path = path
+        self.formatter = formatter
+        self._file = None
+
+    def write(self, records):
+        if self._file is None:
+            self._file = _open_for_append(self.path, "a")
+        self._file.write("".join(self.formatter(record) + "\n" for record in records))
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CSVSink:
+    """CSV с заголовком из имен полей записи"""
+
+    def __init__(self, path, dtype, fmt):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.fmt = list(fmt)
+        self._file = None
+
+    def write(self, records):
+        if self._file is None:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = _open_for_append(self.path, "a")
+            if new_file:
+                self._file.write(",".join(self.dtype.names) + "\n")
+        np.savetxt(self._file, records, fmt=self.fmt, delimiter=",")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BinarySink:
+    """Двоичный файл записей фиксированной длины без заголовка (читается load_records)"""
+
+    # Рядом пишется описание формата <файл>.json, чтобы файл можно было открыть
+    # как np.memmap и без этого модуля
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self._file = None
+
+    def write(self, records):
+        if self._file is None:
+            self._file = _open_for_append(self.path, "ab")
+            with open(self.path + ".json", "w") as descriptor:
+                json.dump({"dtype": self.dtype.descr, "itemsize": self.dtype.itemsize}, descriptor)
+        np.ascontiguousarray(records, dtype=self.dtype).tofile(self._file)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JSONLinesSink:
+    """JSON Lines: один объект с полями записи на строку; путь "-" - стандартный вывод"""
+
+    def __init__(self, path, dtype):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self._file = None
+
+    def write(self, records):
+        if self._file is None:
+            self._file = sys.stdout if self.path == "-" else _open_for_append(self.path, "a")
+        names = self.dtype.names
+        self._file.write("".join(
+            json.dumps(dict(zip(names, record))) + "\n" for record in records.tolist()
+        ))
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        self._file = None
+
+
+def load_records(path, dtype=DETECTION_DTYPE):
+    """Двоичный файл записей как массив только для чтения (memmap, без загрузки в память)"""
+    dtype = np.dtype(dtype)
+    # Хвост неполной записи (если запись прервалась) отбрасывается
+    count = os.path.getsize(path) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+
+class RecordWriter(threading.Thread):
+    """Поток записи: забирает записи из очереди и пишет их пачками во все приемники"""
+
+    def __init__(self, dtype, sinks, on_error=None, max_queue=100000, max_batch=4096, flush_interval=0.5):
+        super().__init__(daemon=True)
+        self.dtype = np.dtype(dtype)
+        self.sinks = list(sinks)
+        self.on_error = on_error
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.records_written = 0
+        self.dropped_records = 0   # записи, не поместившиеся в очередь
+        self.error = None
+        self._queue = queue.Queue(max_queue)
+
+    def submit(self, fields):
+        """Поставить запись в очередь (кортеж полей в порядке dtype); никогда не блокирует"""
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            self.dropped_records += 1
+
+    def run(self):
+        """Цикл записи: первая запись пачки ожидается, остальные забираются без ожидания"""
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is None
+            if batch and self.error is None:
+                self._write(batch)
+        for sink in self.sinks:
+            sink.close()
+
+    def _write(self, batch):
+        try:
+            records = np.array(batch, dtype=self.dtype)
+            for sink in self.sinks:
+                sink.write(records)
+                sink.flush()
+            self.records_written += len(records)
+        except (OSError, ValueError) as e:
+            # После ошибки запись прекращается, журнал продолжает работать в памяти
+            self.error = e
+            if self.on_error is not None:
+                self.on_error(str(e))
+
+    def stop(self, timeout=5.0):
+        """Дописать очередь и остановить поток"""
+        self._queue.put(None)
+        self.join(timeout)
@@ -0,0 +1,514 @@
+"""
+Цифровая обработка блоков отсчетов (без зависимостей от Qt)
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import os
+from collections import namedtuple
+from functools import partial
+
+import numpy as np
+
+# Необязательные ускоренные реализации FFT
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+try:
+    import scipy.fft as scipy_fft
+except ImportError:
+    scipy_fft = None
+
+
+# FFTW_MEASURE ускоряет FFT в полтора раза, но планирует секунды (5 с для 262144
+# отсчетов) - первый кадр после смены настроек задерживал бы прием, и кольцо
+# непрерывного захвата переполнялось бы. FFTW_ESTIMATE планирует за миллисекунды
+PYFFTW_PLANNER_EFFORT = "FFTW_ESTIMATE"
+
+AVERAGING_MODES = ("off", "linear", "exponential", "welch")
+
+DETECTION_MODES = ("fixed", "adaptive")
+
+WINDOW_FUNCTIONS = {
+    "rect": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+
+# Найденные пики спектра: абсолютная частота, смещение от центра (Гц), мощность (дБ), номер бина
+PEAK_DTYPE = np.dtype([
+    ("frequency", np.float64),
+    ("freq_offset", np.float64),
+    ("power", np.float64),
+    ("bin", np.int32),
+])
+
+# Параметры обнаружения: порог (дБ), минимальный разнос пиков (Гц),
+# минимальная выраженность пика над окрестностью (дБ), максимум пиков в кадре
+DetectionParams = namedtuple(
+    "DetectionParams", "threshold_db min_separation min_prominence max_peaks", defaults=(0.0, 0.0, 16)
+)
+
+# Кэшированное состояние движка для одного набора настроек
+_SpectrumState = namedtuple(
+    "_SpectrumState", "key size window presshifted freq_axis freq_axis_mhz plans"
+)
+
+
+def calculate_rssi(samples):
+    """Расчет RSSI"""
+    power_linear = np.mean(np.abs(samples) ** 2)
+    rssi_dbm = 10 * np.log10(power_linear) + 30  # Приблизительная калибровка
+    return rssi_dbm
+
+
+def calculate_peak_power(fft_data):
+    """Расчет пиковой мощности из FFT"""
+    return np.max(fft_data)
+
+
+def make_freq_axis(sample_rate, size):
+    """Частотная ось относительно центральной частоты (ноль в центре, как после fftshift)"""
+    return np.fft.fftshift(np.fft.fftfreq(size, 1.0 / sample_rate))
+
+
+def make_window(name, size):
+    """Окно с нормировкой на когерентное усиление (уровень тона не зависит от окна)"""
+    window = WINDOW_FUNCTIONS[name](size)
+    return window / window.mean()
+
+
+def fft_backend():
+    """Имя используемой реализации FFT"""
+    if pyfftw is not None:
+        return "pyfftw"
+    if scipy_fft is not None:
+        return "scipy"
+    return "numpy"
+
+
+class SpectrumEngine:
+    """Кэш окна, частотных осей и планов FFT для текущих настроек"""
+
+    def __init__(self, window="hann", workers=None):
+        self.window_name = window
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = fft_backend()
+        self._state = None
+
+    def configure(self, sample_rate, buffer_size, center_freq, window=None):
+        """Пересчитать кэш, если изменился набор настроек; True - если кэш обновлен"""
+        if window is not None:
+            self.window_name = window
+        key = (float(sample_rate), int(buffer_size), float(center_freq), self.window_name)
+        if self._state is not None and self._state.key == key:
+            return False
+
+        size = int(buffer_size)
+        window_array, presshifted = self._build_window(self.window_name, size)
+        freq_axis = make_freq_axis(sample_rate, size)
+        # План для блока целиком строится здесь, а не на первом кадре в потоке приема
+        plans = {}
+        self._plan(plans, (size,), np.result_type(np.complex64, window_array.dtype))
+        # Состояние заменяется одним присваиванием, поэтому поток обработки
+        # никогда не увидит окно от одних настроек и ось от других
+        self._state = _SpectrumState(
+            key=key,
+            size=size,
+            window=window_array,
+            presshifted=presshifted,
+            freq_axis=freq_axis,
+            freq_axis_mhz=(freq_axis + center_freq) / 1e6,
+            plans=plans,
+        )
+        return True
+
+    @property
+    def key(self):
+        return self._state.key if self._state is not None else None
+
+    @property
+    def size(self):
+        return self._state.size
+
+    @property
+    def freq_axis(self):
+        """Смещения частот в Гц"""
+        return self._state.freq_axis
+
+    @property
+    def freq_axis_mhz(self):
+        """Абсолютные частоты в МГц"""
+        return self._state.freq_axis_mhz
+
+    def axis_for(self, size):
+        """Частотная ось для блока заданного размера"""
+        state = self._state
+        if size == state.size:
+            return state.freq_axis
+        return make_freq_axis(state.key[0], size)
+
+    def fft(self, samples):
+        """FFT с окном по последней оси; результат уже сдвинут (ноль в центре)"""
+        state = self._state
+        size = samples.shape[-1]
+        if size == state.size:
+            window, presshifted = state.window, state.presshifted
+            weighted = samples * window
+            plan = self._plan(state.plans, weighted.shape, weighted.dtype)
+        else:
+            # Блок от предыдущих настроек - без кэша и без планирования FFTW:
+            # план для единственного блока стоил бы дороже самого FFT
+            window, presshifted = self._build_window(self.window_name, size)
+            weighted = samples * window
+            plan = self._unplanned()
+        spectrum = plan(weighted)
+        if not presshifted:
+            spectrum = np.fft.fftshift(spectrum, axes=-1)
+        return spectrum
+
+    def power(self, samples):
+        """Спектральная мощность |X|^2"""
+        spectrum = self.fft(samples)
+        return spectrum.real ** 2 + spectrum.imag ** 2
+
+    def magnitude_db(self, samples):
+        """Спектр в дБ"""
+        return 20 * np.log10(np.abs(self.fft(samples)) + 1e-12)
+
+    @staticmethod
+    def _build_window(name, size):
+        """Окно для блока; при четной длине в него встроен сдвиг спектра (-1)^n вместо fftshift"""
+        window = make_window(name, size)
+        if size % 2 == 0:
+            window = window * np.where(np.arange(size) % 2, -1.0, 1.0)
+            return window, True
+        return window, False
+
+    def _plan(self, plans, shape, dtype):
+        """План FFT для формы массива (создается один раз на набор настроек)"""
+        plan_key = (shape, np.dtype(dtype))
+        plan = plans.get(plan_key)
+        if plan is None:
+            if self.backend == "pyfftw":
+                buffer = pyfftw.empty_aligned(shape, dtype=dtype)
+                fftw = pyfftw.builders.fft(
+                    buffer, axis=-1, threads=self.workers, planner_effort=PYFFTW_PLANNER_EFFORT
+                )
+                # Выходной массив FFTW переиспользуется, поэтому отдаем копию
+                plan = lambda x, fftw=fftw: fftw(x).copy()
+            else:
+                plan = self._unplanned()
+            plans[plan_key] = plan
+        return plan
+
+    def _unplanned(self):
+        """FFT без предварительного планирования (scipy или numpy)"""
+        if scipy_fft is not None:
+            return partial(scipy_fft.fft, axis=-1, workers=self.workers)
+        return partial(np.fft.fft, axis=-1)
+
+
+def segment_power(stream, engine, segment_size, hop):
+    """Средняя мощность по перекрывающимся сегментам потока (один пакетный 2-D FFT)"""
+    if hop <= 0 or len(stream) <= segment_size:
+        return engine.power(stream[-segment_size:])
+    segments = np.lib.stride_tricks.sliding_window_view(stream, segment_size)[::hop]
+    return engine.power(segments).mean(axis=0)
+
+
+def power_to_db(power):
+    """Спектральная мощность в дБ (та же шкала, что и 20*log10|X|)"""
+    return 10 * np.log10(power + 1e-24)
+
+
+class SpectrumAverager:
+    """Усреднение спектра между кадрами: линейное по N кадрам, экспоненциальное и метод Уэлча"""
+
+    def __init__(self, mode="off", frames=8, overlap=0.5):
+        self.mode = mode
+        self.frames = max(1, int(frames))
+        self.overlap = overlap
+        self.reset()
+
+    @property
+    def active(self):
+        return self.mode != "off"
+
+    def reset(self):
+        """Сброс накопленных данных"""
+        self._tail = None
+        self._history = None
+        self._sum = None
+        self._index = 0
+        self._count = 0
+        self._average = None
+
+    def hop(self, size):
+        """Шаг между сегментами Уэлча (0 - сегментирование не используется)"""
+        if self.mode != "welch":
+            return 0
+        return max(1, int(round(size * (1.0 - self.overlap))))
+
+    def prepare(self, samples, contiguous=True):
+        """Поток для расчета сегментов: для Уэлча перед блоком ставится хвост предыдущего"""
+        if self.mode != "welch":
+            return samples
+        size = len(samples)
+        tail_size = size - self.hop(size)
+        tail = self._tail
+        self._tail = samples[size - tail_size:].copy()
+        # После пропуска отсчетов хвост уже не примыкает к блоку
+        if not contiguous or tail is None or len(tail) != tail_size:
+            return samples
+        return np.concatenate((tail, samples))
+
+    def combine(self, power):
+        """Добавить мощность нового кадра и вернуть усредненный спектр"""
+        if self.mode == "off":
+            return power
+
+        if self.mode == "exponential":
+            if self._average is None or self._average.shape != power.shape:
+                self._average = np.array(power, dtype=np.float64)
+            else:
+                # Постоянная времени эквивалентна скользящему среднему по N кадрам
+                alpha = 2.0 / (self.frames + 1)
+                self._average *= 1.0 - alpha
+                self._average += alpha * power
+            return self._average
+
+        # Линейное среднее (и межкадровое среднее Уэлча): скользящая сумма,
+        # стоимость кадра не зависит от N
+        if self._history is None or self._history.shape[1] != len(power):
+            self._history = np.zeros((self.frames, len(power)))
+            self._sum = np.zeros(len(power))
+            self._index = 0
+            self._count = 0
+        slot = self._index
+        self._sum -= self._history[slot]
+        self._history[slot] = power
+        self._sum += power
+        self._index = (slot + 1) % self.frames
+        self._count = min(self._count + 1, self.frames)
+        if self._index == 0:
+            # Раз в цикл пересчитываем сумму, чтобы не накапливалась ошибка округления
+            np.sum(self._history, axis=0, out=self._sum)
+        return self._sum / self._count
+
+    def process(self, samples, engine, contiguous=True):
+        """Усредненная спектральная мощность для нового блока"""
+        stream = self.prepare(samples, contiguous)
+        power = segment_power(stream, engine, len(samples), self.hop(len(samples)))
+        return self.combine(power)
+
+
+def find_dominant_frequency(fft_data, freq_axis, center_freq, threshold_db):
+    """Найти доминирующую частоту в спектре"""
+    # Находим индекс максимального пика
+    peak_idx = np.argmax(fft_data)
+    peak_power = fft_data[peak_idx]
+
+    # Проверяем, превышает ли пик пороговое значение
+    if peak_power > threshold_db:
+        # Частота относительно центральной частоты
+        freq_offset = freq_axis[peak_idx]
+        return {
+            'frequency': center_freq + freq_offset,
+            'freq_offset': freq_offset,
+            'power': peak_power,
+            'detected': True
+        }
+    return {'detected': False}
+
+
+def _sliding_extreme(data, size, func):
+    """Минимум/максимум по окнам [i, i+size) за O(n log size): удвоением длины окна"""
+    result = data
+    span = 1
+    while span * 2 <= size:
+        result = func(result[:-span], result[span:])
+        span *= 2
+    if span < size:
+        # Два перекрывающихся окна длины span покрывают окно длины size
+        result = func(result[:len(result) - (size - span)], result[size - span:])
+    return result
+
+
+def find_peaks(fft_data, freq_axis, center_freq, detection, threshold=None):
+    """Все локальные максимумы выше порога с учетом разноса и выраженности (по убыванию мощности)"""
+    # threshold - порог по бинам (адаптивный режим), иначе используется detection.threshold_db
+    if threshold is None:
+        threshold = detection.threshold_db
+    data = np.asarray(fft_data, dtype=np.float64)
+    size = len(data)
+    bin_width = abs(freq_axis[1] - freq_axis[0]) if size > 1 else 1.0
+    radius = int(round(detection.min_separation / bin_width))
+
+    # Локальный максимум: выше левого соседа и не ниже правого (у плато - левый край)
+    edge = np.array([-np.inf])
+    padded = np.concatenate((edge, data, edge))
+    candidate = (data > threshold) & (data > padded[:-2]) & (data >= padded[2:])
+    bins = np.flatnonzero(candidate)
+
+    if bins.size and radius > 0:
+        # В пределах разноса остается только наибольший пик
+        fill = np.full(radius, -np.inf)
+        window_max = _sliding_extreme(np.concatenate((fill, data, fill)), 2 * radius + 1, np.maximum)
+        bins = bins[data[bins] >= window_max[bins]]
+
+    if bins.size and detection.min_prominence > 0:
+        # Выраженность: высота пика над более высоким из минимумов слева и справа в окне разноса
+        width = max(radius, 1)
+        fill = np.full(width, np.inf)
+        window_min = _sliding_extreme(np.concatenate((fill, data, fill)), width, np.minimum)
+        left = window_min[bins]
+        right = window_min[bins + width + 1]
+        # У края спектра учитывается только существующая сторона
+        base = np.where(np.isinf(left), right, np.where(np.isinf(right), left, np.maximum(left, right)))
+        bins = bins[data[bins] - base >= detection.min_prominence]
+
+    bins = bins[np.argsort(data[bins], kind="stable")[::-1][:detection.max_peaks]]
+    peaks = np.empty(len(bins), dtype=PEAK_DTYPE)
+    peaks["freq_offset"] = freq_axis[bins]
+    peaks["frequency"] = center_freq + peaks["freq_offset"]
+    peaks["power"] = data[bins]
+    peaks["bin"] = bins
+    return peaks
+
+
+class AdaptiveThreshold:
+    """Адаптивный порог: шумовой пол по бинам, отслеживаемый от кадра к кадру, и CA-CFAR по нему"""
+
+    # Пол - экспоненциальное среднее мощности по бинам. Бины выше предыдущего порога
+    # считаются занятыми сигналом и вместо своей мощности вносят в пол оценку шума
+    # соседей, поэтому передатчики не поднимают пол. CA-CFAR усредняет пол в обучающих
+    # ячейках по обе стороны от бина за защитными ячейками.
+
+    # Если выше порога оказалась большая часть бинов, это не сигналы, а смена уровня
+    # (усиление, антенна) - пол набирается заново по текущему кадру
+    MAX_OCCUPANCY = 0.25
+
+    def __init__(self, offset_db=12.0, training_cells=16, guard_cells=2, frames=32):
+        self.offset_db = offset_db
+        self.training_cells = int(training_cells)
+        self.guard_cells = int(guard_cells)
+        self.alpha = 2.0 / (max(1, int(frames)) + 1)
+        self._cells = None
+        self.reset()
+
+    def reset(self):
+        """Сброс оценки шумового пола"""
+        self.floor = None
+        self._noise = None
+        self._threshold = None
+
+    def _training_cells(self, size):
+        """Границы обучающих ячеек слева и справа от каждого бина (у краев - усеченные)"""
+        if self._cells is None or self._cells[0] != size:
+            bins = np.arange(size)
+            left_lo = np.clip(bins - self.guard_cells - self.training_cells, 0, size)
+            left_hi = np.clip(bins - self.guard_cells, 0, size)
+            right_lo = np.clip(bins + self.guard_cells + 1, 0, size)
+            right_hi = np.clip(bins + self.guard_cells + self.training_cells + 1, 0, size)
+            count = np.maximum((left_hi - left_lo) + (right_hi - right_lo), 1)
+            self._cells = (size, left_lo, left_hi, right_lo, right_hi, count)
+        return self._cells[1:]
+
+    def update(self, fft_db):
+        """Учесть новый кадр и вернуть порог по бинам в дБ (новый массив)"""
+        power = np.power(10.0, np.asarray(fft_db, dtype=np.float64) / 10.0)
+        occupied = None
+        if self.floor is not None and self.floor.shape == power.shape:
+            occupied = fft_db > self._threshold
+        if occupied is None or np.count_nonzero(occupied) > self.MAX_OCCUPANCY * len(power):
+            self.floor = power
+        else:
+            observed = np.where(occupied, self._noise, power)
+            observed -= self.floor
+            observed *= self.alpha
+            self.floor += observed
+
+        # CA-CFAR: суммы обучающих ячеек через накопленную сумму, O(n) на кадр
+        left_lo, left_hi, right_lo, right_hi, count = self._training_cells(len(self.floor))
+        cumulative = np.zeros(len(self.floor) + 1)
+        np.cumsum(self.floor, out=cumulative[1:])
+        self._noise = (cumulative[left_hi] - cumulative[left_lo] + cumulative[right_hi] - cumulative[right_lo]) / count
+        self._threshold = 10 * np.log10(self._noise + 1e-24) + self.offset_db
+        return self._threshold
+
+
+def peaks_info(peaks, threshold=None):
+    """Словарь доминирующей частоты (самый мощный пик) вместе с массивом всех пиков"""
+    # threshold - адаптивный порог по бинам для отображения (None в фиксированном режиме)
+    if len(peaks) == 0:
+        return {'detected': False, 'peaks': peaks, 'threshold': threshold}
+    strongest = peaks[0]
+    return {
+        'frequency': float(strongest['frequency']),
+        'freq_offset': float(strongest['freq_offset']),
+        'power': float(strongest['power']),
+        'detected': True,
+        'peaks': peaks,
+        'threshold': threshold,
+    }
+
+
+def analyze_spectrum(fft_magnitude, rssi, freq_axis, center_freq, detection, adaptive=None):
+    """Пиковая мощность и обнаруженные сигналы по готовому спектру"""
+    peak_power = calculate_peak_power(fft_magnitude)
+    threshold = adaptive.update(fft_magnitude) if adaptive is not None else None
+    peaks = find_peaks(fft_magnitude, freq_axis, center_freq, detection, threshold)
+    dominant_freq_info = peaks_info(peaks, threshold)
+    return fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis
+
+
+def process_block(samples, engine, center_freq, detection, averager=None, contiguous=True, adaptive=None):
+    """Полная обработка блока: RSSI, FFT, пиковая мощность и обнаруженные сигналы"""
+    rssi = calculate_rssi(samples)
+    if averager is not None and averager.active:
+        fft_magnitude = power_to_db(averager.process(samples, engine, contiguous))
+    else:
+        fft_magnitude = engine.magnitude_db(samples)
+    freq_axis = engine.axis_for(len(fft_magnitude))
+    return analyze_spectrum(fft_magnitude, rssi, freq_axis, center_freq, detection, adaptive)
+
+
+class DisplayDecimator:
+    """Спектр для отображения: минимум и максимум каждого столбца (пикселя) экрана"""
+
+    # Столбец дает две точки с одной частотой - кривая рисуется вертикальным отрезком
+    # от минимума до максимума, поэтому узкие пики видны при любом размере FFT, а
+    # получателю передается не больше 2 * columns точек. Обнаружение работает по полному
+    # спектру до прореживания. Ось отображения и границы столбцов кэшируются для текущей
+    # оси частот - получатель видит тот же объект оси, пока настройки не изменились.
+
+    def __init__(self, columns):
+        self.columns = max(1, int(columns))
+        self._key = None
+        self._edges = None
+        self._axis = None
+
+    def active(self, size):
+        """Нужно ли прореживание для спектра из size бинов"""
+        return size > 2 * self.columns
+
+    def axis(self, freq_axis):
+        """Ось отображения: частота первого бина столбца, повторенная для минимума и максимума"""
+        size = len(freq_axis)
+        key = (size, float(freq_axis[0]), float(freq_axis[-1]))
+        if key != self._key:
+            self._edges = (np.arange(self.columns) * size) // self.columns
+            self._axis = np.repeat(freq_axis[self._edges], 2)
+            self._key = key
+        return self._axis
+
+    def reduce(self, data):
+        """Чередующиеся минимум и максимум по столбцам (после axis() для той же оси)"""
+        reduced = np.empty(2 * self.columns, dtype=np.float64)
+        reduced[0::2] = np.minimum.reduceat(data, self._edges)
+        reduced[1::2] = np.maximum.reduceat(data, self._edges)
+        return reduced
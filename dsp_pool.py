@@ -0,0 +1,167 @@
+"""
+Пул процессов DSP с передачей блоков отсчетов через разделяемую память
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from dsp import SpectrumEngine, calculate_rssi, process_block, segment_power
+
+
+def _worker_main(in_name, out_name, num_slots, block_size, tasks, results):
+    """Рабочий процесс: берет номер слота из очереди, считает спектр и кладет его в выходной слот"""
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    blocks = np.ndarray((num_slots, 2 * block_size), dtype=np.complex64, buffer=shm_in.buf)
+    spectra = np.ndarray((num_slots, block_size), dtype=np.float64, buffer=shm_out.buf)
+    # Процессов и так несколько, поэтому каждый считает FFT в один поток
+    engine = SpectrumEngine(workers=1)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, n, stream_size, hop, (sample_rate, _, center_freq, window), detection = task
+            engine.configure(sample_rate, n, center_freq, window)
+            stream = blocks[slot, :stream_size]
+            samples = stream[stream_size - n:]
+
+            # Спектр остается в разделяемой памяти, по очереди передаются скаляры
+            # и словарь детектора с компактным массивом пиков
+            if hop is None:
+                fft_magnitude, rssi, peak_power, dominant_freq_info, _ = process_block(
+                    samples, engine, center_freq, detection
+                )
+                spectra[slot, :n] = fft_magnitude
+                results.put((seq, slot, float(rssi), float(peak_power), dominant_freq_info))
+            else:
+                # Усреднение между кадрами требует порядка, поэтому здесь считается только мощность
+                spectra[slot, :n] = segment_power(stream, engine, n, hop)
+                results.put((seq, slot, float(calculate_rssi(samples)), None, None))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del blocks, spectra
+        shm_in.close()
+        shm_out.close()
+
+
+class DSPWorkerPool:
+    """Пул процессов DSP: блоки в разделяемой памяти, результаты строго в порядке подачи"""
+
+    # Кадры без усреднения возвращаются полностью обработанными. Для кадров с усреднением
+    # вместо спектра в дБ возвращается спектральная мощность, а пиковая мощность
+    # и доминирующая частота равны None - их досчитывает потребитель после усреднения.
+    # Процессы запускаются через spawn, а не fork: пул создается из работающего потока
+    # приема, и fork унаследовал бы захваченные им блокировки и состояние Qt.
+
+    def __init__(self, block_size, num_workers, slots_per_worker=4):
+        self.block_size = int(block_size)
+        self.num_workers = int(num_workers)
+        self.num_slots = self.num_workers * slots_per_worker
+
+        # Входной слот вмещает блок вместе с хвостом предыдущего для сегментов Уэлча
+        self._shm_in = shared_memory.SharedMemory(
+            create=True, size=self.num_slots * 2 * self.block_size * np.dtype(np.complex64).itemsize
+        )
+        self._shm_out = shared_memory.SharedMemory(
+            create=True, size=self.num_slots * self.block_size * np.dtype(np.float64).itemsize
+        )
+        self.blocks = np.ndarray((self.num_slots, 2 * self.block_size), dtype=np.complex64, buffer=self._shm_in.buf)
+        self.spectra = np.ndarray((self.num_slots, self.block_size), dtype=np.float64, buffer=self._shm_out.buf)
+
+        context = mp.get_context("spawn")
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self._free_slots = list(range(self.num_slots))
+        self._inflight = {}   # {seq: (slot, n, freq_axis, center_freq)}
+        self._finished = {}   # {seq: кадр}, ждущие более ранних номеров
+        self._ready = []      # кадры, готовые к выдаче по порядку
+        self._next_submit = 0
+        self._next_deliver = 0
+
+        self._workers = [
+            context.Process(
+                target=_worker_main,
+                args=(self._shm_in.name, self._shm_out.name, self.num_slots, self.block_size,
+                      self._tasks, self._results),
+                daemon=True,
+            )
+            for _ in range(self.num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, samples, engine, detection, stream=None, hop=None):
+        """Скопировать блок в свободный слот и поставить задачу (ждет, если все слоты заняты)"""
+        # stream - блок с хвостом предыдущего для сегментов Уэлча, hop - шаг сегментов;
+        # если hop задан, кадр возвращается как спектральная мощность для усреднения
+        n = min(len(samples), self.block_size)
+        if stream is None:
+            stream = samples[:n]
+        stream_size = min(len(stream), 2 * self.block_size)
+        while not self._free_slots:
+            self._receive(timeout=1.0)
+
+        slot = self._free_slots.pop()
+        self.blocks[slot, :stream_size] = stream[len(stream) - stream_size:]
+        seq = self._next_submit
+        self._next_submit += 1
+        # Настройки обработки берутся из ключа движка спектра, ось частот - из его кэша
+        settings = engine.key
+        self._inflight[seq] = (slot, n, engine.axis_for(n), settings[2])
+        self._tasks.put((seq, slot, n, stream_size, hop, settings, detection))
+
+    def collect(self, timeout=0.0):
+        """Забрать готовые кадры в порядке подачи (timeout - ожидание хотя бы одного кадра)"""
+        self._receive(timeout=timeout)
+        frames, self._ready = self._ready, []
+        return frames
+
+    def pending(self):
+        """Количество блоков в обработке"""
+        return len(self._inflight)
+
+    def _receive(self, timeout):
+        """Принять результаты из очереди и выстроить их по номерам"""
+        wait = timeout
+        while True:
+            try:
+                if wait:
+                    message = self._results.get(timeout=wait)
+                else:
+                    message = self._results.get_nowait()
+            except queue.Empty:
+                if wait and self._inflight and not all(w.is_alive() for w in self._workers):
+                    raise RuntimeError("Процесс DSP завершился аварийно")
+                break
+            wait = 0.0  # дальше забираем только то, что уже готово
+
+            seq, slot, rssi, peak_power, dominant_freq_info = message
+            _, n, freq_axis, center_freq = self._inflight.pop(seq)
+            # Копируем спектр сразу, чтобы освободить слот независимо от порядка
+            fft_magnitude = self.spectra[slot, :n].copy()
+            self._free_slots.append(slot)
+            self._finished[seq] = (fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, center_freq)
+
+        while self._next_deliver in self._finished:
+            self._ready.append(self._finished.pop(self._next_deliver))
+            self._next_deliver += 1
+
+    def close(self):
+        """Остановить процессы и освободить разделяемую память"""
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join(timeout=1.0)
+            if worker.is_alive():
+                worker.terminate()
+        del self.blocks, self.spectra
+        self._shm_in.close()
+        self._shm_in.unlink()
+        self._shm_out.close()
+        self._shm_out.unlink()
@@ -0,0 +1,83 @@
+"""
+Временной фильтр повторных записей одной частоты в детальный лог
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import time
+from collections import deque
+
+
+class FrequencyLogFilter:
+    """Индекс записанных частот: корзины шириной в допуск и очередь устаревания по времени"""
+
+    # Записанные частоты всегда отстоят друг от друга больше чем на допуск, поэтому
+    # в корзине не больше одной частоты, а все частоты в пределах допуска от искомой
+    # лежат в ее корзине и двух соседних - поиск O(1) при любом числе частот.
+    # Устаревшие записи снимаются с начала очереди, упорядоченной по времени записи.
+
+    def __init__(self, tolerance, timeout, retention=3600.0):
+        self.timeout = timeout      # секунды - минимальный интервал между записями одной частоты
+        self.retention = retention  # секунды - сколько помнить записанную частоту
+        self._tolerance = float(tolerance)
+        self._buckets = {}          # {номер корзины: (частота, время записи)}
+        self._expiry = deque()      # (время записи, номер корзины, частота) по возрастанию времени
+
+    def __len__(self):
+        return len(self._buckets)
+
+    @property
+    def tolerance(self):
+        return self._tolerance
+
+    @tolerance.setter
+    def tolerance(self, tolerance):
+        """Новый допуск: индекс перестраивается под новую ширину корзин"""
+        self._tolerance = float(tolerance)
+        entries = sorted(self._buckets.values(), key=lambda entry: entry[1])
+        self._buckets = {}
+        self._expiry = deque()
+        # При совпадении корзин остается более поздняя запись
+        for frequency, log_time in entries:
+            key = self._key(frequency)
+            self._buckets[key] = (frequency, log_time)
+            self._expiry.append((log_time, key, frequency))
+
+    def _key(self, frequency):
+        return int(frequency // self._tolerance)
+
+    def clear(self):
+        """Очистка истории записанных частот"""
+        self._buckets.clear()
+        self._expiry.clear()
+
+    def expire(self, now):
+        """Удалить записи старше срока хранения (амортизированно O(1))"""
+        cutoff = now - self.retention
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= cutoff:
+            log_time, key, frequency = expiry.popleft()
+            # Запись могла быть заменена более новой - тогда в очереди остался ее след
+            if self._buckets.get(key) == (frequency, log_time):
+                del self._buckets[key]
+
+    def should_log(self, frequency, now=None):
+        """Проверить, нужно ли логировать частоту, и запомнить ее, если нужно"""
+        if now is None:
+            now = time.time()
+        self.expire(now)
+
+        key = self._key(frequency)
+        matches = []
+        for neighbour in (key - 1, key, key + 1):
+            entry = self._buckets.get(neighbour)
+            if entry is not None and abs(frequency - entry[0]) <= self._tolerance:
+                if now - entry[1] < self.timeout:
+                    return False  # Слишком рано для повторной записи
+                matches.append(neighbour)
+
+        # Прошлые записи этого канала заменяются новой частотой
+        for neighbour in matches:
+            del self._buckets[neighbour]
+        self._buckets[key] = (frequency, now)
+        self._expiry.append((now, key, frequency))
+        return True
@@ -0,0 +1,156 @@
+"""
+Кольцевая история измерений с уровнями детализации для отображения
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import numpy as np
+
+
+class HistoryRing:
+    """Предвыделенная кольцевая история (время + несколько каналов) с пирамидой min/max"""
+
+    # Уровень k хранит min/max блоков по LOD_FACTOR**k точек. Пирамида обновляется
+    # при каждой записи, поэтому для отображения достаточно прочитать уровень,
+    # в котором блоков не меньше ширины графика, и свернуть его до ширины -
+    # стоимость зависит от ширины графика, а не от длины истории.
+    LOD_FACTOR = 8
+    MIN_LEVEL_BLOCKS = 64
+
+    def __init__(self, capacity, channels=1):
+        top_size = 1
+        while capacity // (top_size * self.LOD_FACTOR) >= self.MIN_LEVEL_BLOCKS:
+            top_size *= self.LOD_FACTOR
+        # Емкость кратна размеру блока старшего уровня, чтобы блоки не делились границей кольца
+        self.capacity = -(-int(capacity) // top_size) * top_size
+        self.channels = int(channels)
+        self.times = np.zeros(self.capacity)
+        self.values = np.zeros((self.capacity, self.channels))
+        self.levels = []  # [(размер блока, минимумы, максимумы)]
+        size = self.LOD_FACTOR
+        while size <= top_size:
+            blocks = self.capacity // size
+            self.levels.append((size, np.zeros((blocks, self.channels)), np.zeros((blocks, self.channels))))
+            size *= self.LOD_FACTOR
+        self.total = 0  # всего записанных точек (номер следующей)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def oldest(self):
+        """Номер самой старой хранимой точки"""
+        return max(0, self.total - self.capacity)
+
+    def clear(self):
+        """Очистка истории"""
+        self.total = 0
+
+    def append(self, timestamp, *values):
+        """Добавить точку: O(число уровней), без выделения памяти"""
+        seq = self.total
+        slot = seq % self.capacity
+        self.times[slot] = timestamp
+        row = self.values[slot]
+        row[:] = values
+        for size, mins, maxs in self.levels:
+            block = (seq // size) % len(mins)
+            if seq % size == 0:
+                mins[block] = row
+                maxs[block] = row
+            else:
+                np.minimum(mins[block], row, out=mins[block])
+                np.maximum(maxs[block], row, out=maxs[block])
+        self.total = seq + 1
+
+    def extend(self, timestamps, values):
+        """Добавить пачку точек (values - массив точки x каналы): векторно, без цикла по точкам"""
+        count = min(len(timestamps), self.capacity // 2)
+        if count == 0:
+            return
+        timestamps, values = timestamps[-count:], np.reshape(values, (-1, self.channels))[-count:]
+        first = self.total
+        index = np.arange(first, first + count) % self.capacity
+        self.times[index] = timestamps
+        self.values[index] = values
+        self.total = first + count
+        # Блоки уровней, затронутые пачкой, пересчитываются по исходным точкам от начала блока
+        for size, mins, maxs in self.levels:
+            block_start = first // size * size
+            seq = np.arange(block_start, self.total)
+            points = self.values[seq % self.capacity]
+            pad = -len(points) % size
+            if pad:
+                points = np.concatenate((points, np.repeat(points[-1:], pad, axis=0)))
+            points = points.reshape(-1, size, self.channels)
+            blocks = np.arange(block_start // size, block_start // size + len(points)) % len(mins)
+            mins[blocks] = points.min(axis=1)
+            maxs[blocks] = points.max(axis=1)
+
+    def data(self):
+        """Вся хранимая история в хронологическом порядке (копия)"""
+        index = np.arange(self.oldest, self.total) % self.capacity
+        return self.times[index], self.values[index]
+
+    def seq_at(self, timestamp):
+        """Номер первой точки не раньше timestamp (двоичный поиск по двум отсортированным частям кольца)"""
+        oldest, total = self.oldest, self.total
+        if total == oldest:
+            return total
+        start = oldest % self.capacity
+        if total - oldest < self.capacity or start == 0:
+            end = start + (total - oldest)
+            return oldest + int(np.searchsorted(self.times[start:end], timestamp))
+        # Кольцо заполнено и перенесено: [start, capacity) старше, [0, start) новее
+        older = self.times[start:]
+        if timestamp <= older[-1]:
+            return oldest + int(np.searchsorted(older, timestamp))
+        return oldest + len(older) + int(np.searchsorted(self.times[:start], timestamp))
+
+    def decimate(self, width, t_start=None, t_end=None):
+        """Огибающая min/max не более чем по width интервалам: (время, значения по каналам)"""
+        # Если точек больше ширины, каждый интервал дает две точки (min и max)
+        # с одинаковым временем - на графике это вертикальный отрезок размаха
+        first = self.oldest if t_start is None else max(self.oldest, self.seq_at(t_start))
+        last = self.total if t_end is None else min(self.total, self.seq_at(t_end) + 1)
+        count = last - first
+        width = max(1, int(width))
+        if count <= 0:
+            return np.zeros(0), np.zeros((0, self.channels))
+        if count <= width:
+            index = np.arange(first, last) % self.capacity
+            return self.times[index], self.values[index]
+
+        # Самый грубый уровень, в котором блоков еще не меньше ширины
+        size, mins, maxs = 1, None, None
+        for level_size, level_mins, level_maxs in self.levels:
+            if count // level_size < width:
+                break
+            size, mins, maxs = level_size, level_mins, level_maxs
+
+        if mins is None:
+            index = np.arange(first, last) % self.capacity
+            times = self.times[index]
+            block_mins = block_maxs = self.values[index]
+        else:
+            # Первый блок может содержать уже перезаписанные точки - начинаем с полного
+            first_block = -(-first // size)
+            blocks = np.arange(first_block, (last - 1) // size + 1)
+            times = self.times[(blocks * size) % self.capacity]
+            block_mins = mins[blocks % len(mins)]
+            block_maxs = maxs[blocks % len(maxs)]
+
+        # Сворачиваем выбранный уровень до ширины графика
+        ratio = -(-len(times) // width)
+        if ratio > 1:
+            pad = -len(times) % ratio
+            if pad:
+                block_mins = np.concatenate((block_mins, np.repeat(block_mins[-1:], pad, axis=0)))
+                block_maxs = np.concatenate((block_maxs, np.repeat(block_maxs[-1:], pad, axis=0)))
+            times = times[::ratio]
+            block_mins = block_mins.reshape(-1, ratio, self.channels).min(axis=1)
+            block_maxs = block_maxs.reshape(-1, ratio, self.channels).max(axis=1)
+
+        envelope = np.empty((2 * len(times), self.channels))
+        envelope[0::2] = block_mins
+        envelope[1::2] = block_maxs
+        return np.repeat(times, 2), envelope
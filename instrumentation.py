@@ -0,0 +1,115 @@
+"""
+Задержки этапов конвейера: метки времени кадра, скользящие процентили и глубина очередей
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import json
+import time
+
+import numpy as np
+
+# Этапы: (имя, метка начала, метка конца). Метки - time.monotonic() в словаре timing,
+# который едет вместе с кадром в dominant_freq_info['timing']
+STAGES = (
+    ("rx", "rx_start", "rx_end"),               # вызов sdr.rx()
+    ("ring", "rx_end", "dsp_start"),            # ожидание в кольце (непрерывный захват)
+    ("dsp", "dsp_start", "dsp_end"),            # спектр и детектор (или путь через пул процессов)
+    ("emit", "dsp_end", "emit"),                # удержание до отправки в GUI (прореживание кадров)
+    ("signal", "emit", "received"),             # очередь сигналов Qt между потоками
+    ("render_wait", "received", "render_start"),  # ожидание таймера отрисовки
+    ("render", "render_start", "render_end"),   # update_data
+    ("total", "rx_end", "render_end"),          # от получения блока до отрисовки
+)
+
+# Глубина очередей в момент прохождения кадра
+QUEUES = ("ring_depth", "pool_depth", "signal_depth")
+
+PERCENTILES = (50, 95, 99)
+
+# Границы корзин гистограммы для выгрузки: 1 мкс - 10 с, 10 корзин на декаду
+HISTOGRAM_EDGES = np.logspace(-6, 1, 71)
+
+
+class RollingWindow:
+    """Последние size значений в кольце (без выделения памяти при добавлении)"""
+
+    def __init__(self, size=1024):
+        self.values = np.zeros(int(size))
+        self.count = 0
+
+    def add(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def data(self):
+        return self.values[:min(self.count, len(self.values))]
+
+    def clear(self):
+        self.count = 0
+
+
+class PipelineStats:
+    """Скользящая статистика задержек по этапам и глубины очередей (заполняется в потоке GUI)"""
+
+    def __init__(self, window=1024):
+        self.latency = {name: RollingWindow(window) for name, _, _ in STAGES}
+        self.queues = {name: RollingWindow(window) for name in QUEUES}
+        self.frames = 0
+        self.started = time.time()
+
+    def clear(self):
+        """Сброс статистики"""
+        for window in list(self.latency.values()) + list(self.queues.values()):
+            window.clear()
+        self.frames = 0
+        self.started = time.time()
+
+    def record(self, timing):
+        """Учесть метки одного отрисованного кадра (этапы без обеих меток пропускаются)"""
+        for name, start, end in STAGES:
+            start_time = timing.get(start)
+            end_time = timing.get(end)
+            if start_time is not None and end_time is not None:
+                self.latency[name].add(end_time - start_time)
+        for name in QUEUES:
+            depth = timing.get(name)
+            if depth is not None:
+                self.queues[name].add(depth)
+        self.frames += 1
+
+    def summary(self):
+        """Процентили задержек (мс) и глубина очередей по окну последних кадров"""
+        stages = {}
+        for name, window in self.latency.items():
+            data = window.data()
+            if len(data):
+                p50, p95, p99 = np.percentile(data, PERCENTILES) * 1e3
+                stages[name] = {'p50': p50, 'p95': p95, 'p99': p99, 'max': data.max() * 1e3, 'count': len(data)}
+        queues = {}
+        for name, window in self.queues.items():
+            data = window.data()
+            if len(data):
+                queues[name] = {'mean': float(data.mean()), 'max': float(data.max())}
+        return {'stages': stages, 'queues': queues, 'frames': self.frames}
+
+    def dump(self, path, meta=None):
+        """Записать сводку и гистограммы задержек (секунды, логарифмические корзины) в JSON"""
+        summary = self.summary()
+        histograms = {}
+        for name, window in self.latency.items():
+            data = window.data()
+            if len(data):
+                counts, _ = np.histogram(data, HISTOGRAM_EDGES)
+                histograms[name] = counts.tolist()
+        report = {
+            'meta': dict(meta or {}, time=time.strftime("%Y-%m-%dT%H:%M:%S"), started=self.started),
+            'summary': {
+                'stages': {name: {k: float(v) for k, v in values.items()} for name, values in summary['stages'].items()},
+                'queues': summary['queues'],
+                'frames': summary['frames'],
+            },
+            'histogram_edges': HISTOGRAM_EDGES.tolist(),
+            'histograms': histograms,
+        }
+        with open(path, "w") as output:
+            json.dump(report, output, indent=1)
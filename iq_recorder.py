@@ -0,0 +1,259 @@
+"""
+Запись сырых IQ-отсчетов в файл, отображенный в память, с описанием в формате SigMF
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import collections
+import datetime
+import json
+import mmap
+import os
+import threading
+import time
+
+import numpy as np
+
+# Форматы хранения: тип элемента файла, элементов на отсчет, тип данных SigMF
+IQ_FORMATS = {
+    "ci16": (np.dtype("<i2"), 2, "ci16_le"),
+    "cf32": (np.dtype("<c8"), 1, "cf32_le"),
+}
+
+SIGMF_VERSION = "1.0.0"
+
+
+def sigmf_datetime(timestamp):
+    """Время в формате SigMF (ISO 8601, UTC)"""
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def load_recording(path):
+    """Открыть запись: (отсчеты complex64 или int16 [N, 2] как memmap только для чтения, описание SigMF)"""
+    with open(path + ".sigmf-meta") as meta_file:
+        meta = json.load(meta_file)
+    datatype = meta["global"]["core:datatype"]
+    item_dtype, items, _ = next(fmt for fmt in IQ_FORMATS.values() if fmt[2] == datatype)
+    count = os.path.getsize(path + ".sigmf-data") // (item_dtype.itemsize * items)
+    if count == 0:
+        return np.zeros((0, items) if items > 1 else 0, dtype=item_dtype), meta
+    shape = (count, items) if items > 1 else (count,)
+    return np.memmap(path + ".sigmf-data", dtype=item_dtype, mode="r", shape=shape), meta
+
+
+class IQRecorder(threading.Thread):
+    """Поток записи IQ: блоки из очереди копируются в предвыделенный файл, отображенный в память"""
+
+    # Файл выделяется на диске целиком при старте (posix_fallocate), поэтому запись
+    # в отображение не упирается в нехватку места посреди записи. Поток приема только
+    # ставит ссылку на блок в очередь; преобразование формата и копирование в файл
+    # выполняются здесь. Очередь ограничена секундами эфира: если диск не успевает,
+    # блоки отбрасываются, а в описании начинается новый сегмент захвата.
+
+    def __init__(self, path, sample_rate, center_freq, gain, fmt="ci16", max_seconds=60.0,
+                 bandwidth=None, max_queue_seconds=2.0, flush_interval=1.0, on_finished=None):
+        super().__init__(daemon=True)
+        self.path = path
+        self.data_path = path + ".sigmf-data"
+        self.meta_path = path + ".sigmf-meta"
+        self.sample_rate = float(sample_rate)
+        self.bandwidth = bandwidth
+        self.fmt = fmt
+        self.item_dtype, self.items, self.datatype = IQ_FORMATS[fmt]
+        self.sample_bytes = self.item_dtype.itemsize * self.items
+        self.capacity = max(1, int(max_seconds * self.sample_rate))
+        self.max_queue_samples = max(1, int(max_queue_seconds * self.sample_rate))
+        self.flush_interval = flush_interval
+        self.on_finished = on_finished
+
+        self.start_time = time.time()
+        self.samples_written = 0
+        self.dropped_blocks = 0    # блоки, не поместившиеся в очередь
+        self.dropped_samples = 0
+        self.busy_time = 0.0       # секунды, затраченные на копирование в файл
+        self.full = False
+        self.error = None
+        self.reason = None         # причина завершения: stopped, full, sample_rate, error
+        self.captures = []
+
+        self._queue = collections.deque()
+        self._queued_samples = 0
+        self._next_capture = (float(center_freq), gain)
+        self._gap = True           # следующий блок начинает новый сегмент захвата
+        self._closing = False
+        self._cond = threading.Condition()
+
+        directory = os.path.dirname(self.data_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        size = self.capacity * self.sample_bytes
+        self._file = open(self.data_path, "w+b")
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(self._file.fileno(), 0, size)
+            else:
+                self._file.truncate(size)
+            self._mmap = mmap.mmap(self._file.fileno(), size)
+        except OSError:
+            self._file.close()
+            os.remove(self.data_path)
+            raise
+        self._data = np.frombuffer(self._mmap, dtype=self.item_dtype).reshape(-1, self.items)
+        self._flushed_bytes = 0
+
+    def submit(self, samples, timestamp=None, contiguous=True):
+        """Поставить блок в очередь записи; никогда не блокирует (блок после этого не изменяется)"""
+        if timestamp is None:
+            timestamp = time.time()
+        count = len(samples)
+        with self._cond:
+            if self._closing:
+                return False
+            if self._queued_samples + count > self.max_queue_samples:
+                self.dropped_blocks += 1
+                self.dropped_samples += count
+                self._gap = True
+                return False
+            capture, self._next_capture = self._next_capture, None
+            gap, self._gap = self._gap or not contiguous, False
+            self._queue.append((samples, timestamp, gap, capture))
+            self._queued_samples += count
+            self._cond.notify()
+        return True
+
+    def retune(self, center_freq, gain):
+        """Новая частота или усиление: следующий блок начинает новый сегмент захвата"""
+        with self._cond:
+            self._next_capture = (float(center_freq), gain)
+
+    def run(self):
+        """Цикл записи до остановки, заполнения файла или ошибки"""
+        capture = self._next_capture
+        last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closing)
+                if not self._queue:
+                    break
+                samples, timestamp, gap, new_capture = self._queue.popleft()
+                self._queued_samples -= len(samples)
+
+            if new_capture is not None:
+                capture = new_capture
+            if gap or new_capture is not None:
+                self._add_capture(timestamp, *capture)
+            try:
+                self._write(samples)
+                if time.monotonic() - last_flush >= self.flush_interval:
+                    self._flush()
+                    last_flush = time.monotonic()
+            except (OSError, ValueError) as e:
+                self.error = e
+                self.reason = "error"
+                break
+            if self.full:
+                self.reason = "full"
+                break
+
+        with self._cond:
+            self._closing = True
+            self._queue.clear()
+            self._queued_samples = 0
+        self._finalize()
+        if self.on_finished is not None:
+            self.on_finished(self)
+
+    def _add_capture(self, timestamp, center_freq, gain):
+        """Сегмент захвата SigMF с текущей позиции"""
+        capture = {
+            "core:sample_start": self.samples_written,
+            "core:frequency": center_freq,
+            "core:datetime": sigmf_datetime(timestamp),
+            "pluto:gain": gain,
+        }
+        # Несколько событий на одной позиции дают один сегмент
+        if self.captures and self.captures[-1]["core:sample_start"] == self.samples_written:
+            self.captures[-1] = capture
+        else:
+            self.captures.append(capture)
+
+    def _write(self, samples):
+        """Скопировать блок в отображение с преобразованием формата"""
+        start = time.perf_counter()
+        position = self.samples_written
+        count = min(len(samples), self.capacity - position)
+        samples = np.asarray(samples)[:count]
+        target = self._data[position:position + count]
+        if self.items == 2:
+            # Pluto отдает целые значения АЦП, поэтому I и Q помещаются в int16 без округления
+            samples = np.ascontiguousarray(samples)
+            np.copyto(target.reshape(-1), samples.view(samples.real.dtype), casting="unsafe")
+        else:
+            np.copyto(target[:, 0], samples, casting="same_kind")
+        self.samples_written = position + count
+        self.full = self.samples_written >= self.capacity
+        self.busy_time += time.perf_counter() - start
+
+    def _flush(self):
+        """Сбросить на диск записанную с прошлого сброса часть отображения"""
+        written = self.samples_written * self.sample_bytes
+        offset = self._flushed_bytes - self._flushed_bytes % mmap.ALLOCATIONGRANULARITY
+        if written > offset:
+            self._mmap.flush(offset, written - offset)
+        self._flushed_bytes = written
+
+    def _finalize(self):
+        """Закрыть отображение, обрезать файл до записанной длины и записать описание"""
+        try:
+            self._flush()
+        except (OSError, ValueError) as e:
+            self.error = self.error or e
+        del self._data
+        self._mmap.close()
+        self._file.truncate(self.samples_written * self.sample_bytes)
+        self._file.close()
+        with open(self.meta_path, "w") as meta_file:
+            json.dump(self.metadata(), meta_file, indent=2)
+
+    def metadata(self):
+        """Описание записи в формате SigMF"""
+        global_info = {
+            "core:datatype": self.datatype,
+            "core:sample_rate": self.sample_rate,
+            "core:version": SIGMF_VERSION,
+            "core:num_channels": 1,
+            "core:hw": "ADALM-PLUTO",
+            "core:recorder": "ADALM-PLUTO Power Analyzer",
+            "core:extensions": [{"name": "pluto", "version": "1.0.0", "optional": True}],
+            "pluto:start_time": sigmf_datetime(self.start_time),
+            "pluto:dropped_samples": self.dropped_samples,
+        }
+        if self.bandwidth is not None:
+            global_info["pluto:bandwidth"] = self.bandwidth
+        return {"global": global_info, "captures": self.captures, "annotations": []}
+
+    def stop(self, reason="stopped", timeout=None):
+        """Дописать очередь и завершить запись (timeout=None - не ждать завершения)"""
+        with self._cond:
+            if self.reason is None:
+                self.reason = reason
+            self._closing = True
+            self._cond.notify()
+        if timeout is not None:
+            self.join(timeout)
+
+    def stats(self):
+        """Статистика записи: длительность, устойчивая скорость и запас скорости записи"""
+        written_bytes = self.samples_written * self.sample_bytes
+        elapsed = time.time() - self.start_time
+        return {
+            'path': self.path,
+            'seconds': self.samples_written / self.sample_rate,
+            'bytes_written': written_bytes,
+            'throughput': written_bytes / elapsed / 1e6 if elapsed > 0 else 0.0,
+            'write_rate': written_bytes / self.busy_time / 1e6 if self.busy_time > 0 else 0.0,
+            'dropped_blocks': self.dropped_blocks,
+            'queue_fill': self._queued_samples / self.max_queue_samples,
+            'fill': self.samples_written / self.capacity,
+            'reason': self.reason,
+        }
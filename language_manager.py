@@ -121,6 +121,139 @@ class LanguageManager:
                 # Подписи линий на графике
                 "detection_line_label": "Детекция",
                 "log_line_label": "Лог",
+                
+                # Непрерывный захват
+                "continuous_capture": "Непрерывный захват",
+                "continuous_tooltip": "Прием без пропусков через кольцевой буфер (применяется при подключении)",
+                "capture_stats": "Захват: {:.1f}% | Потери: {} | Переполн.: {}",
+                
+                # Процессы DSP
+                "dsp_workers": "Процессы DSP:",
+                "dsp_workers_tooltip": "Обработка спектра в отдельных процессах (0 - в потоке приема, применяется при подключении; буферы меньше 65536 всегда в потоке приема)",
+                
+                # Окно FFT
+                "fft_window": "Окно FFT:",
+                "fft_window_tooltip": "Оконная функция спектра (уровень тона сохраняется)",
+                "window_rect": "Прямоугольное",
+                "window_hann": "Ханна",
+                "window_hamming": "Хэмминга",
+                "window_blackman": "Блэкмана",
+                
+                # Усреднение спектра
+                "averaging": "Усреднение:",
+                "averaging_off": "Выкл",
+                "averaging_linear": "Линейное",
+                "averaging_exponential": "Экспоненциальное",
+                "averaging_welch": "Уэлч",
+                "averaging_tooltip": "Усреднение спектра снижает разброс шумовой полки ценой задержки",
+                "averaging_frames_tooltip": "Количество усредняемых кадров",
+                "overlap_tooltip": "Перекрытие сегментов Уэлча",
+                "averaging_changed": "Усреднение: {} (N={})",
+                
+                # Отрисовка
+                "display_fps_tooltip": "Частота отрисовки графиков (не влияет на скорость обработки)",
+                "channel_plan": "План каналов:",
+                "channel_plan_off": "Выкл",
+                "channel_plan_tooltip": "Мощность каждого канала плана частот по банку фильтров (применяется сразу, не действует при панорамном обзоре)",
+                "channel_plan_changed": "План каналов: {}",
+                "channels_group": "Мощность каналов",
+                "channels_axis": "Канал",
+                "occupancy_window": "Окно:",
+                "occupancy_window_tooltip": "Скользящее окно статистики занятости каналов",
+                "occupancy_minutes": "{:.0f} мин",
+                "occupancy_hours": "{:.0f} ч",
+                "occupancy_channel": "Канал, МГц",
+                "occupancy_duty": "Занятость, %",
+                "occupancy_bursts": "Передачи",
+                "occupancy_mean": "Средняя, дБм",
+                "occupancy_max": "Макс., дБм",
+                "occupancy_export": "Экспорт CSV",
+                "occupancy_export_tooltip": "Сохранить занятость каналов во всех окнах в CSV в каталоге журналов",
+                "occupancy_exported": "Занятость каналов сохранена: {}",
+                "occupancy_export_error": "Ошибка сохранения занятости: {}",
+                "burst_envelope": "Огибающая и пакеты",
+                "burst_envelope_tooltip": "Вместо точки RSSI на кадр - огибающая мощности скользящим окном по всем отсчетам; пакеты выше шумового пола записываются в bursts_*.csv",
+                "burst_stats": "Пакеты: {} | последний: {:.3f} мс, {:.1f} дБм",
+                "burst_detection_enabled": "Обнаружение пакетов включено: окно {} отсчетов ({:.1f} мкс)",
+                "burst_detection_disabled": "Обнаружение пакетов выключено",
+                "zoom": "Масштаб",
+                "zoom_tooltip": "Спектр только выделенной желтым полосы: перенос на ноль, фильтр с прореживанием и короткое FFT (не действует при панорамном обзоре)",
+                "zoom_enabled": "Масштабирование {:.3f}-{:.3f} МГц: прореживание x{}, разрешение {:.1f} Гц",
+                "zoom_disabled": "Масштабирование выключено: спектр всей полосы",
+                "zoom_invalid": "Масштабирование невозможно: полоса {:.3f}-{:.3f} МГц пуста или вне полосы приема",
+                "waterfall_enable": "Водопад",
+                "waterfall_tooltip": "Спектрограмма под графиком FFT: одна строка на кадр, новые сверху",
+                "waterfall_rows": "строк",
+                "waterfall_depth_tooltip": "Глубина истории водопада в кадрах (при изменении история начинается заново)",
+                "waterfall_axis": "Кадры",
+                "render_stats": "Кадры: {:.0f}/с | Отрисовка: {:.0f}/с | Пропущено: {}",
+                "pipeline_latency": "Задержки конвейера",
+                "pipeline_latency_tooltip": "Метки времени этапов в каждом кадре: прием, DSP, отправка, очередь Qt, отрисовка",
+                "pipeline_dump": "Сохранить JSON",
+                "pipeline_dump_tooltip": "Сохранить процентили и гистограммы задержек в каталог журналов",
+                "pipeline_waiting": "Задержки: ожидание кадров...",
+                "pipeline_stats": "Задержки p50/p95, мс: {}",
+                "pipeline_stats_tooltip": "Кадров: {}\nЭтапы, мс:\n{}\nОчереди, блоков (среднее / максимум):\n{}",
+                "pipeline_dumped": "Задержки сохранены: {}",
+                "pipeline_dump_error": "Ошибка сохранения задержек: {}",
+                
+                # Профиль отрисовки
+                "render_profile": "Отрисовка:",
+                "render_profile_quality": "Качество",
+                "render_profile_performance": "Производительность",
+                "render_profile_tooltip": "Производительность: без сглаживания, постоянные элементы графиков, прореживание кривых",
+                "render_profile_changed": "Профиль отрисовки: {}",
+                
+                # Адаптивный порог
+                "detection_mode": "Режим порога:",
+                "detection_mode_fixed": "Фиксированный",
+                "detection_mode_adaptive": "Адаптивный (CFAR)",
+                "detection_mode_tooltip": "Адаптивный: порог по оценке шумового пола в каждом бине, не зависит от усиления",
+                "cfar_offset": "Превышение CFAR:",
+                "cfar_offset_tooltip": "На сколько сигнал должен превышать оценку шума соседних бинов",
+                "cfar_legend": "Адаптивный порог",
+                "detection_mode_changed": "Режим порога: {}",
+                "log_history_error": "История журнала не сохраняется на диск: {}",
+
+                # Запись IQ
+                "record_group": "Запись IQ",
+                "record_iq": "Записывать IQ",
+                "record_tooltip": "Запись сырых отсчетов в файл SigMF (.sigmf-data + .sigmf-meta)",
+                "record_format": "Формат:",
+                "record_format_ci16": "int16 (как АЦП)",
+                "record_format_cf32": "float32",
+                "record_seconds": "Макс. длительность:",
+                "record_seconds_tooltip": "Размер файла, выделяемого на диске при старте записи",
+                "record_stats": "{:.1f} с | {:.1f} МБ/с (запас до {:.0f} МБ/с) | Потери: {}",
+                "record_started": "Запись IQ: {}",
+                "record_finished": "Запись IQ завершена: {} ({:.1f} с, {:.1f} МБ/с, потеряно блоков: {}) - {}",
+                "record_reason_stopped": "остановлена",
+                "record_reason_full": "файл заполнен",
+                "record_reason_sample_rate": "изменена частота дискретизации",
+                "record_reason_error": "ошибка записи",
+                "record_error": "Ошибка записи IQ: {}",
+
+                # Источник отсчетов
+                "sample_source": "Источник:",
+                "source_pluto": "ADALM-PLUTO",
+                "source_file": "IQ-файл",
+                "source_simulator": "Симулятор эфира",
+                "open_iq_file": "Файл...",
+                "open_iq_file_title": "Открыть IQ-запись",
+                "replay_fast": "Как можно быстрее",
+                "replay_fast_tooltip": "Файл и симулятор - с максимальной скоростью обработки, а не в реальном времени",
+                "replay_no_file": "Не выбран файл для воспроизведения",
+                "replay_error": "Ошибка открытия IQ-файла: {}",
+                "replay_started": "Воспроизведение: {} ({:.3f} Msps, {:.1f} с)",
+                "replay_finished": "Воспроизведение файла завершено",
+                "simulator_started": "Симуляция эфира (seed {})",
+                "monitor_started": "Монитор: {:.3f} МГц, {:.3f} Msps, усиление {} дБ, обнаружения -> {}",
+                "monitor_finished": "Монитор остановлен: кадров {}, обнаружений {}",
+                "sweep_mode": "Панорамный обзор",
+                "sweep_tooltip": "Перестраивать частоту по диапазону и сшивать спектры в одну панораму (применяется при подключении)",
+                "sweep_start": "Начало (МГц):",
+                "sweep_stop": "Конец (МГц):",
+                "sweep_stats": "Обзор: {:.1f} мс | Шагов: {} | {:.0f} МГц/с",
             },
             
             "en": {
@@ -230,6 +363,139 @@ class LanguageManager:
                 # Line labels on graph
                 "detection_line_label": "Detection",
                 "log_line_label": "Log",
+                
+                # Continuous capture
+                "continuous_capture": "Continuous Capture",
+                "continuous_tooltip": "Gapless reception through a ring buffer (applied on connect)",
+                "capture_stats": "Capture: {:.1f}% | Dropped: {} | Overflow: {}",
+                
+                # DSP processes
+                "dsp_workers": "DSP Processes:",
+                "dsp_workers_tooltip": "Spectrum processing in separate processes (0 - in the receive thread, applied on connect; buffers below 65536 always stay in the receive thread)",
+                
+                # FFT window
+                "fft_window": "FFT Window:",
+                "fft_window_tooltip": "Spectrum window function (tone level is preserved)",
+                "window_rect": "Rectangular",
+                "window_hann": "Hann",
+                "window_hamming": "Hamming",
+                "window_blackman": "Blackman",
+                
+                # Spectrum averaging
+                "averaging": "Averaging:",
+                "averaging_off": "Off",
+                "averaging_linear": "Linear",
+                "averaging_exponential": "Exponential",
+                "averaging_welch": "Welch",
+                "averaging_tooltip": "Spectrum averaging lowers noise floor variance at the cost of latency",
+                "averaging_frames_tooltip": "Number of averaged frames",
+                "overlap_tooltip": "Welch segment overlap",
+                "averaging_changed": "Averaging: {} (N={})",
+                
+                # Rendering
+                "display_fps_tooltip": "Plot refresh rate (does not affect processing rate)",
+                "channel_plan": "Channel Plan:",
+                "channel_plan_off": "Off",
+                "channel_plan_tooltip": "Per-channel power of the frequency plan from a filter bank (applied immediately, not used in sweep mode)",
+                "channel_plan_changed": "Channel plan: {}",
+                "channels_group": "Channel Power",
+                "channels_axis": "Channel",
+                "occupancy_window": "Window:",
+                "occupancy_window_tooltip": "Sliding window of the channel occupancy statistics",
+                "occupancy_minutes": "{:.0f} min",
+                "occupancy_hours": "{:.0f} h",
+                "occupancy_channel": "Channel, MHz",
+                "occupancy_duty": "Duty, %",
+                "occupancy_bursts": "Bursts",
+                "occupancy_mean": "Mean, dBm",
+                "occupancy_max": "Max, dBm",
+                "occupancy_export": "Export CSV",
+                "occupancy_export_tooltip": "Save channel occupancy for all windows as CSV in the log directory",
+                "occupancy_exported": "Channel occupancy saved: {}",
+                "occupancy_export_error": "Occupancy save error: {}",
+                "burst_envelope": "Envelope and bursts",
+                "burst_envelope_tooltip": "Plot a sliding-window power envelope of every sample instead of one RSSI point per frame; bursts above the noise floor go to bursts_*.csv",
+                "burst_stats": "Bursts: {} | last: {:.3f} ms, {:.1f} dBm",
+                "burst_detection_enabled": "Burst detection on: window {} samples ({:.1f} us)",
+                "burst_detection_disabled": "Burst detection off",
+                "zoom": "Zoom",
+                "zoom_tooltip": "Spectrum of the band highlighted in yellow only: shift to zero, decimating filter and a short FFT (ignored in sweep mode)",
+                "zoom_enabled": "Zoom {:.3f}-{:.3f} MHz: decimation x{}, resolution {:.1f} Hz",
+                "zoom_disabled": "Zoom off: full-band spectrum",
+                "zoom_invalid": "Zoom unavailable: band {:.3f}-{:.3f} MHz is empty or outside the receive band",
+                "waterfall_enable": "Waterfall",
+                "waterfall_tooltip": "Spectrogram under the FFT plot: one row per frame, newest at the top",
+                "waterfall_rows": "rows",
+                "waterfall_depth_tooltip": "Waterfall history depth in frames (changing it restarts the history)",
+                "waterfall_axis": "Frames",
+                "render_stats": "Frames: {:.0f}/s | Drawn: {:.0f}/s | Skipped: {}",
+                "pipeline_latency": "Pipeline latency",
+                "pipeline_latency_tooltip": "Per-stage timestamps in every frame: receive, DSP, emit, Qt queue, render",
+                "pipeline_dump": "Save JSON",
+                "pipeline_dump_tooltip": "Save latency percentiles and histograms to the log directory",
+                "pipeline_waiting": "Latency: waiting for frames...",
+                "pipeline_stats": "Latency p50/p95, ms: {}",
+                "pipeline_stats_tooltip": "Frames: {}\nStages, ms:\n{}\nQueues, blocks (mean / max):\n{}",
+                "pipeline_dumped": "Latency saved: {}",
+                "pipeline_dump_error": "Latency save error: {}",
+                
+                # Render profile
+                "render_profile": "Rendering:",
+                "render_profile_quality": "Quality",
+                "render_profile_performance": "Performance",
+                "render_profile_tooltip": "Performance: no antialiasing, retained plot items, curve downsampling",
+                "render_profile_changed": "Render profile: {}",
+                
+                # Adaptive threshold
+                "detection_mode": "Threshold Mode:",
+                "detection_mode_fixed": "Fixed",
+                "detection_mode_adaptive": "Adaptive (CFAR)",
+                "detection_mode_tooltip": "Adaptive: per-bin threshold from the noise floor estimate, independent of gain",
+                "cfar_offset": "CFAR Margin:",
+                "cfar_offset_tooltip": "How far a signal must exceed the noise estimate of neighbouring bins",
+                "cfar_legend": "Adaptive threshold",
+                "detection_mode_changed": "Threshold mode: {}",
+                "log_history_error": "Log history is not written to disk: {}",
+
+                # IQ recording
+                "record_group": "IQ Recording",
+                "record_iq": "Record IQ",
+                "record_tooltip": "Record raw samples to a SigMF file (.sigmf-data + .sigmf-meta)",
+                "record_format": "Format:",
+                "record_format_ci16": "int16 (as ADC)",
+                "record_format_cf32": "float32",
+                "record_seconds": "Max Duration:",
+                "record_seconds_tooltip": "Size of the file allocated on disk when recording starts",
+                "record_stats": "{:.1f} s | {:.1f} MB/s (headroom up to {:.0f} MB/s) | Dropped: {}",
+                "record_started": "IQ recording: {}",
+                "record_finished": "IQ recording finished: {} ({:.1f} s, {:.1f} MB/s, dropped blocks: {}) - {}",
+                "record_reason_stopped": "stopped",
+                "record_reason_full": "file full",
+                "record_reason_sample_rate": "sample rate changed",
+                "record_reason_error": "write error",
+                "record_error": "IQ recording error: {}",
+
+                # Sample source
+                "sample_source": "Source:",
+                "source_pluto": "ADALM-PLUTO",
+                "source_file": "IQ file",
+                "source_simulator": "RF simulator",
+                "open_iq_file": "File...",
+                "open_iq_file_title": "Open IQ recording",
+                "replay_fast": "As fast as possible",
+                "replay_fast_tooltip": "File and simulator run at full processing speed instead of real time",
+                "replay_no_file": "No file selected for replay",
+                "replay_error": "Cannot open IQ file: {}",
+                "replay_started": "Replay: {} ({:.3f} Msps, {:.1f} s)",
+                "replay_finished": "File replay finished",
+                "simulator_started": "RF scene simulation (seed {})",
+                "monitor_started": "Monitor: {:.3f} MHz, {:.3f} Msps, gain {} dB, detections -> {}",
+                "monitor_finished": "Monitor stopped: {} frames, {} detections",
+                "sweep_mode": "Wideband sweep",
+                "sweep_tooltip": "Step the LO across the span and stitch the spectra into one panorama (applied on connect)",
+                "sweep_start": "Start (MHz):",
+                "sweep_stop": "Stop (MHz):",
+                "sweep_stats": "Sweep: {:.1f} ms | Steps: {} | {:.0f} MHz/s",
             },
             
             "de": {
@@ -339,6 +605,139 @@ class LanguageManager:
                 # Linienbeschriftungen im Diagramm
                 "detection_line_label": "Erkennung",
                 "log_line_label": "Protokoll",
+                
+                # Kontinuierliche Erfassung
+                "continuous_capture": "Kontinuierliche Erfassung",
+                "continuous_tooltip": "Lückenloser Empfang über Ringpuffer (wirkt beim Verbinden)",
+                "capture_stats": "Erfassung: {:.1f}% | Verloren: {} | Überlauf: {}",
+                
+                # DSP-Prozesse
+                "dsp_workers": "DSP-Prozesse:",
+                "dsp_workers_tooltip": "Spektrumverarbeitung in separaten Prozessen (0 - im Empfangsthread, wirkt beim Verbinden; Puffer unter 65536 immer im Empfangsthread)",
+                
+                # FFT-Fenster
+                "fft_window": "FFT-Fenster:",
+                "fft_window_tooltip": "Fensterfunktion des Spektrums (Tonpegel bleibt erhalten)",
+                "window_rect": "Rechteck",
+                "window_hann": "Hann",
+                "window_hamming": "Hamming",
+                "window_blackman": "Blackman",
+                
+                # Spektrummittelung
+                "averaging": "Mittelung:",
+                "averaging_off": "Aus",
+                "averaging_linear": "Linear",
+                "averaging_exponential": "Exponentiell",
+                "averaging_welch": "Welch",
+                "averaging_tooltip": "Spektrummittelung verringert die Rauschschwankung auf Kosten der Latenz",
+                "averaging_frames_tooltip": "Anzahl gemittelter Frames",
+                "overlap_tooltip": "Überlappung der Welch-Segmente",
+                "averaging_changed": "Mittelung: {} (N={})",
+                
+                # Darstellung
+                "display_fps_tooltip": "Bildwiederholrate der Diagramme (beeinflusst die Verarbeitung nicht)",
+                "channel_plan": "Kanalplan:",
+                "channel_plan_off": "Aus",
+                "channel_plan_tooltip": "Leistung jedes Kanals des Frequenzplans aus einer Filterbank (sofort wirksam, nicht im Panorama-Modus)",
+                "channel_plan_changed": "Kanalplan: {}",
+                "channels_group": "Kanalleistung",
+                "channels_axis": "Kanal",
+                "occupancy_window": "Fenster:",
+                "occupancy_window_tooltip": "Gleitendes Fenster der Kanalbelegungsstatistik",
+                "occupancy_minutes": "{:.0f} min",
+                "occupancy_hours": "{:.0f} h",
+                "occupancy_channel": "Kanal, MHz",
+                "occupancy_duty": "Belegung, %",
+                "occupancy_bursts": "Sendungen",
+                "occupancy_mean": "Mittel, dBm",
+                "occupancy_max": "Max., dBm",
+                "occupancy_export": "CSV exportieren",
+                "occupancy_export_tooltip": "Kanalbelegung aller Fenster als CSV im Protokollverzeichnis speichern",
+                "occupancy_exported": "Kanalbelegung gespeichert: {}",
+                "occupancy_export_error": "Fehler beim Speichern der Belegung: {}",
+                "burst_envelope": "Hüllkurve und Bursts",
+                "burst_envelope_tooltip": "Leistungshüllkurve aller Abtastwerte (gleitendes Fenster) statt eines RSSI-Punkts pro Frame; Bursts über dem Rauschboden werden in bursts_*.csv geschrieben",
+                "burst_stats": "Bursts: {} | letzter: {:.3f} ms, {:.1f} dBm",
+                "burst_detection_enabled": "Burst-Erkennung an: Fenster {} Abtastwerte ({:.1f} µs)",
+                "burst_detection_disabled": "Burst-Erkennung aus",
+                "zoom": "Zoom",
+                "zoom_tooltip": "Spektrum nur des gelb markierten Bandes: Verschiebung auf null, dezimierendes Filter und kurze FFT (im Sweep-Modus ohne Wirkung)",
+                "zoom_enabled": "Zoom {:.3f}-{:.3f} MHz: Dezimierung x{}, Auflösung {:.1f} Hz",
+                "zoom_disabled": "Zoom aus: Spektrum des gesamten Bandes",
+                "zoom_invalid": "Zoom nicht möglich: Band {:.3f}-{:.3f} MHz ist leer oder außerhalb des Empfangsbandes",
+                "waterfall_enable": "Wasserfall",
+                "waterfall_tooltip": "Spektrogramm unter dem FFT-Diagramm: eine Zeile pro Frame, neueste oben",
+                "waterfall_rows": "Zeilen",
+                "waterfall_depth_tooltip": "Verlaufstiefe des Wasserfalls in Frames (eine Änderung startet den Verlauf neu)",
+                "waterfall_axis": "Frames",
+                "render_stats": "Frames: {:.0f}/s | Gezeichnet: {:.0f}/s | Übersprungen: {}",
+                "pipeline_latency": "Pipeline-Latenz",
+                "pipeline_latency_tooltip": "Zeitstempel je Stufe in jedem Frame: Empfang, DSP, Senden, Qt-Warteschlange, Zeichnen",
+                "pipeline_dump": "JSON speichern",
+                "pipeline_dump_tooltip": "Latenz-Perzentile und Histogramme im Protokollverzeichnis speichern",
+                "pipeline_waiting": "Latenz: warte auf Frames...",
+                "pipeline_stats": "Latenz p50/p95, ms: {}",
+                "pipeline_stats_tooltip": "Frames: {}\nStufen, ms:\n{}\nWarteschlangen, Blöcke (Mittel / Maximum):\n{}",
+                "pipeline_dumped": "Latenz gespeichert: {}",
+                "pipeline_dump_error": "Fehler beim Speichern der Latenz: {}",
+                
+                # Darstellungsprofil
+                "render_profile": "Darstellung:",
+                "render_profile_quality": "Qualität",
+                "render_profile_performance": "Leistung",
+                "render_profile_tooltip": "Leistung: ohne Kantenglättung, dauerhafte Diagrammelemente, Kurvenausdünnung",
+                "render_profile_changed": "Darstellungsprofil: {}",
+                
+                # Adaptive Schwelle
+                "detection_mode": "Schwellenmodus:",
+                "detection_mode_fixed": "Fest",
+                "detection_mode_adaptive": "Adaptiv (CFAR)",
+                "detection_mode_tooltip": "Adaptiv: Schwelle je Bin aus der Rauschboden-Schätzung, unabhängig von der Verstärkung",
+                "cfar_offset": "CFAR-Abstand:",
+                "cfar_offset_tooltip": "Um wie viel ein Signal die Rauschschätzung benachbarter Bins übersteigen muss",
+                "cfar_legend": "Adaptive Schwelle",
+                "detection_mode_changed": "Schwellenmodus: {}",
+                "log_history_error": "Protokollverlauf wird nicht auf die Festplatte geschrieben: {}",
+
+                # IQ-Aufnahme
+                "record_group": "IQ-Aufnahme",
+                "record_iq": "IQ aufnehmen",
+                "record_tooltip": "Rohabtastwerte in eine SigMF-Datei aufnehmen (.sigmf-data + .sigmf-meta)",
+                "record_format": "Format:",
+                "record_format_ci16": "int16 (wie ADC)",
+                "record_format_cf32": "float32",
+                "record_seconds": "Max. Dauer:",
+                "record_seconds_tooltip": "Größe der Datei, die beim Start der Aufnahme auf der Festplatte reserviert wird",
+                "record_stats": "{:.1f} s | {:.1f} MB/s (Reserve bis {:.0f} MB/s) | Verloren: {}",
+                "record_started": "IQ-Aufnahme: {}",
+                "record_finished": "IQ-Aufnahme beendet: {} ({:.1f} s, {:.1f} MB/s, verlorene Blöcke: {}) - {}",
+                "record_reason_stopped": "gestoppt",
+                "record_reason_full": "Datei voll",
+                "record_reason_sample_rate": "Abtastrate geändert",
+                "record_reason_error": "Schreibfehler",
+                "record_error": "IQ-Aufnahmefehler: {}",
+
+                # Abtastquelle
+                "sample_source": "Quelle:",
+                "source_pluto": "ADALM-PLUTO",
+                "source_file": "IQ-Datei",
+                "source_simulator": "Funksimulator",
+                "open_iq_file": "Datei...",
+                "open_iq_file_title": "IQ-Aufnahme öffnen",
+                "replay_fast": "So schnell wie möglich",
+                "replay_fast_tooltip": "Datei und Simulator mit voller Verarbeitungsgeschwindigkeit statt in Echtzeit",
+                "replay_no_file": "Keine Datei zur Wiedergabe ausgewählt",
+                "replay_error": "IQ-Datei kann nicht geöffnet werden: {}",
+                "replay_started": "Wiedergabe: {} ({:.3f} Msps, {:.1f} s)",
+                "replay_finished": "Dateiwiedergabe beendet",
+                "simulator_started": "Funkszenen-Simulation (Seed {})",
+                "monitor_started": "Monitor: {:.3f} MHz, {:.3f} Msps, Verstärkung {} dB, Erkennungen -> {}",
+                "monitor_finished": "Monitor beendet: {} Frames, {} Erkennungen",
+                "sweep_mode": "Breitband-Sweep",
+                "sweep_tooltip": "LO schrittweise über den Bereich abstimmen und die Spektren zu einem Panorama zusammensetzen (wird beim Verbinden übernommen)",
+                "sweep_start": "Start (MHz):",
+                "sweep_stop": "Ende (MHz):",
+                "sweep_stats": "Sweep: {:.1f} ms | Schritte: {} | {:.0f} MHz/s",
             }
         }
     
@@ -0,0 +1,157 @@
+"""
+Журналы сообщений и измерений: ограниченное кольцо записей, модель Qt и история на диске
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import time
+
+import numpy as np
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QTimer, Qt, pyqtSignal
+from PyQt5.QtWidgets import QAbstractItemView, QListView
+
+from detection_sink import RecordWriter
+
+# Запись журнала сообщений
+MESSAGE_DTYPE = np.dtype([
+    ("time", np.float64),
+    ("text", object),
+])
+
+
+def format_time(timestamp, milliseconds=False):
+    """Время записи в виде ЧЧ:ММ:СС[.мс]"""
+    text = time.strftime("%H:%M:%S", time.localtime(timestamp))
+    if milliseconds:
+        text += f".{int(timestamp * 1000) % 1000:03d}"
+    return text
+
+
+def format_message(record):
+    """Строка журнала сообщений"""
+    return f"[{format_time(record['time'])}] {record['text']}"
+
+
+def format_detection(record):
+    """Строка детального лога измерений"""
+    return (
+        f"[{format_time(record['time'], milliseconds=True)}] "
+        f"Freq: {record['frequency'] / 1e6:8.3f} MHz | "
+        f"Offset: {record['freq_offset'] / 1e3:+7.1f} kHz | "
+        f"RSSI: {record['rssi']:6.1f} dBm | "
+        f"Peak: {record['peak_power']:6.1f} dB | "
+        f"Signal: {record['signal_power']:6.1f} dB | "
+        f"(T:{int(record['threshold']):+3d}dB)"
+    )
+
+
+class LogModel(QAbstractListModel):
+    """Модель журнала: последние capacity записей в кольце, полная история - в файле"""
+
+    # Записи копятся в очереди и переносятся в кольцо пачкой по таймеру, поэтому
+    # вставка строк в представление происходит несколько раз в секунду, а не на каждое
+    # сообщение. Строки формируются только для видимых записей. На диск записи уходят
+    # через фоновый поток RecordWriter - файловый ввод-вывод не выполняется в потоке Qt.
+
+    error = pyqtSignal(str)  # ошибка записи истории на диск (испускается из потока записи)
+
+    def __init__(self, capacity, dtype, formatter, sinks=(), flush_interval=200, parent=None):
+        super().__init__(parent)
+        self.capacity = int(capacity)
+        self.dtype = np.dtype(dtype)
+        self.formatter = formatter
+        self.total = 0              # всего записей за сеанс (включая вытесненные из кольца)
+        self._records = np.zeros(self.capacity, dtype=self.dtype)
+        self._start = 0             # индекс самой старой записи в кольце
+        self._count = 0
+        self._pending = []
+
+        self.writer = None
+        if sinks:
+            self.writer = RecordWriter(self.dtype, sinks, on_error=self.error.emit)
+            self.writer.start()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(flush_interval)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid() or index.row() >= self._count:
+            return None
+        return self.formatter(self._records[(self._start + index.row()) % self.capacity])
+
+    def append(self, *fields):
+        """Поставить запись в очередь (поля в порядке dtype); отображение - при ближайшем сбросе"""
+        self._pending.append(fields)
+        if self.writer is not None:
+            self.writer.submit(fields)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        """Перенести накопленные записи в кольцо"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.total += len(batch)
+
+        rows = np.array(batch[-self.capacity:], dtype=self.dtype)
+        count = len(rows)
+        overflow = self._count + count - self.capacity
+        if overflow > 0:
+            # Кольцо заполнено - самые старые строки уходят из модели
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            self._start = (self._start + overflow) % self.capacity
+            self._count -= overflow
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), self._count, self._count + count - 1)
+        index = (self._start + self._count + np.arange(count)) % self.capacity
+        self._records[index] = rows
+        self._count += count
+        self.endInsertRows()
+
+    def records(self):
+        """Записи кольца в хронологическом порядке (копия)"""
+        return self._records[(self._start + np.arange(self._count)) % self.capacity]
+
+    def clear(self):
+        """Очистка кольца (история на диске сохраняется)"""
+        self.flush()
+        self.beginResetModel()
+        self._start = 0
+        self._count = 0
+        self.endResetModel()
+
+    def close(self):
+        """Сбросить очередь и дописать историю на диск"""
+        self._flush_timer.stop()
+        self.flush()
+        if self.writer is not None:
+            self.writer.stop()
+            self.writer = None
+
+
+class LogView(QListView):
+    """Представление журнала: следует за новыми записями, только если уже показан конец"""
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setModel(model)
+        self._follow = True
+        model.rowsAboutToBeInserted.connect(self._check_follow)
+        model.rowsInserted.connect(self._scroll_if_following)
+
+    def _check_follow(self, *args):
+        scrollbar = self.verticalScrollBar()
+        self._follow = scrollbar.value() >= scrollbar.maximum()
+
+    def _scroll_if_following(self, *args):
+        if self._follow:
+            self.scrollToBottom()
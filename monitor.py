@@ -0,0 +1,306 @@
+"""
+Фоновый монитор без графического интерфейса: прием, DSP, детектор и журнал обнаружений в JSON Lines
+Запуск: python monitor.py [--preset lora_868] [--source pluto|file|simulator] [--output detections.jsonl]
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+
+import dsp
+from acquisition import Acquisition
+from bursts import BURST_DTYPE
+from channelizer import channel_onsets
+from detection_sink import DETECTION_DTYPE, JSONLinesSink, RecordWriter
+from frequency_log import FrequencyLogFilter
+from language_manager import LanguageManager
+from occupancy import write_occupancy_csv
+from rf_simulator import SimulatedPluto
+from sample_sources import FileSource, open_pluto
+from sdr_config import SDRConfig
+
+
+class HeadlessMonitor(Acquisition):
+    """Цикл приема в текущем потоке; обнаружения - в JSON Lines, сообщения - в stderr"""
+
+    # Обнаружения отбираются так же, как автологирование в GUI: сигналы выше порога
+    # логирования проходят временной фильтр частот (FrequencyLogFilter). В непрерывном
+    # режиме обрабатывается каждый кадр - прореживание нужно только для отображения.
+    # При заданном плане каналов в журнал идет и начало занятости каждого канала,
+    # а статистика занятости периодически перезаписывается в CSV (occupancy_path).
+    # Пакеты во временной области пишутся отдельным журналом (burst_writer).
+
+    def __init__(self, output, lang, print_stats=False):
+        super().__init__()
+        self.lang = lang
+        self.print_stats = print_stats
+        self.emit_interval = 0.0
+        self.display_columns = 0  # спектр не отображается - кадры не прореживаются
+        self.log_threshold = SDRConfig.LOG_THRESHOLD
+        self.frequency_log_filter = FrequencyLogFilter(
+            SDRConfig.FREQUENCY_TOLERANCE, SDRConfig.FREQUENCY_LOG_TIMEOUT, SDRConfig.FREQUENCY_LOG_RETENTION
+        )
+        self.writer = RecordWriter(DETECTION_DTYPE, [JSONLinesSink(output, DETECTION_DTYPE)], self.report_error)
+        self.frames = 0
+        self.detections = 0
+        self._channels_busy = None
+        self.occupancy_path = None
+        self.burst_writer = None
+        self._occupancy_saved = time.monotonic()
+
+    def log_message(self, message):
+        print(f"[{time.strftime('%H:%M:%S')}] {message}", file=sys.stderr, flush=True)
+
+    def run(self):
+        """Прием до stop(), конца файла или ошибки; журнал дописывается перед выходом"""
+        self.writer.start()
+        if self.burst_writer is not None:
+            self.burst_writer.start()
+        self.log_message(self.lang.get_text("pluto_connect_attempt"))
+        try:
+            super().run()
+        finally:
+            self.writer.stop()
+            if self.burst_writer is not None:
+                self.burst_writer.stop()
+            self.save_occupancy()
+        self.log_message(self.lang.get_text("monitor_finished", self.frames, self.detections))
+
+    def save_occupancy(self):
+        """Перезаписать CSV занятости каналов, если он задан"""
+        self._occupancy_saved = time.monotonic()
+        if self.occupancy_path is None or self.occupancy is None:
+            return
+        try:
+            write_occupancy_csv(self.occupancy_path, self.occupancy.snapshot(time.time()))
+        except OSError as e:
+            self.log_message(self.lang.get_text("occupancy_export_error", str(e)))
+
+    def should_log_frequency(self, frequency):
+        """Проверить, нужно ли логировать данную частоту (временной фильтр)"""
+        return self.frequency_log_filter.should_log(frequency)
+
+    def deliver_frame(self, frame):
+        _, rssi, peak_power, dominant_freq_info, _, center_freq = frame
+        self.frames += 1
+        now = time.time()
+        bursts = dominant_freq_info.get('bursts')
+        if bursts is not None and self.burst_writer is not None:
+            for burst in bursts:
+                self.burst_writer.submit(burst.item())
+        channels = dominant_freq_info.get('channels')
+        if channels is not None:
+            threshold = dominant_freq_info['channel_threshold']
+            for channel in channel_onsets(self._channels_busy, channels):
+                self.writer.submit((
+                    now, channel['frequency'], channel['frequency'] - center_freq, rssi, peak_power,
+                    channel['power'], threshold
+                ))
+                self.detections += 1
+            self._channels_busy = channels['busy']
+            if time.monotonic() - self._occupancy_saved >= SDRConfig.OCCUPANCY_EXPORT_INTERVAL:
+                self.save_occupancy()
+        if not dominant_freq_info['detected']:
+            return
+        peaks = dominant_freq_info['peaks']
+        for peak in peaks[peaks['power'] > self.log_threshold]:
+            if self.should_log_frequency(peak['frequency']):
+                self.writer.submit((
+                    now, peak['frequency'], peak['freq_offset'], rssi, peak_power, peak['power'], self.log_threshold
+                ))
+                self.detections += 1
+
+    def report_error(self, message):
+        self.log_message(message)
+
+    def report_capture_stats(self, stats):
+        if self.print_stats:
+            self.log_message(self.lang.get_text(
+                "capture_stats", stats['duty_cycle'] * 100, stats['dropped_blocks'], stats['overflowed_blocks']
+            ))
+
+    def report_sweep_stats(self, stats):
+        if self.print_stats:
+            self.log_message(self.lang.get_text(
+                "sweep_stats", stats['sweep_time'] * 1e3, stats['steps'], stats['rate'] / 1e6
+            ))
+
+    def report_source_finished(self):
+        self.log_message(self.lang.get_text("replay_finished"))
+
+
+def apply_preset(name):
+    """Значения предустановки SDRConfig как настройки по умолчанию (частоты в МГц)"""
+    preset = SDRConfig.get_presets()[name]
+    SDRConfig.update_defaults(
+        frequency=preset["frequency"]["default"] * 1e6,
+        sample_rate=preset["sample_rate"]["default"] * 1e6,
+        bandwidth=preset["bandwidth"]["default"] * 1e6,
+        gain=preset["gain"]["default"],
+    )
+
+
+def receive_band(args):
+    """Полоса приема (МГц) по явным параметрам, предустановке и SDRConfig - в том же порядке, что и main()"""
+    preset = SDRConfig.get_presets()[args.preset] if args.preset else None
+    frequency = args.frequency
+    if frequency is None:
+        frequency = preset["frequency"]["default"] if preset else SDRConfig.DEFAULT_FREQUENCY / 1e6
+    sample_rate = args.sample_rate
+    if sample_rate is None:
+        sample_rate = preset["sample_rate"]["default"] if preset else SDRConfig.DEFAULT_SAMPLE_RATE / 1e6
+    return frequency - sample_rate / 2, frequency + sample_rate / 2
+
+
+def make_source_factory(args, lang, log_message):
+    """Функция открытия источника отсчетов (как prepare_sample_source в GUI)"""
+    realtime = not args.fast
+    if args.source == "simulator":
+        log_message(lang.get_text("simulator_started", args.seed))
+        return lambda: SimulatedPluto(seed=args.seed, realtime=realtime)
+    if args.source == "pluto":
+        return lambda: open_pluto(args.uri)
+    # Для сырого файла частоты берутся из текущих настроек
+    source = FileSource(
+        args.file, SDRConfig.DEFAULT_SAMPLE_RATE, SDRConfig.DEFAULT_FREQUENCY, realtime=realtime, loop=args.loop
+    )
+    SDRConfig.update_defaults(frequency=float(source.rx_lo), sample_rate=float(source.sample_rate))
+    log_message(lang.get_text("replay_started", args.file, source.sample_rate / 1e6, len(source) / source.sample_rate))
+    return lambda: source
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Фоновый монитор ADALM-PLUTO без графического интерфейса")
+    parser.add_argument("--preset", choices=sorted(SDRConfig.get_presets()), help="предустановка SDRConfig")
+    parser.add_argument("--frequency", type=float, help="центральная частота, МГц")
+    parser.add_argument("--sample-rate", type=float, help="частота дискретизации, МГц")
+    parser.add_argument("--bandwidth", type=float, help="полоса, МГц")
+    parser.add_argument("--gain", type=int, help="усиление, дБ")
+    parser.add_argument("--buffer-size", type=int, choices=[int(size) for size in SDRConfig.GUI_CONFIG["buffer_sizes"]],
+                        help="размер буфера, отсчетов")
+    parser.add_argument("--threshold", type=float, help="порог обнаружения, дБ")
+    parser.add_argument("--log-threshold", type=float, help="порог записи в журнал, дБ")
+    parser.add_argument("--log-timeout", type=float, help="минимальный интервал между записями одной частоты, с")
+    parser.add_argument("--tolerance", type=float, help="допуск \"того же\" канала, кГц")
+    parser.add_argument("--detection-mode", choices=dsp.DETECTION_MODES, help="режим порога обнаружения")
+    parser.add_argument("--cfar-offset", type=float, help="превышение адаптивного порога над шумом, дБ")
+    # Флаги с умолчанием из SDRConfig - парами, чтобы включенное в конфигурации можно было отменить
+    continuous = parser.add_mutually_exclusive_group()
+    continuous.add_argument("--continuous", dest="continuous", action="store_true",
+                            help="непрерывный захват без пропусков")
+    continuous.add_argument("--no-continuous", dest="continuous", action="store_false",
+                            help="захват отдельными блоками (отменяет SDRConfig.CONTINUOUS_CAPTURE)")
+    parser.add_argument("--sweep", type=float, nargs=2, metavar=("START", "STOP"),
+                        help="панорамный обзор диапазона, МГц")
+    parser.add_argument("--zoom", type=float, nargs=2, metavar=("START", "STOP"),
+                        help="обнаружение только в полосе, МГц (zoom FFT с разрешением всего буфера)")
+    parser.add_argument("--channels", choices=sorted(SDRConfig.CHANNEL_PLANS), default=SDRConfig.CHANNEL_PLAN,
+                        help="план каналов: начало занятости каждого канала тоже пишется в журнал")
+    parser.add_argument("--occupancy", help="CSV занятости каналов (перезаписывается раз в минуту и при выходе)")
+    parser.add_argument("--bursts", help="журнал пакетов во временной области JSON Lines (огибающая по всем отсчетам)")
+    parser.add_argument("--dsp-workers", type=int, default=SDRConfig.DSP_WORKERS, help="процессов DSP (0 - в потоке приема)")
+    parser.add_argument("--source", choices=SDRConfig.SAMPLE_SOURCES, default=SDRConfig.SAMPLE_SOURCE,
+                        help="источник отсчетов")
+    parser.add_argument("--uri", help="адрес ADALM-PLUTO (например ip:192.168.2.1)")
+    parser.add_argument("--file", help="IQ-файл для источника file (SigMF, .cf32, .ci16)")
+    parser.add_argument("--loop", action="store_true", help="повторять файл по кругу")
+    fast = parser.add_mutually_exclusive_group()
+    fast.add_argument("--fast", dest="fast", action="store_true",
+                      help="файл и симулятор - как можно быстрее, а не в реальном времени")
+    fast.add_argument("--no-fast", dest="fast", action="store_false",
+                      help="файл и симулятор в реальном времени (отменяет SDRConfig.REPLAY_REALTIME = False)")
+    parser.add_argument("--seed", type=int, default=SDRConfig.SIMULATOR_SEED, help="seed симулятора")
+    parser.add_argument("--output", default="-", help="файл обнаружений JSON Lines (\"-\" - стандартный вывод)")
+    parser.add_argument("--duration", type=float, help="остановиться через столько секунд")
+    parser.add_argument("--stats", action="store_true", help="выводить статистику захвата и обзора")
+    parser.add_argument("--language", choices=sorted(LanguageManager().get_available_languages()), default="en",
+                        help="язык сообщений")
+    parser.set_defaults(continuous=SDRConfig.CONTINUOUS_CAPTURE, fast=not SDRConfig.REPLAY_REALTIME)
+    args = parser.parse_args(argv)
+    if args.source == "file" and not args.file:
+        parser.error("--source file требует --file")
+    if args.source == "file" and args.sweep:
+        parser.error("--sweep недоступен для записи (частота настройки фиксирована)")
+    if args.sweep and args.zoom:
+        parser.error("--zoom и --sweep несовместимы")
+    # Частоты файла известны только после его открытия - полоса записи проверяется при приеме
+    if args.zoom and args.source != "file":
+        low, high = receive_band(args)
+        if max(args.zoom) <= low or min(args.zoom) >= high or args.zoom[0] == args.zoom[1]:
+            parser.error(f"--zoom: полоса вне полосы приема {low:.3f}-{high:.3f} МГц или пуста")
+    if args.occupancy and not args.channels:
+        parser.error("--occupancy требует --channels")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    lang = LanguageManager()
+    lang.set_language(args.language)
+
+    # Настройки: значения SDRConfig, затем предустановка, затем явные параметры
+    if args.preset:
+        apply_preset(args.preset)
+    SDRConfig.update_defaults(
+        frequency=None if args.frequency is None else args.frequency * 1e6,
+        sample_rate=None if args.sample_rate is None else args.sample_rate * 1e6,
+        bandwidth=None if args.bandwidth is None else args.bandwidth * 1e6,
+        gain=args.gain,
+        buffer_size=args.buffer_size,
+    )
+    if args.threshold is not None:
+        SDRConfig.update_detection_threshold(args.threshold)
+    if args.log_threshold is not None:
+        SDRConfig.update_log_threshold(args.log_threshold)
+    if args.log_timeout is not None:
+        SDRConfig.FREQUENCY_LOG_TIMEOUT = args.log_timeout
+    if args.tolerance is not None:
+        SDRConfig.FREQUENCY_TOLERANCE = args.tolerance * 1e3
+    if args.detection_mode is not None:
+        SDRConfig.DETECTION_MODE = args.detection_mode
+    if args.cfar_offset is not None:
+        SDRConfig.CFAR_OFFSET = args.cfar_offset
+
+    monitor = HeadlessMonitor(args.output, lang, args.stats)
+    try:
+        monitor.source_factory = make_source_factory(args, lang, monitor.log_message)
+    except (OSError, ValueError, KeyError, StopIteration) as e:
+        monitor.log_message(lang.get_text("replay_error", str(e)))
+        return 1
+    # Файл может задать частоты - параметры сеанса берутся после открытия источника
+    monitor.update_settings(
+        SDRConfig.DEFAULT_FREQUENCY, SDRConfig.DEFAULT_SAMPLE_RATE, SDRConfig.DEFAULT_BANDWIDTH,
+        SDRConfig.DEFAULT_GAIN, SDRConfig.DEFAULT_BUFFER_SIZE
+    )
+    monitor.continuous_mode = args.continuous
+    monitor.dsp_workers = args.dsp_workers
+    if args.sweep:
+        monitor.sweep_span = (args.sweep[0] * 1e6, args.sweep[1] * 1e6)
+    monitor.channel_plan = args.channels
+    monitor.occupancy_path = args.occupancy
+    if args.bursts:
+        monitor.burst_detection = True
+        monitor.burst_writer = RecordWriter(BURST_DTYPE, [JSONLinesSink(args.bursts, BURST_DTYPE)], monitor.report_error)
+    if args.zoom:
+        monitor.zoom_span = (args.zoom[0] * 1e6, args.zoom[1] * 1e6)
+
+    # SIGINT/SIGTERM завершают цикл приема; журнал дописывается в run()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: monitor.stop())
+    if args.duration is not None:
+        timer = threading.Timer(args.duration, monitor.stop)
+        timer.daemon = True
+        timer.start()
+
+    monitor.log_message(lang.get_text(
+        "monitor_started", monitor.center_freq / 1e6, monitor.sample_rate / 1e6, monitor.gain, args.output
+    ))
+    monitor.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
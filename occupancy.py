@@ -0,0 +1,141 @@
+"""
+Занятость каналов в скользящих окнах: доля времени, число передач, средняя и максимальная мощность
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import os
+import threading
+
+import numpy as np
+
+# Строка статистики: окно (с), частота канала (Гц), время наблюдения канала (с), доля
+# занятости (0..1), число передач (переходов в занятость), средняя и максимальная мощность (дБм)
+OCCUPANCY_DTYPE = np.dtype([
+    ("window", "<f8"),
+    ("frequency", "<f8"),
+    ("observed", "<f8"),
+    ("duty_cycle", "<f8"),
+    ("bursts", "<i8"),
+    ("mean_power", "<f4"),
+    ("max_power", "<f4"),
+])
+
+OCCUPANCY_CSV_FORMAT = ("%.0f", "%.1f", "%.3f", "%.6f", "%d", "%.2f", "%.2f")
+
+# Суммы интервала окна: время наблюдения, время занятости, число передач, энергия (мВт*с)
+OBSERVED, BUSY, BURSTS, ENERGY = range(4)
+
+
+class OccupancyWindow:
+    """Скользящее окно span секунд из buckets интервалов: суммы и максимумы по каналам"""
+
+    # Кадр добавляется в текущий интервал и в текущие итоги окна (O(каналы)). При переходе
+    # к следующему интервалу самый старый вычитается из итогов и обнуляется, поэтому
+    # память постоянна, а окно сдвигается с шагом span / buckets. Максимум мощности не
+    # вычитается - он берется по интервалам при запросе статистики.
+
+    def __init__(self, span, buckets, cells):
+        self.span = float(span)
+        self.buckets = int(buckets)
+        self.interval = self.span / self.buckets
+        self.sums = np.zeros((self.buckets, 4, cells))
+        self.peaks = np.full((self.buckets, cells), -np.inf)
+        self.totals = np.zeros((4, cells))
+        self.current = None  # абсолютный номер текущего интервала (время / interval)
+
+    def advance(self, now):
+        """Сдвинуть окно к моменту now: вышедшие из окна интервалы вычитаются и обнуляются"""
+        index = int(now // self.interval)
+        if self.current is None or index - self.current >= self.buckets:
+            self.sums[:] = 0
+            self.peaks[:] = -np.inf
+            self.totals[:] = 0
+        else:
+            for step in range(self.current + 1, index + 1):
+                slot = step % self.buckets
+                self.totals -= self.sums[slot]
+                self.sums[slot] = 0
+                self.peaks[slot] = -np.inf
+        if self.current is None or index > self.current:
+            self.current = index
+        return self.current % self.buckets
+
+    def add(self, now, values, peak):
+        """Добавить суммы кадра values (4 x каналы) и мощность peak (дБм) в момент now"""
+        slot = self.advance(now)
+        self.sums[slot] += values
+        self.totals += values
+        np.maximum(self.peaks[slot], peak, out=self.peaks[slot])
+
+    def peak(self):
+        """Максимальная мощность каналов за окно, дБм"""
+        return self.peaks.max(axis=0)
+
+
+class OccupancyStats:
+    """Занятость каналов плана во всех окнах SDRConfig.OCCUPANCY_WINDOWS"""
+
+    # update() вызывается потоком приема для каждого блока (а не только для отправленных
+    # в GUI кадров), snapshot() - из GUI или монитора. Время занятости - длительность
+    # блоков, в которых канал выше порога; доля занятости - отношение к длительности
+    # блоков, в которых канал был в полосе приема. В режиме без непрерывного захвата
+    # между блоками есть пропуски - доля занятости оценивается по принятым блокам.
+
+    def __init__(self, frequencies, windows):
+        self.frequencies = np.array(frequencies, dtype=np.float64)
+        cells = len(self.frequencies)
+        self.windows = [OccupancyWindow(span, buckets, cells) for span, buckets in windows]
+        self._values = np.zeros((4, cells))
+        self._previous = np.zeros(cells, dtype=bool)
+        self._lock = threading.Lock()
+
+    def update(self, channels, duration, now):
+        """Учесть блок длительностью duration (с), принятый в момент now (каналы - CHANNEL_DTYPE)"""
+        in_band = channels["in_band"]
+        busy = channels["busy"]
+        values = self._values
+        values[OBSERVED] = in_band * duration
+        values[BUSY] = busy * duration
+        values[BURSTS] = busy & ~self._previous
+        # Каналы вне полосы (мощность NaN) не входят в энергию и максимум
+        power = np.where(in_band, channels["power"], -np.inf)
+        values[ENERGY] = 10 ** ((power - 30) / 10) * duration
+        self._previous[:] = busy
+        with self._lock:
+            for window in self.windows:
+                window.add(now, values, power)
+
+    def snapshot(self, now):
+        """Статистика всех окон на момент now: массив OCCUPANCY_DTYPE (окно за окном)"""
+        cells = len(self.frequencies)
+        rows = np.zeros(len(self.windows) * cells, dtype=OCCUPANCY_DTYPE)
+        with self._lock:
+            for i, window in enumerate(self.windows):
+                window.advance(now)
+                totals = window.totals
+                part = rows[i * cells:(i + 1) * cells]
+                part["window"] = window.span
+                part["frequency"] = self.frequencies
+                # Итоги ведутся вычитанием - остаток округления после опустевшего окна не наблюдение
+                observed = totals[OBSERVED] > 1e-9
+                part["observed"] = np.where(observed, totals[OBSERVED], 0.0)
+                part["bursts"] = np.rint(totals[BURSTS])
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    part["duty_cycle"] = np.where(observed, totals[BUSY] / totals[OBSERVED], 0.0)
+                    part["mean_power"] = 10 * np.log10(totals[ENERGY] / totals[OBSERVED]) + 30
+                part["max_power"] = window.peak()
+        # Канал без наблюдений в окне - без уровней
+        unobserved = rows["observed"] <= 0
+        rows["mean_power"][unobserved] = np.nan
+        rows["max_power"][unobserved] = np.nan
+        return rows
+
+
+def write_occupancy_csv(path, rows):
+    """Записать статистику занятости в CSV с заголовком (файл перезаписывается)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as output:
+        output.write(",".join(OCCUPANCY_DTYPE.names) + "\n")
+        np.savetxt(output, rows, fmt=list(OCCUPANCY_CSV_FORMAT), delimiter=",")
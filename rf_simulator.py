@@ -0,0 +1,224 @@
+"""
+Программная модель эфира: излучатели (CW, пакеты LoRa), шум приемника и устройство с интерфейсом adi.Pluto
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from sample_sources import RealtimeClock
+
+THERMAL_NOISE_DBM_HZ = -174.0  # тепловой шум при 290 K
+
+
+class Emitter(ABC):
+    """Излучатель на частоте frequency (Гц) с мощностью power (дБм на входе приемника)"""
+
+    # Включение периодическое: на duty доле каждого периода period секунд, начиная с offset.
+    # period=None - излучатель включен постоянно.
+
+    def __init__(self, frequency, power, period=None, duty=1.0, offset=0.0):
+        self.frequency = float(frequency)
+        self.power = float(power)
+        self.period = period
+        self.duty = duty
+        self.offset = offset
+
+    def on_samples(self, sample_rate, period):
+        """Длительность включения в отсчетах"""
+        return max(1, int(round(self.duty * period)))
+
+    def intervals(self, start, count, sample_rate):
+        """Интервалы включения в блоке: (начало, конец, отсчетов от начала включения)"""
+        end = start + count
+        if self.period is None:
+            yield 0, count, start
+            return
+        period = max(1, int(round(self.period * sample_rate)))
+        on = self.on_samples(sample_rate, period)
+        if on >= period:
+            yield 0, count, start
+            return
+        first = int(round(self.offset * sample_rate))
+        k = (start - first - on) // period + 1  # первое включение, которое заканчивается после start
+        while True:
+            burst_start = first + k * period
+            if burst_start >= end:
+                break
+            a = max(burst_start, start)
+            b = min(burst_start + on, end)
+            if b > a:
+                yield a - start, b - start, a - burst_start
+            k += 1
+
+    @abstractmethod
+    def add_to(self, out, start, sample_rate, offset, amplitude):
+        """Добавить сигнал в блок out (start - номер первого отсчета); вернуть добавленную амплитуду"""
+
+
+class Tone(Emitter):
+    """Немодулированная несущая (CW)"""
+
+    def __init__(self, frequency, power, period=None, duty=1.0, offset=0.0, phase=0.0):
+        super().__init__(frequency, power, period, duty, offset)
+        self.phase = phase
+        self._base_key = None
+        self._base = None
+
+    def _base_vector(self, offset, sample_rate, count):
+        """exp(j*2*pi*offset*k/fs) для k в блоке - пересчитывается только при смене настроек"""
+        key = (offset, sample_rate, count)
+        if key != self._base_key:
+            k = np.arange(count)
+            self._base = np.exp(2j * np.pi * offset / sample_rate * k).astype(np.complex64)
+            self._base_key = key
+        return self._base
+
+    def add_to(self, out, start, sample_rate, offset, amplitude):
+        base = self._base_vector(offset, sample_rate, len(out))
+        added = 0.0
+        for a, b, _ in self.intervals(start, len(out), sample_rate):
+            # Фаза начала блока переносится на предвычисленный вектор одним множителем
+            cycles = math.fmod(offset * start / sample_rate, 1.0)
+            coefficient = amplitude * np.exp(1j * (2 * np.pi * cycles + self.phase))
+            out[a:b] += np.complex64(coefficient) * base[a:b]
+            added = amplitude
+        return added
+
+
+class LoRaBurst(Emitter):
+    """Пакеты линейно-частотных символов в стиле LoRa (upchirp с полосой bandwidth)"""
+
+    # Все символы пакета одинаковые (как преамбула): для спектра и детектора важны
+    # полоса, длительность и скважность, а не данные. Символ предвычисляется таблицей
+    # с несущей, поэтому пакет собирается копированием, без exp на каждый отсчет.
+
+    def __init__(self, frequency, power, bandwidth=125e3, spreading_factor=7, symbols=16,
+                 period=1.0, offset=0.0):
+        self.bandwidth = float(bandwidth)
+        self.spreading_factor = int(spreading_factor)
+        self.symbols = int(symbols)
+        self.symbol_time = 2 ** self.spreading_factor / self.bandwidth
+        duty = 1.0 if period is None else self.symbols * self.symbol_time / period
+        super().__init__(frequency, power, period, duty, offset)
+        self._table_key = None
+        self._table = None
+
+    def symbol_samples(self, sample_rate):
+        """Длительность символа в отсчетах"""
+        return max(1, int(round(self.symbol_time * sample_rate)))
+
+    def on_samples(self, sample_rate, period):
+        return self.symbols * self.symbol_samples(sample_rate)
+
+    def _symbol_table(self, offset, sample_rate):
+        """Символ с несущей offset - пересчитывается только при смене настроек"""
+        key = (offset, sample_rate)
+        if key != self._table_key:
+            t = np.arange(self.symbol_samples(sample_rate)) / sample_rate
+            sweep = self.bandwidth / self.symbol_time
+            phase = 2 * np.pi * ((offset - self.bandwidth / 2) * t + sweep / 2 * t * t)
+            self._table = np.exp(1j * phase).astype(np.complex64)
+            self._table_key = key
+        return self._table
+
+    def add_to(self, out, start, sample_rate, offset, amplitude):
+        table = self._symbol_table(offset, sample_rate)
+        length = len(table)
+        scale = np.float32(amplitude)
+        added = 0.0
+        for a, b, since in self.intervals(start, len(out), sample_rate):
+            position = since % length
+            while a < b:
+                n = min(b - a, length - position)
+                out[a:a + n] += scale * table[position:position + n]
+                a += n
+                position = 0
+            added = amplitude
+        return added
+
+
+def default_scene():
+    """Типичная картина диапазона 868 МГц: маяк, периодический CW и пакеты LoRa разной скважности"""
+    return [
+        Tone(868.100e6, -55.0),
+        Tone(869.525e6, -45.0, period=2.0, duty=0.1, offset=0.3),
+        LoRaBurst(868.300e6, -60.0, 125e3, 7, symbols=20, period=1.0, offset=0.2),
+        LoRaBurst(867.500e6, -70.0, 125e3, 9, symbols=12, period=3.0, offset=0.5),
+        LoRaBurst(868.800e6, -50.0, 250e3, 7, symbols=16, period=0.5, offset=0.1),
+    ]
+
+
+class SimulatedPluto:
+    """Программная замена adi.Pluto: сцена излучателей, шум приемника, усиление и насыщение АЦП"""
+
+    # Уровни: мощность на входе + усиление относительно full_scale_dbm дают долю шкалы
+    # 12-битного АЦП (pyadi отдает отсчеты в единицах АЦП). Шум приемника - kTB + noise_figure,
+    # но не меньше шума квантования. Шум берется со случайного смещения в предвычисленной
+    # таблице, поэтому генерация блока - это несколько векторных сложений. С seed и
+    # realtime=False последовательность блоков полностью воспроизводима.
+
+    FULL_SCALE = 2048.0
+    NOISE_TABLE_SIZE = 1 << 20
+    FILTER_REJECTION_DB = 40.0  # подавление излучателей за пределами полосы rx_rf_bandwidth
+
+    def __init__(self, emitters=None, noise_figure=6.0, full_scale_dbm=-10.0, seed=0, realtime=True):
+        self.rx_lo = int(868e6)
+        self.sample_rate = int(10e6)
+        self.rx_rf_bandwidth = int(5e6)
+        self.rx_hardwaregain_chan0 = 30
+        self.rx_buffer_size = 2048
+        self.emitters = default_scene() if emitters is None else list(emitters)
+        self.noise_figure = noise_figure
+        self.full_scale_dbm = full_scale_dbm
+        self.realtime = realtime
+        self.rng = np.random.default_rng(seed)
+        self.samples_generated = 0  # номер следующего отсчета (время сцены)
+        self.clock = RealtimeClock()
+        self._noise = self._make_noise(self.NOISE_TABLE_SIZE)
+
+    def _make_noise(self, size):
+        """Таблица комплексного гауссова шума единичной мощности"""
+        values = self.rng.standard_normal(2 * size, dtype=np.float32) * np.float32(math.sqrt(0.5))
+        return values.view(np.complex64)
+
+    def rx(self):
+        """Следующий блок rx_buffer_size отсчетов (complex64)"""
+        n = int(self.rx_buffer_size)
+        sample_rate = float(self.sample_rate)
+        if self.realtime:
+            self.samples_generated += self.clock.missed(sample_rate)
+        start = self.samples_generated
+        if n > len(self._noise):
+            self._noise = self._make_noise(n)
+
+        gain = float(self.rx_hardwaregain_chan0)
+        scale = self.FULL_SCALE * 10 ** ((gain - self.full_scale_dbm) / 20)
+        noise_dbm = THERMAL_NOISE_DBM_HZ + self.noise_figure + 10 * math.log10(sample_rate)
+        noise_rms = math.hypot(scale * 10 ** (noise_dbm / 20), 1.0)
+
+        shift = int(self.rng.integers(0, len(self._noise) - n + 1))
+        out = self._noise[shift:shift + n] * np.float32(noise_rms)
+        peak = 4 * noise_rms
+        half_band = self.rx_rf_bandwidth / 2
+        for emitter in self.emitters:
+            offset = emitter.frequency - self.rx_lo
+            if abs(offset) >= sample_rate / 2:
+                continue
+            power = emitter.power - (self.FILTER_REJECTION_DB if abs(offset) > half_band else 0.0)
+            peak += emitter.add_to(out, start, sample_rate, offset, scale * 10 ** (power / 20))
+
+        # Насыщение АЦП проверяется только если сумма амплитуд может выйти за шкалу
+        if peak > self.FULL_SCALE:
+            parts = out.view(np.float32)
+            np.clip(parts, -self.FULL_SCALE, self.FULL_SCALE - 1, out=parts)
+
+        self.samples_generated = start + n
+        if self.realtime:
+            self.clock.wait(n, sample_rate)
+        return out
+
+    def rx_destroy_buffer(self):
+        """Совместимость с adi.Pluto"""
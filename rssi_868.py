@@ -1,11 +1,27 @@
 import sys
+import os
 import numpy as np
 import sys
 import time
 import numpy as np
 import pyqtgraph as pg
-import adi
 from language_manager import LanguageManager
+from sdr_config import SDRConfig
+from acquisition import Acquisition
+from history import HistoryRing
+from waterfall import WaterfallBuffer
+from zoom import zoom_parameters
+from channelizer import channel_onsets
+from occupancy import write_occupancy_csv
+from frequency_log import FrequencyLogFilter
+from log_model import LogModel, LogView, MESSAGE_DTYPE, format_message, format_detection
+from detection_sink import DETECTION_DTYPE, DETECTION_CSV_FORMAT, TextSink, CSVSink, BinarySink, RecordWriter
+from bursts import BURST_DTYPE, BURST_CSV_FORMAT
+from iq_recorder import IQ_FORMATS
+from sample_sources import FileSource, open_pluto
+from rf_simulator import SimulatedPluto
+from instrumentation import PipelineStats
+import dsp
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -20,296 +36,120 @@ from PyQt5.QtWidgets import (
     QGridLayout,
     QComboBox,
     QProgressBar,
-    QTextEdit,
     QSplitter,
     QCheckBox,
+    QFileDialog,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
 )
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal, Qt
+from PyQt5.QtCore import QObject, QTimer, QThread, pyqtSignal, Qt, QRectF
 from PyQt5.QtGui import QFont
 import pyqtgraph as pg
-import adi
 import time
 
 
-class SDRConfig:
-    """Централизованная конфигурация для всех настроек SDR"""
-    
-    # Основные параметры SDR
-    DEFAULT_FREQUENCY = 868e6      # Гц
-    DEFAULT_SAMPLE_RATE = 10.0e6   # Гц  
-    DEFAULT_BANDWIDTH = 5.0e6      # Гц
-    DEFAULT_GAIN = 30              # дБ
-    DEFAULT_BUFFER_SIZE = 2048     # отсчеты
-    
-    # Параметры детектора сигналов
-    SIGNAL_DETECTION_THRESHOLD = 100  # дБ - порог обнаружения доминирующей частоты
-    LOG_THRESHOLD = 100                # дБ - порог для записи в детальный лог
-    
-    # Параметры временного фильтра для логирования
-    FREQUENCY_LOG_TIMEOUT = 10.0       # секунды - минимальный интервал между записями одной частоты
-    FREQUENCY_TOLERANCE = 50000.0      # Гц (50 кГц) - допуск для определения "того же" канала
-    
-    # Параметры для GUI
-    GUI_CONFIG = {
-        "frequency": {
-            "min": 70.0,           # МГц
-            "max": 6000.0,         # МГц
-            "default": 868.0,      # МГц (DEFAULT_FREQUENCY / 1e6)
-            "decimals": 3
-        },
-        "sample_rate": {
-            "min": 0.5,            # МГц
-            "max": 56.0,           # МГц
-            "default": 10.0,       # МГц (DEFAULT_SAMPLE_RATE / 1e6)
-            "decimals": 1
-        },
-        "bandwidth": {
-            "min": 0.2,            # МГц
-            "max": 56.0,           # МГц
-            "default": 5.0,        # МГц (DEFAULT_BANDWIDTH / 1e6)
-            "decimals": 1
-        },
-        "gain": {
-            "min": 0,              # дБ
-            "max": 76,             # дБ
-            "default": 30          # дБ (DEFAULT_GAIN)
-        },
-        "buffer_sizes": ["1024", "2048", "4096", "8192"],
-        "default_buffer": "2048"   # str(DEFAULT_BUFFER_SIZE)
-    }
-    
-    @classmethod
-    def get_default_freq_axis(cls):
-        """Получить частотную ось по умолчанию"""
-        return np.linspace(-cls.DEFAULT_SAMPLE_RATE / 2, 
-                          cls.DEFAULT_SAMPLE_RATE / 2, 
-                          cls.DEFAULT_BUFFER_SIZE)
-    
-    @classmethod 
-    def get_default_fft_data(cls):
-        """Получить массив FFT данных по умолчанию"""
-        return np.zeros(cls.DEFAULT_BUFFER_SIZE)
-    
-    @classmethod
-    def get_presets(cls):
-        """Получить предустановленные конфигурации"""
-        return {
-            "lora_868": {
-                "frequency": {"default": 868.0},
-                "sample_rate": {"default": 1.0},
-                "bandwidth": {"default": 0.5},
-                "gain": {"default": 40},
-            },
-            "wifi_2.4g": {
-                "frequency": {"default": 2400.0},
-                "sample_rate": {"default": 20.0},
-                "bandwidth": {"default": 10.0},
-                "gain": {"default": 30},
-            },
-            "bluetooth": {
-                "frequency": {"default": 2440.0},
-                "sample_rate": {"default": 10.0},
-                "bandwidth": {"default": 5.0},
-                "gain": {"default": 35},
-            },
-            "868": {
-                "frequency": {"default": 868.0},
-                "sample_rate": {"default": 10.0},
-                "bandwidth": {"default": 5.0},
-                "gain": {"default": 35},
-            },
-            "915": {
-                "frequency": {"default": 915.0},
-                "sample_rate": {"default": 10.0},
-                "bandwidth": {"default": 26.0},
-                "gain": {"default": 35},
-            },
-            "fm_radio": {
-                "frequency": {"default": 100.0},
-                "sample_rate": {"default": 5.0},
-                "bandwidth": {"default": 2.0},
-                "gain": {"default": 25},
-            },
-            "gps_l1": {
-                "frequency": {"default": 1575.42},
-                "sample_rate": {"default": 10.0},
-                "bandwidth": {"default": 5.0},
-                "gain": {"default": 45},
-            },
-            "lte_2100": {
-                "frequency": {"default": 2100.0},
-                "sample_rate": {"default": 30.0},
-                "bandwidth": {"default": 20.0},
-                "gain": {"default": 30},
-            },
-        }
-    
-    @classmethod
-    def update_defaults(cls, frequency=None, sample_rate=None, bandwidth=None, gain=None, buffer_size=None):
-        """Обновить значения по умолчанию и синхронизировать GUI конфигурацию"""
-        if frequency is not None:
-            cls.DEFAULT_FREQUENCY = frequency
-            cls.GUI_CONFIG["frequency"]["default"] = frequency / 1e6
-            
-        if sample_rate is not None:
-            cls.DEFAULT_SAMPLE_RATE = sample_rate
-            cls.GUI_CONFIG["sample_rate"]["default"] = sample_rate / 1e6
-            
-        if bandwidth is not None:
-            cls.DEFAULT_BANDWIDTH = bandwidth
-            cls.GUI_CONFIG["bandwidth"]["default"] = bandwidth / 1e6
-            
-        if gain is not None:
-            cls.DEFAULT_GAIN = gain
-            cls.GUI_CONFIG["gain"]["default"] = gain
-            
-        if buffer_size is not None:
-            cls.DEFAULT_BUFFER_SIZE = buffer_size
-            cls.GUI_CONFIG["default_buffer"] = str(buffer_size)
-    
-    @classmethod
-    def update_log_threshold(cls, threshold):
-        """Обновить порог логирования"""
-        cls.LOG_THRESHOLD = threshold
-    
-    @classmethod
-    def update_detection_threshold(cls, threshold):
-        """Обновить порог обнаружения"""
-        cls.SIGNAL_DETECTION_THRESHOLD = threshold
-
-
-class PlutoThread(QThread):
+class PlutoThread(Acquisition, QThread):
     """Поток для работы с ADALM-PLUTO"""
 
+    # Цикл приема и обработки - в Acquisition; здесь его уведомления становятся сигналами Qt
+
     data_ready = pyqtSignal(np.ndarray, float, float, dict, np.ndarray, float)  # fft_data, rssi, peak_power, dominant_freq_info, freq_axis, center_freq
     error_signal = pyqtSignal(str)
+    capture_stats = pyqtSignal(dict)  # duty_cycle, blocks_captured, dropped_blocks, overflowed_blocks, ring_fill
+    record_stats = pyqtSignal(dict)  # статистика записи IQ (IQRecorder.stats)
+    recording_finished = pyqtSignal(dict)  # итог записи IQ; reason - причина завершения
+    source_finished = pyqtSignal()  # воспроизведение файла дошло до конца
+    sweep_stats = pyqtSignal(dict)  # скорость панорамного обзора: sweep_time, steps, span, rate, sweeps
 
     def __init__(self):
-        super().__init__()
-        self.sdr = None
-        self.running = False
-        self.center_freq = SDRConfig.DEFAULT_FREQUENCY
-        self.sample_rate = SDRConfig.DEFAULT_SAMPLE_RATE
-        self.bandwidth = SDRConfig.DEFAULT_BANDWIDTH
-        self.gain = SDRConfig.DEFAULT_GAIN
-        self.buffer_size = SDRConfig.DEFAULT_BUFFER_SIZE
+        QThread.__init__(self)
+        Acquisition.__init__(self)
 
-    def connect_pluto(self):
-        """Подключение к ADALM-PLUTO"""
-        try:
-            self.sdr = adi.Pluto()
-            self.sdr.rx_rf_bandwidth = int(self.bandwidth)
-            self.sdr.rx_lo = int(self.center_freq)
-            self.sdr.sample_rate = int(self.sample_rate)
-            self.sdr.rx_hardwaregain_chan0 = self.gain
-            self.sdr.rx_buffer_size = self.buffer_size
-            return True
-        except Exception as e:
-            self.error_signal.emit(f"Ошибка подключения к PLUTO: {str(e)}")
-            return False
+    def deliver_frame(self, frame):
+        self.data_ready.emit(*frame)
 
-    def disconnect_pluto(self):
-        """Отключение от ADALM-PLUTO"""
-        if self.sdr:
-            del self.sdr
-            self.sdr = None
-
-    def update_settings(self, freq, sr, bw, gain, buf_size):
-        """Обновление настроек SDR"""
-        self.center_freq = freq
-        self.sample_rate = sr
-        self.bandwidth = bw
-        self.gain = gain
-        self.buffer_size = buf_size
-
-        if self.sdr:
-            try:
-                self.sdr.rx_lo = int(self.center_freq)
-                self.sdr.sample_rate = int(self.sample_rate)
-                self.sdr.rx_rf_bandwidth = int(self.bandwidth)
-                self.sdr.rx_hardwaregain_chan0 = self.gain
-                self.sdr.rx_buffer_size = self.buffer_size
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка обновления настроек: {str(e)}")
-
-    def calculate_rssi(self, samples):
-        """Расчет RSSI"""
-        power_linear = np.mean(np.abs(samples) ** 2)
-        rssi_dbm = 10 * np.log10(power_linear) + 30  # Приблизительная калибровка
-        return rssi_dbm
-
-    def calculate_peak_power(self, fft_data):
-        """Расчет пиковой мощности из FFT"""
-        peak_power_db = np.max(fft_data)
-        return peak_power_db
-
-    def find_dominant_frequency(self, fft_data, freq_axis, threshold_db=None):
-        """Найти доминирующую частоту в спектре"""
-        if threshold_db is None:
-            threshold_db = SDRConfig.SIGNAL_DETECTION_THRESHOLD
-            
-        # Находим индекс максимального пика
-        peak_idx = np.argmax(fft_data)
-        peak_power = fft_data[peak_idx]
-        
-        # Проверяем, превышает ли пик пороговое значение
-        if peak_power > threshold_db:
-            # Частота относительно центральной частоты
-            freq_offset = freq_axis[peak_idx]
-            # Абсолютная частота
-            absolute_freq = self.center_freq + freq_offset
-            return {
-                'frequency': absolute_freq,
-                'freq_offset': freq_offset,
-                'power': peak_power,
-                'detected': True
-            }
-        else:
-            return {'detected': False}
+    def report_error(self, message):
+        self.error_signal.emit(message)
 
-    def run(self):
-        """Основной цикл получения данных"""
-        if not self.connect_pluto():
-            return
+    def report_capture_stats(self, stats):
+        self.capture_stats.emit(stats)
 
-        self.running = True
+    def report_record_stats(self, stats):
+        self.record_stats.emit(stats)
 
-        while self.running:
-            try:
-                # Получение данных с PLUTO
-                samples = self.sdr.rx()
+    def report_recording_finished(self, stats):
+        self.recording_finished.emit(stats)
 
-                # Расчет RSSI
-                rssi = self.calculate_rssi(samples)
+    def report_sweep_stats(self, stats):
+        self.sweep_stats.emit(stats)
 
-                # Расчет FFT
-                fft_data = np.fft.fftshift(np.fft.fft(samples))
-                fft_magnitude = 20 * np.log10(np.abs(fft_data) + 1e-12)
+    def report_source_finished(self):
+        self.source_finished.emit()
 
-                # Расчет пиковой мощности
-                peak_power = self.calculate_peak_power(fft_magnitude)
 
-                # Создание частотной оси
-                freq_axis = np.linspace(-self.sample_rate / 2, self.sample_rate / 2, len(fft_data))
-                
-                # Поиск доминирующей частоты
-                dominant_freq_info = self.find_dominant_frequency(fft_magnitude, freq_axis)
+def apply_render_profile(profile):
+    """Глобальные настройки PyQtGraph для профиля отрисовки (действуют на новые элементы)"""
+    pg.setConfigOptions(antialias=(profile == "quality"))
 
-                # Отправка данных в основной поток
-                self.data_ready.emit(fft_magnitude, rssi, peak_power, dominant_freq_info, freq_axis, self.center_freq)
 
-                # Небольшая пауза
-                self.msleep(50)
+class RenderScheduler(QObject):
+    """Хранит только последний кадр и отрисовывает его по таймеру с заданной частотой"""
 
-            except Exception as e:
-                self.error_signal.emit(f"Ошибка получения данных: {str(e)}")
-                break
+    stats_ready = pyqtSignal(dict)  # received_fps, rendered_fps, skipped_frames
+
+    def __init__(self, render_callback, fps, parent=None):
+        super().__init__(parent)
+        self.render_callback = render_callback
+        self.latest_frame = None
+        self.frames_received = 0
+        self.frames_rendered = 0
+        self.frames_skipped = 0  # кадры, замененные более новыми до отрисовки
+        self._last_stats = (time.monotonic(), 0, 0)
+
+        self.render_timer = QTimer(self)
+        self.render_timer.timeout.connect(self.render_latest)
+        self.set_fps(fps)
+        self.render_timer.start()
 
-        self.disconnect_pluto()
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.emit_stats)
+        self.stats_timer.start(1000)
 
-    def stop(self):
-        """Остановка потока"""
-        self.running = False
+    def set_fps(self, fps):
+        """Установить частоту отрисовки"""
+        self.render_timer.setInterval(max(1, int(1000 / fps)))
+
+    def submit(self, *frame):
+        """Сохранить кадр (предыдущий неотрисованный кадр отбрасывается)"""
+        if self.latest_frame is not None:
+            self.frames_skipped += 1
+        self.latest_frame = frame
+        self.frames_received += 1
+
+    def render_latest(self):
+        """Отрисовать последний кадр, если он появился после прошлой отрисовки"""
+        frame, self.latest_frame = self.latest_frame, None
+        if frame is None:
+            return
+        self.render_callback(*frame)
+        self.frames_rendered += 1
+
+    def emit_stats(self):
+        """Частоты приема и отрисовки за последний интервал"""
+        now = time.monotonic()
+        last_time, last_received, last_rendered = self._last_stats
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        # Интервал без кадров (отключение, остановка приема) дает нулевые частоты, и отсчет
+        # следующего интервала начинается заново, а не с последнего принятого кадра
+        self._last_stats = (now, self.frames_received, self.frames_rendered)
+        self.stats_ready.emit({
+            'received_fps': (self.frames_received - last_received) / elapsed,
+            'rendered_fps': (self.frames_rendered - last_rendered) / elapsed,
+            'skipped_frames': self.frames_skipped,
+        })
 
 
 class PowerAnalyzer(QMainWindow):
@@ -323,22 +163,90 @@ class PowerAnalyzer(QMainWindow):
         self.config = SDRConfig.GUI_CONFIG
 
         self.pluto_thread = PlutoThread()
+        self.render_profile = SDRConfig.RENDER_PROFILE
+        # Отрисовка последнего кадра с фиксированной частотой
+        self.render_scheduler = RenderScheduler(self.update_data, SDRConfig.DISPLAY_FPS, self)
+        # Файл для воспроизведения (переживает пересоздание интерфейса)
+        self.replay_path = None
+        # Задержки этапов конвейера: окно процентилей и панель в строке состояния
+        self.pipeline_stats = PipelineStats(SDRConfig.PIPELINE_WINDOW)
+        self.frames_received = 0
+        self.pipeline_label = QLabel("")
+        self.statusBar().addPermanentWidget(self.pipeline_label)
+        self.statusBar().hide()
+        # Спектр в кадрах прореживается до ширины экрана (минимум и максимум на пиксель)
+        screen_width = QApplication.primaryScreen().size().width()
+        self.pluto_thread.display_columns = min(screen_width, SDRConfig.DISPLAY_COLUMNS)
+        # Водопад: строки кадров переживают пересоздание интерфейса, ширина строки - ширина экрана
+        self.show_waterfall = SDRConfig.WATERFALL_ENABLED
+        self.waterfall = WaterfallBuffer(SDRConfig.WATERFALL_DEPTH, screen_width, SDRConfig.WATERFALL_LEVELS)
+        # Выделенная полоса масштабирования (начало, конец) в МГц; None - еще не выделена
+        self.zoom_band = None
+        # Последние мощности каналов (каналы, порог) и флаги занятости для журнала начала передач
+        self.channel_levels = None
+        self._channels_busy = None
+        # Окно таблицы занятости (номер в SDRConfig.OCCUPANCY_WINDOWS) и период ее обновления
+        self.occupancy_window_index = 0
+        self.occupancy_timer = QTimer(self)
+        self.occupancy_timer.timeout.connect(self.refresh_occupancy_table)
+        self.occupancy_timer.start(SDRConfig.OCCUPANCY_REFRESH_INTERVAL)
+        self.pipeline_timer = QTimer(self)
+        self.pipeline_timer.timeout.connect(self.update_pipeline_stats)
+        self.pipeline_timer.setInterval(SDRConfig.PIPELINE_STATS_INTERVAL)
+        # Журналы переживают пересоздание интерфейса, виджеты только отображают их
+        session = time.strftime("%Y%m%d_%H%M%S")
+        self.message_log = LogModel(
+            SDRConfig.LOG_VIEW_CAPACITY, MESSAGE_DTYPE, format_message,
+            [TextSink(os.path.join(SDRConfig.LOG_DIRECTORY, f"messages_{session}.log"), format_message)],
+            SDRConfig.LOG_FLUSH_INTERVAL, self
+        )
+        self.detection_log = LogModel(
+            SDRConfig.LOG_VIEW_CAPACITY, DETECTION_DTYPE, format_detection,
+            self.create_detection_sinks(os.path.join(SDRConfig.LOG_DIRECTORY, f"detections_{session}")),
+            SDRConfig.LOG_FLUSH_INTERVAL, self
+        )
+        # Пакеты во временной области: файл пакетов сеанса, счетчик и последний пакет
+        self.burst_writer = RecordWriter(
+            BURST_DTYPE,
+            [CSVSink(os.path.join(SDRConfig.LOG_DIRECTORY, f"bursts_{session}.csv"), BURST_DTYPE, BURST_CSV_FORMAT)],
+            self.message_log.error.emit
+        )
+        self.burst_writer.start()
+        self.burst_count = 0
+        self.last_burst = None
         self.init_ui()
         self.setup_connections()
+        if self.pluto_thread.instrument:
+            self.toggle_pipeline_stats(True)
 
         # Данные для графиков - используем методы из SDRConfig
         self.fft_data = SDRConfig.get_default_fft_data()
         self.freq_axis = SDRConfig.get_default_freq_axis()
-        self.rssi_history = []
-        self.peak_power_history = []
-        self.time_history = []
+        self.absolute_freq_axis_mhz = None
+        # История RSSI и пиковой мощности: каналы 0 и 1
+        self.history = HistoryRing(SDRConfig.HISTORY_CAPACITY, channels=2)
+        # Огибающая мощности (вместо RSSI при обнаружении пакетов): сотни точек на кадр
+        self.envelope_history = HistoryRing(SDRConfig.HISTORY_CAPACITY, channels=1)
         self.start_time = time.time()
         
         # Статистика логирования
         self.log_count = 0
         
         # Временной фильтр для частот (избежание дублирования записей)
-        self.frequency_log_history = {}  # {частота: время_последней_записи}
+        self.frequency_log_filter = FrequencyLogFilter(
+            SDRConfig.FREQUENCY_TOLERANCE, SDRConfig.FREQUENCY_LOG_TIMEOUT, SDRConfig.FREQUENCY_LOG_RETENTION
+        )
+
+    def create_detection_sinks(self, base_path):
+        """Файлы обнаружений в форматах из SDRConfig.DETECTION_FILE_FORMATS"""
+        sinks = []
+        if "text" in SDRConfig.DETECTION_FILE_FORMATS:
+            sinks.append(TextSink(base_path + ".log", format_detection))
+        if "csv" in SDRConfig.DETECTION_FILE_FORMATS:
+            sinks.append(CSVSink(base_path + ".csv", DETECTION_DTYPE, DETECTION_CSV_FORMAT))
+        if "binary" in SDRConfig.DETECTION_FILE_FORMATS:
+            sinks.append(BinarySink(base_path + ".dat", DETECTION_DTYPE))
+        return sinks
 
     def init_ui(self):
         """Инициализация пользовательского интерфейса"""
@@ -362,6 +270,8 @@ class PowerAnalyzer(QMainWindow):
 
         # Правая панель - графики
         self.setup_plots_panel()
+        self.update_detection_controls()
+        self.update_source_controls()
         
         # Устанавливаем начальные пропорции (300px для левой панели, остальное для графиков)
         self.main_splitter.setSizes([300, 900])
@@ -398,8 +308,89 @@ class PowerAnalyzer(QMainWindow):
         self.disconnect_btn = QPushButton(self.lang.get_text("disconnect"))
         self.disconnect_btn.setEnabled(False)
 
+        # Источник отсчетов: устройство или записанный IQ-файл
+        source_layout = QGridLayout()
+        source_layout.addWidget(QLabel(self.lang.get_text("sample_source")), 0, 0)
+        self.source_combo = QComboBox()
+        for source in SDRConfig.SAMPLE_SOURCES:
+            self.source_combo.addItem(self.lang.get_text("source_" + source), source)
+        self.source_combo.setCurrentIndex(self.source_combo.findData(SDRConfig.SAMPLE_SOURCE))
+        source_layout.addWidget(self.source_combo, 0, 1)
+        self.open_file_btn = QPushButton(self.lang.get_text("open_iq_file"))
+        source_layout.addWidget(self.open_file_btn, 1, 0)
+        self.replay_file_label = QLabel(os.path.basename(self.replay_path) if self.replay_path else "-")
+        source_layout.addWidget(self.replay_file_label, 1, 1)
+        self.replay_fast_checkbox = QCheckBox(self.lang.get_text("replay_fast"))
+        self.replay_fast_checkbox.setToolTip(self.lang.get_text("replay_fast_tooltip"))
+        self.replay_fast_checkbox.setChecked(not SDRConfig.REPLAY_REALTIME)
+        source_layout.addWidget(self.replay_fast_checkbox, 2, 0, 1, 2)
+
+        # Режим непрерывного захвата без пропусков
+        self.continuous_checkbox = QCheckBox(self.lang.get_text("continuous_capture"))
+        self.continuous_checkbox.setToolTip(self.lang.get_text("continuous_tooltip"))
+        self.continuous_checkbox.setChecked(SDRConfig.CONTINUOUS_CAPTURE)
+
+        # Количество процессов DSP
+        dsp_layout = QHBoxLayout()
+        dsp_layout.addWidget(QLabel(self.lang.get_text("dsp_workers")))
+        self.dsp_workers_spin = QSpinBox()
+        self.dsp_workers_spin.setRange(0, os.cpu_count() or 1)
+        self.dsp_workers_spin.setValue(SDRConfig.DSP_WORKERS)
+        self.dsp_workers_spin.setToolTip(self.lang.get_text("dsp_workers_tooltip"))
+        dsp_layout.addWidget(self.dsp_workers_spin)
+
+        # Панорамный обзор: перестройка по диапазону шагами в полосу дискретизации
+        sweep_layout = QGridLayout()
+        self.sweep_checkbox = QCheckBox(self.lang.get_text("sweep_mode"))
+        self.sweep_checkbox.setToolTip(self.lang.get_text("sweep_tooltip"))
+        sweep_layout.addWidget(self.sweep_checkbox, 0, 0, 1, 2)
+        self.sweep_start_spin = QDoubleSpinBox()
+        self.sweep_stop_spin = QDoubleSpinBox()
+        for row, (spin, key, value) in enumerate((
+            (self.sweep_start_spin, "sweep_start", SDRConfig.SWEEP_START),
+            (self.sweep_stop_spin, "sweep_stop", SDRConfig.SWEEP_STOP),
+        ), start=1):
+            spin.setRange(self.config["frequency"]["min"], self.config["frequency"]["max"])
+            spin.setDecimals(self.config["frequency"]["decimals"])
+            spin.setValue(value / 1e6)
+            sweep_layout.addWidget(QLabel(self.lang.get_text(key)), row, 0)
+            sweep_layout.addWidget(spin, row, 1)
+
+        conn_layout.addLayout(source_layout)
         conn_layout.addWidget(self.connect_btn)
         conn_layout.addWidget(self.disconnect_btn)
+        conn_layout.addWidget(self.continuous_checkbox)
+        conn_layout.addLayout(dsp_layout)
+        conn_layout.addLayout(sweep_layout)
+
+        # Группа записи сырых IQ-отсчетов
+        record_group = QGroupBox(self.lang.get_text("record_group"))
+        record_layout = QGridLayout(record_group)
+
+        self.record_btn = QPushButton(self.lang.get_text("record_iq"))
+        self.record_btn.setCheckable(True)
+        self.record_btn.setEnabled(False)  # запись доступна только при подключении
+        self.record_btn.setToolTip(self.lang.get_text("record_tooltip"))
+        record_layout.addWidget(self.record_btn, 0, 0, 1, 2)
+
+        record_layout.addWidget(QLabel(self.lang.get_text("record_format")), 1, 0)
+        self.record_format_combo = QComboBox()
+        for fmt in IQ_FORMATS:
+            self.record_format_combo.addItem(self.lang.get_text("record_format_" + fmt), fmt)
+        self.record_format_combo.setCurrentIndex(self.record_format_combo.findData(SDRConfig.IQ_RECORD_FORMAT))
+        record_layout.addWidget(self.record_format_combo, 1, 1)
+
+        record_layout.addWidget(QLabel(self.lang.get_text("record_seconds")), 2, 0)
+        self.record_seconds_spin = QSpinBox()
+        self.record_seconds_spin.setRange(1, 3600)
+        self.record_seconds_spin.setValue(SDRConfig.IQ_RECORD_SECONDS)
+        self.record_seconds_spin.setSuffix(" " + self.lang.get_text("sec_unit"))
+        self.record_seconds_spin.setToolTip(self.lang.get_text("record_seconds_tooltip"))
+        record_layout.addWidget(self.record_seconds_spin, 2, 1)
+
+        self.record_stats_label = QLabel("")
+        self.record_stats_label.hide()
+        record_layout.addWidget(self.record_stats_label, 3, 0, 1, 2)
 
         # Группа настроек
         settings_group = QGroupBox(self.lang.get_text("settings_group"))
@@ -461,6 +452,52 @@ class PowerAnalyzer(QMainWindow):
         self.detection_threshold_spin.setToolTip(self.lang.get_text("detection_tooltip"))
         settings_layout.addWidget(self.detection_threshold_spin, 5, 1)
 
+        # Окно FFT
+        settings_layout.addWidget(QLabel(self.lang.get_text("fft_window")), 6, 0)
+        self.window_combo = QComboBox()
+        for window_name in dsp.WINDOW_FUNCTIONS:
+            self.window_combo.addItem(self.lang.get_text("window_" + window_name), window_name)
+        self.window_combo.setCurrentIndex(self.window_combo.findData(SDRConfig.FFT_WINDOW))
+        self.window_combo.setToolTip(self.lang.get_text("fft_window_tooltip"))
+        settings_layout.addWidget(self.window_combo, 6, 1)
+
+        # Профиль отрисовки
+        settings_layout.addWidget(QLabel(self.lang.get_text("render_profile")), 7, 0)
+        self.render_profile_combo = QComboBox()
+        for profile in SDRConfig.RENDER_PROFILES:
+            self.render_profile_combo.addItem(self.lang.get_text("render_profile_" + profile), profile)
+        self.render_profile_combo.setCurrentIndex(self.render_profile_combo.findData(self.render_profile))
+        self.render_profile_combo.setToolTip(self.lang.get_text("render_profile_tooltip"))
+        settings_layout.addWidget(self.render_profile_combo, 7, 1)
+
+        # Режим порога обнаружения
+        settings_layout.addWidget(QLabel(self.lang.get_text("detection_mode")), 8, 0)
+        self.detection_mode_combo = QComboBox()
+        for mode in dsp.DETECTION_MODES:
+            self.detection_mode_combo.addItem(self.lang.get_text("detection_mode_" + mode), mode)
+        self.detection_mode_combo.setCurrentIndex(self.detection_mode_combo.findData(SDRConfig.DETECTION_MODE))
+        self.detection_mode_combo.setToolTip(self.lang.get_text("detection_mode_tooltip"))
+        settings_layout.addWidget(self.detection_mode_combo, 8, 1)
+
+        settings_layout.addWidget(QLabel(self.lang.get_text("cfar_offset")), 9, 0)
+        self.cfar_offset_spin = QDoubleSpinBox()
+        self.cfar_offset_spin.setRange(3.0, 40.0)
+        self.cfar_offset_spin.setDecimals(1)
+        self.cfar_offset_spin.setValue(SDRConfig.CFAR_OFFSET)
+        self.cfar_offset_spin.setSuffix(" " + self.lang.get_text("db_unit"))
+        self.cfar_offset_spin.setToolTip(self.lang.get_text("cfar_offset_tooltip"))
+        settings_layout.addWidget(self.cfar_offset_spin, 9, 1)
+
+        # План каналов для банка фильтров (применяется сразу)
+        settings_layout.addWidget(QLabel(self.lang.get_text("channel_plan")), 10, 0)
+        self.channel_plan_combo = QComboBox()
+        self.channel_plan_combo.addItem(self.lang.get_text("channel_plan_off"), None)
+        for plan_name, plan in SDRConfig.CHANNEL_PLANS.items():
+            self.channel_plan_combo.addItem(plan["name"], plan_name)
+        self.channel_plan_combo.setCurrentIndex(self.channel_plan_combo.findData(self.pluto_thread.channel_plan))
+        self.channel_plan_combo.setToolTip(self.lang.get_text("channel_plan_tooltip"))
+        settings_layout.addWidget(self.channel_plan_combo, 10, 1)
+
         self.apply_btn = QPushButton(self.lang.get_text("apply_settings"))
 
         # Группа предустановок
@@ -510,26 +547,45 @@ class PowerAnalyzer(QMainWindow):
         self.progress_bar.setRange(0, 0)  # Бесконечный прогресс
         self.progress_bar.hide()
 
+        # Статистика непрерывного захвата (показывается только в этом режиме)
+        self.capture_stats_label = QLabel("")
+        self.capture_stats_label.hide()
+
         status_layout.addWidget(self.status_label)
+        status_layout.addWidget(self.capture_stats_label)
+
+        # Статистика отрисовки
+        self.render_stats_label = QLabel("")
+        self.render_stats_label.hide()
+        status_layout.addWidget(self.render_stats_label)
+
+        # Замеры задержек конвейера: панель в строке состояния и выгрузка в JSON
+        pipeline_layout = QHBoxLayout()
+        self.pipeline_checkbox = QCheckBox(self.lang.get_text("pipeline_latency"))
+        self.pipeline_checkbox.setChecked(self.pluto_thread.instrument)
+        self.pipeline_checkbox.setToolTip(self.lang.get_text("pipeline_latency_tooltip"))
+        self.pipeline_dump_btn = QPushButton(self.lang.get_text("pipeline_dump"))
+        self.pipeline_dump_btn.setToolTip(self.lang.get_text("pipeline_dump_tooltip"))
+        pipeline_layout.addWidget(self.pipeline_checkbox)
+        pipeline_layout.addWidget(self.pipeline_dump_btn)
+        status_layout.addLayout(pipeline_layout)
         status_layout.addWidget(self.progress_bar)
 
         # Лог ошибок
         log_group = QGroupBox(self.lang.get_text("log_group"))
         log_layout = QVBoxLayout(log_group)
 
-        self.log_text = QTextEdit()
+        self.log_text = LogView(self.message_log)
         self.log_text.setMaximumHeight(80)
-        self.log_text.setReadOnly(True)
         log_layout.addWidget(self.log_text)
 
         # Детальный лог измерений
         detailed_log_group = QGroupBox(self.lang.get_text("detailed_log_group"))
         detailed_log_layout = QVBoxLayout(detailed_log_group)
 
-        self.detailed_log_text = QTextEdit()
+        self.detailed_log_text = LogView(self.detection_log)
         self.detailed_log_text.setMaximumHeight(120)
-        self.detailed_log_text.setReadOnly(True)
-        self.detailed_log_text.setStyleSheet("QTextEdit { font-family: 'Courier New', monospace; font-size: 9pt; }")
+        self.detailed_log_text.setStyleSheet("QListView { font-family: 'Courier New', monospace; font-size: 9pt; }")
         detailed_log_layout.addWidget(self.detailed_log_text)
 
         # Кнопки управления логированием
@@ -587,6 +643,7 @@ class PowerAnalyzer(QMainWindow):
         # Добавление групп в layout
         control_layout.addWidget(lang_group)  # добавляем группу языка первой
         control_layout.addWidget(conn_group)
+        control_layout.addWidget(record_group)
         control_layout.addWidget(settings_group)
         control_layout.addWidget(self.apply_btn)
         control_layout.addWidget(presets_group)
@@ -673,6 +730,9 @@ class PowerAnalyzer(QMainWindow):
         current_gain = self.gain_spin.value()
         current_buffer = self.buffer_spin.currentText()
         current_detection_threshold = self.detection_threshold_spin.value()
+        current_window_index = self.window_combo.currentIndex()
+        current_detection_mode_index = self.detection_mode_combo.currentIndex()
+        current_cfar_offset = self.cfar_offset_spin.value()
         current_log_threshold = self.log_threshold_spin.value()
         current_log_timeout = self.log_timeout_spin.value()
         current_tolerance = self.frequency_tolerance_spin.value()
@@ -680,19 +740,35 @@ class PowerAnalyzer(QMainWindow):
         
         # Сохраняем состояние подключения
         is_connected = self.disconnect_btn.isEnabled()
+        continuous_checked = self.continuous_checkbox.isChecked()
+        current_dsp_workers = self.dsp_workers_spin.value()
+        sweep_checked = self.sweep_checkbox.isChecked()
+        current_sweep_start = self.sweep_start_spin.value()
+        current_sweep_stop = self.sweep_stop_spin.value()
+        capture_stats_text = self.capture_stats_label.text()
+        current_source_index = self.source_combo.currentIndex()
+        replay_fast = self.replay_fast_checkbox.isChecked()
+        recording = self.record_btn.isChecked()
+        current_record_format_index = self.record_format_combo.currentIndex()
+        current_record_seconds = self.record_seconds_spin.value()
+        record_stats_text = self.record_stats_label.text()
+        pipeline_checked = self.pipeline_checkbox.isChecked()
+        render_stats_text = self.render_stats_label.text()
+        current_display_fps = self.display_fps_spin.value()
         
         # Сохраняем состояние HOLD
         hold_checked = self.hold_checkbox.isChecked() if hasattr(self, 'hold_checkbox') else False
+        current_averaging_index = self.averaging_combo.currentIndex()
+        current_averaging_frames = self.averaging_frames_spin.value()
+        current_overlap_index = self.overlap_combo.currentIndex()
         saved_hold_data = self.fft_hold_data.copy() if hasattr(self, 'fft_hold_data') and self.fft_hold_data is not None else None
         
-        # Сохраняем исторические данные графиков
-        saved_time_history = self.time_history.copy() if hasattr(self, 'time_history') else []
-        saved_rssi_history = self.rssi_history.copy() if hasattr(self, 'rssi_history') else []
-        saved_peak_power_history = self.peak_power_history.copy() if hasattr(self, 'peak_power_history') else []
+        # Сохраняем исторические данные графиков (история RSSI не пересоздается)
         saved_freq_axis = self.freq_axis.copy() if hasattr(self, 'freq_axis') else []
-        saved_center_freq = current_freq * 1e6  # Сохраняем текущую центральную частоту
-        saved_fft_data = None
+        # Кривая спектра сохраняется вместе со своей осью (в МГц, после прореживания)
+        saved_fft_x, saved_fft_data = None, None
         if hasattr(self, 'fft_curve') and self.fft_curve.getData()[1] is not None:
+            saved_fft_x = self.fft_curve.getData()[0].copy()
             saved_fft_data = self.fft_curve.getData()[1].copy()
         
         # Сохраняем текущие значения меток
@@ -723,10 +799,19 @@ class PowerAnalyzer(QMainWindow):
             self.buffer_spin.setCurrentIndex(buffer_index)
             
         self.detection_threshold_spin.setValue(current_detection_threshold)
+        self.window_combo.setCurrentIndex(current_window_index)
+        self.detection_mode_combo.setCurrentIndex(current_detection_mode_index)
+        self.cfar_offset_spin.setValue(current_cfar_offset)
+        self.update_detection_controls()
         self.log_threshold_spin.setValue(current_log_threshold)
         self.log_timeout_spin.setValue(current_log_timeout)
         self.frequency_tolerance_spin.setValue(current_tolerance)
         self.language_combo.setCurrentIndex(current_language_index)
+        # Восстанавливаем усреднение (сигналы еще не подключены)
+        self.averaging_combo.setCurrentIndex(current_averaging_index)
+        self.averaging_frames_spin.setValue(current_averaging_frames)
+        self.overlap_combo.setCurrentIndex(current_overlap_index)
+        self.overlap_combo.setEnabled(self.averaging_combo.currentData() == "welch")
         
         # Восстанавливаем состояние подключения
         if is_connected:
@@ -737,6 +822,29 @@ class PowerAnalyzer(QMainWindow):
             self.connect_btn.setEnabled(True)
             self.disconnect_btn.setEnabled(False)
             self.status_label.setText(self.lang.get_text("not_connected"))
+        self.continuous_checkbox.setChecked(continuous_checked)
+        self.dsp_workers_spin.setValue(current_dsp_workers)
+        self.sweep_checkbox.setChecked(sweep_checked)
+        self.sweep_start_spin.setValue(current_sweep_start)
+        self.sweep_stop_spin.setValue(current_sweep_stop)
+        self.source_combo.setCurrentIndex(current_source_index)
+        self.replay_fast_checkbox.setChecked(replay_fast)
+        self.set_session_controls_enabled(not is_connected)
+        if is_connected and capture_stats_text:
+            self.capture_stats_label.setText(capture_stats_text)
+            self.capture_stats_label.show()
+        self.record_format_combo.setCurrentIndex(current_record_format_index)
+        self.record_seconds_spin.setValue(current_record_seconds)
+        self.record_btn.setChecked(recording)
+        self.set_record_controls_enabled(not recording)
+        if record_stats_text:
+            self.record_stats_label.setText(record_stats_text)
+            self.record_stats_label.show()
+        if is_connected and render_stats_text:
+            self.render_stats_label.setText(render_stats_text)
+            self.render_stats_label.show()
+        self.display_fps_spin.setValue(current_display_fps)
+        self.pipeline_checkbox.setChecked(pipeline_checked)
         
         # Восстанавливаем размеры splitter
         self.main_splitter.setSizes([300, 900])
@@ -748,25 +856,18 @@ class PowerAnalyzer(QMainWindow):
         self.update_line_labels()
         
         # Восстанавливаем исторические данные графиков
-        if saved_time_history:
-            self.time_history = saved_time_history
-        if saved_rssi_history:
-            self.rssi_history = saved_rssi_history
-        if saved_peak_power_history:
-            self.peak_power_history = saved_peak_power_history
         if len(saved_freq_axis) > 0:
             self.freq_axis = saved_freq_axis
             
         # Восстанавливаем данные на графиках
-        if saved_rssi_history and saved_time_history:
-            self.rssi_curve.setData(saved_time_history, saved_rssi_history)
-        if saved_peak_power_history and saved_time_history:
-            self.power_curve.setData(saved_time_history, saved_peak_power_history)
-        if saved_fft_data is not None and len(saved_freq_axis) > 0:
-            # Создаем абсолютную частотную ось и конвертируем в МГц
-            saved_absolute_freq_axis = saved_freq_axis + saved_center_freq
-            saved_absolute_freq_axis_mhz = saved_absolute_freq_axis / 1e6
-            self.fft_curve.setData(saved_absolute_freq_axis_mhz, saved_fft_data)
+        self.redraw_history()
+        if self.show_waterfall:
+            self.redraw_waterfall()
+        if self.channel_levels is not None:
+            self.redraw_channels()
+        self.refresh_occupancy_table()
+        if saved_fft_data is not None:
+            self.fft_curve.setData(saved_fft_x, saved_fft_data)
             
         # Восстанавливаем текущие значения меток
         self.rssi_label.setText(current_rssi_text)
@@ -780,11 +881,9 @@ class PowerAnalyzer(QMainWindow):
         if saved_hold_data is not None:
             self.fft_hold_data = saved_hold_data
             # Восстанавливаем отображение HOLD кривой, если она была активна
-            if hold_checked and len(saved_freq_axis) > 0:
-                saved_absolute_freq_axis = saved_freq_axis + saved_center_freq
-                saved_absolute_freq_axis_mhz = saved_absolute_freq_axis / 1e6
+            if hold_checked and saved_fft_x is not None and len(saved_fft_x) == len(saved_hold_data):
                 if hasattr(self, 'fft_hold_curve'):
-                    self.fft_hold_curve.setData(saved_absolute_freq_axis_mhz, saved_hold_data)
+                    self.fft_hold_curve.setData(saved_fft_x, saved_hold_data)
 
     def update_line_labels(self):
         """Обновление подписей линий на графике после смены языка"""
@@ -813,6 +912,14 @@ class PowerAnalyzer(QMainWindow):
         plots_widget = QWidget()
         plots_layout = QVBoxLayout(plots_widget)
 
+        # В профиле производительности элементы графиков создаются один раз,
+        # а линии рисуются тонкими и без сглаживания
+        self.high_performance = self.render_profile == "performance"
+        line_width = 1 if self.high_performance else 2
+        # Новый график - диапазон частот нужно выставить заново
+        self._axis_source = None
+        self._axis_center_freq = None
+
         # FFT график
         fft_group = QGroupBox(self.lang.get_text("fft_group"))
         fft_layout = QVBoxLayout(fft_group)
@@ -827,7 +934,7 @@ class PowerAnalyzer(QMainWindow):
         
         # Добавляем интерактивные линии порогов
         # Порог обнаружения (пунктирная красная линия)
-        detection_pen = pg.mkPen(color='r', style=pg.QtCore.Qt.DashLine, width=2)
+        detection_pen = pg.mkPen(color='r', style=pg.QtCore.Qt.DashLine, width=line_width)
         self.detection_threshold_line = pg.InfiniteLine(
             pos=SDRConfig.SIGNAL_DETECTION_THRESHOLD,
             angle=0,  # горизонтальная линия
@@ -840,7 +947,7 @@ class PowerAnalyzer(QMainWindow):
         self.fft_plot.addItem(self.detection_threshold_line)
         
         # Порог логирования (пунктирная оранжевая линия)
-        log_pen = pg.mkPen(color='orange', style=pg.QtCore.Qt.DashDotLine, width=2)
+        log_pen = pg.mkPen(color='orange', style=pg.QtCore.Qt.DashDotLine, width=line_width)
         self.log_threshold_line = pg.InfiniteLine(
             pos=SDRConfig.LOG_THRESHOLD,
             angle=0,  # горизонтальная линия
@@ -851,6 +958,15 @@ class PowerAnalyzer(QMainWindow):
             labelOpts={'position': 0.9, 'color': (255, 165, 0), 'fill': (255, 255, 255, 100)}
         )
         self.fft_plot.addItem(self.log_threshold_line)
+
+        # Полоса масштабирования: выделение на графике FFT, видно при спектре всей полосы
+        if self.zoom_band is None:
+            center = SDRConfig.DEFAULT_FREQUENCY / 1e6
+            self.zoom_band = (center - SDRConfig.ZOOM_SPAN / 2e6, center + SDRConfig.ZOOM_SPAN / 2e6)
+        self.zoom_region = pg.LinearRegionItem(values=self.zoom_band, brush=pg.mkBrush(255, 255, 0, 40))
+        self.zoom_region.setZValue(-10)
+        self.zoom_region.setVisible(self.pluto_thread.zoom_span is None)
+        self.fft_plot.addItem(self.zoom_region)
         
         # Добавляем легенду
         self.fft_plot.addLegend()
@@ -861,6 +977,22 @@ class PowerAnalyzer(QMainWindow):
             name=self.lang.get_text("hold_legend")
         )
         self.fft_hold_data = None  # Массив для хранения максимальных значений
+
+        # Кривая адаптивного порога (CFAR)
+        self.cfar_curve = self.fft_plot.plot(
+            pen=pg.mkPen(color='m', width=1),
+            name=self.lang.get_text("cfar_legend")
+        )
+
+        # Постоянный маркер доминирующей частоты (обновляется через setData)
+        if self.high_performance:
+            self.peak_marker = pg.ScatterPlotItem(
+                symbol='o',
+                size=15,
+                brush='red',
+                pen=pg.mkPen('darkred', width=line_width)
+            )
+            self.fft_plot.addItem(self.peak_marker)
         
         # Элементы управления HOLD
         hold_controls = QHBoxLayout()
@@ -873,11 +1005,84 @@ class PowerAnalyzer(QMainWindow):
         self.hold_clear_btn.setToolTip(self.lang.get_text("hold_clear_tooltip"))
         self.hold_clear_btn.clicked.connect(self.clear_hold_data)
         hold_controls.addWidget(self.hold_clear_btn)
+
+        self.zoom_btn = QPushButton(self.lang.get_text("zoom"))
+        self.zoom_btn.setCheckable(True)
+        self.zoom_btn.setChecked(self.pluto_thread.zoom_span is not None)
+        self.zoom_btn.setToolTip(self.lang.get_text("zoom_tooltip"))
+        hold_controls.addWidget(self.zoom_btn)
+        
+        # Элементы управления усреднением
+        hold_controls.addWidget(QLabel(self.lang.get_text("averaging")))
+        self.averaging_combo = QComboBox()
+        for mode in dsp.AVERAGING_MODES:
+            self.averaging_combo.addItem(self.lang.get_text("averaging_" + mode), mode)
+        self.averaging_combo.setCurrentIndex(self.averaging_combo.findData(SDRConfig.AVERAGING_MODE))
+        self.averaging_combo.setToolTip(self.lang.get_text("averaging_tooltip"))
+        hold_controls.addWidget(self.averaging_combo)
+
+        self.averaging_frames_spin = QSpinBox()
+        self.averaging_frames_spin.setRange(2, 64)
+        self.averaging_frames_spin.setValue(SDRConfig.AVERAGING_FRAMES)
+        self.averaging_frames_spin.setPrefix("N=")
+        self.averaging_frames_spin.setToolTip(self.lang.get_text("averaging_frames_tooltip"))
+        hold_controls.addWidget(self.averaging_frames_spin)
+
+        self.overlap_combo = QComboBox()
+        for overlap in (0.5, 0.75):
+            self.overlap_combo.addItem(f"{overlap * 100:.0f}%", overlap)
+        self.overlap_combo.setCurrentIndex(self.overlap_combo.findData(SDRConfig.WELCH_OVERLAP))
+        self.overlap_combo.setToolTip(self.lang.get_text("overlap_tooltip"))
+        self.overlap_combo.setEnabled(SDRConfig.AVERAGING_MODE == "welch")
+        hold_controls.addWidget(self.overlap_combo)
+        
+        # Частота отрисовки
+        self.display_fps_spin = QSpinBox()
+        self.display_fps_spin.setRange(1, 120)
+        self.display_fps_spin.setValue(SDRConfig.DISPLAY_FPS)
+        self.display_fps_spin.setSuffix(" FPS")
+        self.display_fps_spin.setToolTip(self.lang.get_text("display_fps_tooltip"))
+        hold_controls.addWidget(self.display_fps_spin)
+
+        # Водопад и глубина его истории
+        self.waterfall_checkbox = QCheckBox(self.lang.get_text("waterfall_enable"))
+        self.waterfall_checkbox.setChecked(self.show_waterfall)
+        self.waterfall_checkbox.setToolTip(self.lang.get_text("waterfall_tooltip"))
+        hold_controls.addWidget(self.waterfall_checkbox)
+
+        self.waterfall_depth_spin = QSpinBox()
+        self.waterfall_depth_spin.setRange(50, SDRConfig.WATERFALL_MAX_DEPTH)
+        self.waterfall_depth_spin.setSingleStep(100)
+        self.waterfall_depth_spin.setValue(self.waterfall.depth)
+        self.waterfall_depth_spin.setSuffix(" " + self.lang.get_text("waterfall_rows"))
+        self.waterfall_depth_spin.setToolTip(self.lang.get_text("waterfall_depth_tooltip"))
+        hold_controls.addWidget(self.waterfall_depth_spin)
         
         hold_controls.addStretch()  # Добавляем растяжку для выравнивания влево
         
+        # Водопад под спектром: ось частот общая с графиком FFT, новые строки сверху.
+        # Изображение - индексы палитры uint8, цвета подставляет таблица (без пересчета)
+        self.waterfall_plot = pg.PlotWidget()
+        self.waterfall_plot.setLabel("left", self.lang.get_text("waterfall_axis"))
+        self.waterfall_plot.hideAxis("bottom")
+        self.waterfall_plot.setXLink(self.fft_plot)
+        self.waterfall_plot.setMouseEnabled(y=False)
+        self.waterfall_image = pg.ImageItem(axisOrder="row-major")
+        self.waterfall_image.setLookupTable(
+            pg.colormap.get(SDRConfig.WATERFALL_COLORMAP).getLookupTable(nPts=256, alpha=False)
+        )
+        self.waterfall_plot.addItem(self.waterfall_image)
+        self.waterfall_plot.setVisible(self.show_waterfall)
+        self._waterfall_drawn = None
+        self._waterfall_extent = None
+
+        fft_splitter = QSplitter(Qt.Vertical)
+        fft_splitter.addWidget(self.fft_plot)
+        fft_splitter.addWidget(self.waterfall_plot)
+        fft_splitter.setSizes([2 * SDRConfig.WATERFALL_HEIGHT, SDRConfig.WATERFALL_HEIGHT])
+
         fft_layout.addLayout(hold_controls)
-        fft_layout.addWidget(self.fft_plot)
+        fft_layout.addWidget(fft_splitter)
 
         # RSSI график во времени
         rssi_group = QGroupBox(self.lang.get_text("rssi_group"))
@@ -889,6 +1094,18 @@ class PowerAnalyzer(QMainWindow):
         self.rssi_plot.showGrid(True)
         self.rssi_curve = self.rssi_plot.plot(pen="b", width=2)
 
+        # Огибающая по всем отсчетам вместо точки RSSI на кадр и статистика пакетов
+        burst_controls = QHBoxLayout()
+        self.burst_envelope_checkbox = QCheckBox(self.lang.get_text("burst_envelope"))
+        self.burst_envelope_checkbox.setChecked(self.pluto_thread.burst_detection)
+        self.burst_envelope_checkbox.setToolTip(self.lang.get_text("burst_envelope_tooltip"))
+        burst_controls.addWidget(self.burst_envelope_checkbox)
+        self.burst_stats_label = QLabel("")
+        burst_controls.addWidget(self.burst_stats_label)
+        burst_controls.addStretch()
+        self.update_burst_label()
+
+        rssi_layout.addLayout(burst_controls)
         rssi_layout.addWidget(self.rssi_plot)
 
         # Пиковая мощность во времени
@@ -903,7 +1120,66 @@ class PowerAnalyzer(QMainWindow):
 
         power_layout.addWidget(self.power_plot)
 
+        # Мощность каналов плана: столбцы от уровня шума, занятые каналы - красные
+        self.channels_group = QGroupBox(self.lang.get_text("channels_group"))
+        channels_layout = QVBoxLayout(self.channels_group)
+
+        self.channel_plot = pg.PlotWidget()
+        self.channel_plot.setLabel("left", self.lang.get_text("power_axis"), self.lang.get_text("dbm_unit"))
+        self.channel_plot.setLabel("bottom", self.lang.get_text("channels_axis"), "MHz")
+        self.channel_plot.showGrid(y=True)
+        self.channel_plot.setMouseEnabled(x=False)
+        self.channel_bars = pg.BarGraphItem(x=[], height=[], width=0.8)
+        self.channel_plot.addItem(self.channel_bars)
+        self.channel_threshold_line = pg.InfiniteLine(
+            angle=0, pen=pg.mkPen(color='r', style=pg.QtCore.Qt.DashLine, width=line_width)
+        )
+        self.channel_plot.addItem(self.channel_threshold_line)
+        self.channel_busy_brush = pg.mkBrush(220, 40, 40)
+        self.channel_idle_brush = pg.mkBrush(150, 150, 150)
+        self._channel_ticks = None
+
+        # Таблица занятости каналов в выбранном скользящем окне
+        occupancy_controls = QHBoxLayout()
+        occupancy_controls.addWidget(QLabel(self.lang.get_text("occupancy_window")))
+        self.occupancy_window_combo = QComboBox()
+        for span, _ in SDRConfig.OCCUPANCY_WINDOWS:
+            if span < 3600:
+                self.occupancy_window_combo.addItem(self.lang.get_text("occupancy_minutes", span / 60), span)
+            else:
+                self.occupancy_window_combo.addItem(self.lang.get_text("occupancy_hours", span / 3600), span)
+        self.occupancy_window_combo.setCurrentIndex(self.occupancy_window_index)
+        self.occupancy_window_combo.setToolTip(self.lang.get_text("occupancy_window_tooltip"))
+        occupancy_controls.addWidget(self.occupancy_window_combo)
+        self.occupancy_export_btn = QPushButton(self.lang.get_text("occupancy_export"))
+        self.occupancy_export_btn.setToolTip(self.lang.get_text("occupancy_export_tooltip"))
+        occupancy_controls.addWidget(self.occupancy_export_btn)
+        occupancy_controls.addStretch()
+
+        columns = ("occupancy_channel", "occupancy_duty", "occupancy_bursts", "occupancy_mean", "occupancy_max")
+        self.occupancy_table = QTableWidget(0, len(columns))
+        self.occupancy_table.setHorizontalHeaderLabels([self.lang.get_text(column) for column in columns])
+        self.occupancy_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.occupancy_table.verticalHeader().hide()
+        self.occupancy_table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        occupancy_layout = QVBoxLayout()
+        occupancy_layout.addLayout(occupancy_controls)
+        occupancy_layout.addWidget(self.occupancy_table)
+        channels_row = QHBoxLayout()
+        channels_row.addWidget(self.channel_plot, 3)
+        channels_row.addLayout(occupancy_layout, 2)
+        channels_layout.addLayout(channels_row)
+        self.channels_group.setVisible(self.pluto_thread.channel_plan is not None)
+
+        if self.high_performance:
+            # Отрисовываются только видимые точки, прореженные до ширины графика
+            for curve in (self.fft_curve, self.fft_hold_curve, self.cfar_curve, self.rssi_curve, self.power_curve):
+                curve.setClipToView(True)
+                curve.setDownsampling(auto=True, method="peak")
+
         plots_layout.addWidget(fft_group)
+        plots_layout.addWidget(self.channels_group)
         plots_layout.addWidget(rssi_group)
         plots_layout.addWidget(power_group)
 
@@ -957,6 +1233,28 @@ class PowerAnalyzer(QMainWindow):
         self.log_timeout_spin.valueChanged.connect(self.update_log_timeout)
         self.frequency_tolerance_spin.valueChanged.connect(self.update_frequency_tolerance)
 
+        # Усреднение спектра применяется сразу, без кнопки применения настроек
+        self.averaging_combo.currentIndexChanged.connect(self.update_averaging)
+        self.averaging_frames_spin.valueChanged.connect(self.update_averaging)
+        self.overlap_combo.currentIndexChanged.connect(self.update_averaging)
+        self.display_fps_spin.valueChanged.connect(self.render_scheduler.set_fps)
+        self.waterfall_checkbox.toggled.connect(self.toggle_waterfall)
+        self.zoom_btn.toggled.connect(self.toggle_zoom)
+        self.zoom_region.sigRegionChangeFinished.connect(self.on_zoom_region_changed)
+        self.channel_plan_combo.currentIndexChanged.connect(self.change_channel_plan)
+        self.occupancy_window_combo.currentIndexChanged.connect(self.change_occupancy_window)
+        self.occupancy_export_btn.clicked.connect(self.export_occupancy)
+        self.burst_envelope_checkbox.toggled.connect(self.toggle_burst_envelope)
+        self.waterfall_depth_spin.valueChanged.connect(self.change_waterfall_depth)
+        self.render_profile_combo.currentIndexChanged.connect(self.change_render_profile)
+        self.detection_mode_combo.currentIndexChanged.connect(self.update_detection_mode)
+        self.cfar_offset_spin.valueChanged.connect(self.update_detection_mode)
+        self.record_btn.toggled.connect(self.toggle_recording)
+        self.source_combo.currentIndexChanged.connect(self.update_source_controls)
+        self.open_file_btn.clicked.connect(self.choose_replay_file)
+        self.pipeline_checkbox.toggled.connect(self.toggle_pipeline_stats)
+        self.pipeline_dump_btn.clicked.connect(self.dump_pipeline_stats)
+
         # Подключаем сигналы от интерактивных линий на графике (только если они существуют)
         if hasattr(self, 'detection_threshold_line'):
             self.detection_threshold_line.sigPositionChanged.connect(self.on_detection_line_moved)
@@ -965,13 +1263,23 @@ class PowerAnalyzer(QMainWindow):
 
         # Сигналы от потока PLUTO (подключаем только один раз при первой инициализации)
         if not hasattr(self, '_connections_setup'):
-            self.pluto_thread.data_ready.connect(self.update_data)
+            self.pluto_thread.data_ready.connect(self.on_frame)
+            self.render_scheduler.stats_ready.connect(self.update_render_stats)
             self.pluto_thread.error_signal.connect(self.handle_error)
+            self.pluto_thread.capture_stats.connect(self.update_capture_stats)
+            self.pluto_thread.record_stats.connect(self.update_record_stats)
+            self.pluto_thread.recording_finished.connect(self.on_recording_finished)
+            self.pluto_thread.source_finished.connect(self.on_source_finished)
+            self.pluto_thread.sweep_stats.connect(self.update_sweep_stats)
+            self.message_log.error.connect(self.on_log_history_error)
+            self.detection_log.error.connect(self.on_log_history_error)
             self.pluto_thread.finished.connect(self.thread_finished)
             self._connections_setup = True
 
     def connect_pluto(self):
         """Подключение к PLUTO"""
+        if not self.prepare_sample_source():
+            return
         self.connect_btn.setEnabled(False)
         self.progress_bar.show()
         self.status_label.setText(self.lang.get_text("connecting"))
@@ -980,6 +1288,16 @@ class PowerAnalyzer(QMainWindow):
         # Применяем настройки перед подключением
         self.apply_settings()
 
+        # Режим захвата и обработки фиксируется на время сеанса
+        self.pluto_thread.continuous_mode = self.continuous_checkbox.isChecked()
+        self.pluto_thread.dsp_workers = self.dsp_workers_spin.value()
+        self.pluto_thread.sweep_span = None
+        if self.sweep_checkbox.isEnabled() and self.sweep_checkbox.isChecked():
+            self.pluto_thread.sweep_span = (self.sweep_start_spin.value() * 1e6, self.sweep_stop_spin.value() * 1e6)
+        self.pluto_thread.frames_emitted = 0
+        self.frames_received = 0
+        self.set_session_controls_enabled(False)
+
         # Запускаем поток
         self.pluto_thread.start()
 
@@ -988,11 +1306,103 @@ class PowerAnalyzer(QMainWindow):
         self.pluto_thread.stop()
         self.pluto_thread.wait()
 
+    def set_session_controls_enabled(self, enabled):
+        """Включение настроек, которые применяются только при подключении"""
+        self.continuous_checkbox.setEnabled(enabled)
+        self.dsp_workers_spin.setEnabled(enabled)
+        self.source_combo.setEnabled(enabled)
+        self.sweep_start_spin.setEnabled(enabled)
+        self.sweep_stop_spin.setEnabled(enabled)
+        self.update_source_controls()
+        # Запись, наоборот, возможна только во время сеанса (и не при обзоре - частота меняется)
+        self.record_btn.setEnabled(not enabled and self.pluto_thread.sweep_span is None)
+
+    def update_source_controls(self):
+        """Выбор файла - только для файла, темп - для файла и симулятора; все - вне сеанса"""
+        enabled = self.source_combo.isEnabled()
+        source = self.source_combo.currentData()
+        self.open_file_btn.setEnabled(enabled and source == "file")
+        self.replay_fast_checkbox.setEnabled(enabled and source in ("file", "simulator"))
+        # У записи частота настройки фиксирована - обзор только для устройства и симулятора
+        self.sweep_checkbox.setEnabled(enabled and source != "file")
+
+    def choose_replay_file(self):
+        """Выбор IQ-файла для воспроизведения"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, self.lang.get_text("open_iq_file_title"), SDRConfig.IQ_RECORD_DIRECTORY,
+            "IQ (*.sigmf-meta *.sigmf-data *.cf32 *.ci16)"
+        )
+        if path:
+            self.replay_path = path
+            self.replay_file_label.setText(os.path.basename(path))
+
+    def prepare_sample_source(self):
+        """Задать источник отсчетов для сеанса; частоты файла переносятся в настройки"""
+        source = self.source_combo.currentData()
+        realtime = not self.replay_fast_checkbox.isChecked()
+        if source == "simulator":
+            self.pluto_thread.source_factory = lambda: SimulatedPluto(seed=SDRConfig.SIMULATOR_SEED, realtime=realtime)
+            self.log_message(self.lang.get_text("simulator_started", SDRConfig.SIMULATOR_SEED))
+            return True
+        if source != "file":
+            self.pluto_thread.source_factory = open_pluto
+            return True
+        if not self.replay_path:
+            self.log_message(self.lang.get_text("replay_no_file"))
+            return False
+        try:
+            # Для сырого файла частоты берутся из текущих настроек
+            source = FileSource(
+                self.replay_path, self.sr_spin.value() * 1e6, self.freq_spin.value() * 1e6, realtime=realtime
+            )
+        except (OSError, ValueError, KeyError, StopIteration) as e:
+            self.log_message(self.lang.get_text("replay_error", str(e)))
+            return False
+        self.freq_spin.setValue(source.rx_lo / 1e6)
+        self.sr_spin.setValue(source.sample_rate / 1e6)
+        self.pluto_thread.source_factory = lambda: source
+        self.log_message(self.lang.get_text(
+            "replay_started", self.replay_path, source.sample_rate / 1e6, len(source) / source.sample_rate
+        ))
+        return True
+
+    def on_source_finished(self):
+        """Воспроизведение файла завершено"""
+        self.log_message(self.lang.get_text("replay_finished"))
+
+    def set_record_controls_enabled(self, enabled):
+        """Формат и длительность записи меняются только между записями"""
+        self.record_format_combo.setEnabled(enabled)
+        self.record_seconds_spin.setEnabled(enabled)
+
+    def toggle_recording(self, checked):
+        """Начать или остановить запись IQ"""
+        if not checked:
+            self.pluto_thread.stop_recording()
+            return
+
+        thread = self.pluto_thread
+        name = time.strftime("iq_%Y%m%d_%H%M%S") + f"_{thread.center_freq / 1e6:.3f}MHz"
+        path = os.path.join(SDRConfig.IQ_RECORD_DIRECTORY, name)
+        try:
+            thread.start_recording(path, self.record_format_combo.currentData(), self.record_seconds_spin.value())
+        except (OSError, ValueError) as e:
+            self.log_message(self.lang.get_text("record_error", str(e)))
+            self.record_btn.blockSignals(True)
+            self.record_btn.setChecked(False)
+            self.record_btn.blockSignals(False)
+            return
+        self.set_record_controls_enabled(False)
+        self.log_message(self.lang.get_text("record_started", path))
+
     def thread_finished(self):
         """Обработка завершения потока"""
         self.connect_btn.setEnabled(True)
         self.disconnect_btn.setEnabled(False)
         self.progress_bar.hide()
+        self.set_session_controls_enabled(True)
+        self.capture_stats_label.hide()
+        self.render_stats_label.hide()
         self.status_label.setText(self.lang.get_text("not_connected"))
         self.log_message(self.lang.get_text("pluto_disconnected"))
 
@@ -1003,30 +1413,142 @@ class PowerAnalyzer(QMainWindow):
         bw = self.bw_spin.value() * 1e6
         gain = self.gain_spin.value()
         buf_size = int(self.buffer_spin.currentText())
+        window = self.window_combo.currentData()
 
-        self.pluto_thread.update_settings(freq, sr, bw, gain, buf_size)
+        self.pluto_thread.update_settings(freq, sr, bw, gain, buf_size, window)
 
         # Обновляем частотную ось
-        self.freq_axis = np.linspace(-sr / 2, sr / 2, buf_size)
+        self.freq_axis = self.pluto_thread.engine.freq_axis
 
         # Обновляем отображение центральной частоты
         self.center_freq_label.setText(f"{freq/1e6:.3f} МГц")
 
         self.log_message(self.lang.get_text("settings_updated", freq/1e6, sr/1e6))
 
+    def on_frame(self, fft_data, rssi, peak_power, dominant_freq_info, freq_axis, center_freq):
+        """Прием кадра от потока: логирование сразу, отрисовка - по таймеру планировщика"""
+        self.frames_received += 1
+        timing = dominant_freq_info.get('timing')
+        if timing is not None:
+            timing['received'] = time.monotonic()
+            # Кадры, отправленные потоком, но еще не принятые, - очередь сигналов Qt
+            timing['signal_depth'] = self.pluto_thread.frames_emitted - self.frames_received
+        self.log_detection(rssi, peak_power, dominant_freq_info)
+        self.log_channel_onsets(rssi, peak_power, dominant_freq_info, center_freq)
+        self.record_history(rssi, peak_power)
+        self.record_bursts(dominant_freq_info)
+        self.record_waterfall(fft_data, freq_axis, center_freq)
+        self.render_scheduler.submit(fft_data, rssi, peak_power, dominant_freq_info, freq_axis, center_freq)
+
+    def record_history(self, rssi, peak_power):
+        """Запись точки истории (для каждого кадра, даже неотрисованного)"""
+        self.history.append(time.time() - self.start_time, rssi, peak_power)
+
+    def record_bursts(self, dominant_freq_info):
+        """Огибающая в историю, пакеты - в файл пакетов (для каждого кадра, даже неотрисованного)"""
+        envelope = dominant_freq_info.get('envelope')
+        if envelope is not None:
+            times, levels = envelope
+            self.envelope_history.extend(times - self.start_time, levels)
+        bursts = dominant_freq_info.get('bursts')
+        if bursts is None:
+            return
+        for burst in bursts:
+            self.burst_writer.submit(burst.item())
+        self.burst_count += len(bursts)
+        self.last_burst = bursts[-1]
+        self.update_burst_label()
+
+    def update_burst_label(self):
+        """Число пакетов и длительность и мощность последнего"""
+        burst = self.last_burst
+        if burst is None:
+            self.burst_stats_label.setText("")
+            return
+        self.burst_stats_label.setText(self.lang.get_text(
+            "burst_stats", self.burst_count, burst['duration'] * 1e3, burst['peak_power']
+        ))
+
+    def toggle_burst_envelope(self, checked):
+        """Обнаружение пакетов и огибающая на графике RSSI (применяется сразу)"""
+        self.pluto_thread.burst_detection = checked
+        self.envelope_history.clear()
+        if checked:
+            window = SDRConfig.BURST_WINDOW
+            self.log_message(self.lang.get_text(
+                "burst_detection_enabled", window, window / self.pluto_thread.sample_rate * 1e6
+            ))
+        else:
+            self.log_message(self.lang.get_text("burst_detection_disabled"))
+        self.redraw_history()
+
+    def record_waterfall(self, fft_data, freq_axis, center_freq):
+        """Запись строки водопада (для каждого кадра, даже неотрисованного)"""
+        if self.show_waterfall:
+            self.waterfall.append(fft_data, freq_axis, center_freq)
+
+    def log_detection(self, rssi, peak_power, dominant_freq_info):
+        """Детальное логирование с временным фильтром (для каждого кадра, даже неотрисованного)"""
+        if not dominant_freq_info['detected'] or not self.auto_log_checkbox.isChecked():
+            return
+        # Каждый обнаруженный сигнал выше порога логирования проверяется отдельно
+        peaks = dominant_freq_info['peaks']
+        for peak in peaks[peaks['power'] > self.log_threshold_spin.value()]:
+            if self.should_log_frequency(peak['frequency']):
+                freq_mhz = peak['frequency'] / 1e6
+                offset_khz = peak['freq_offset'] / 1e3
+                self.log_detailed_measurement(rssi, peak_power, freq_mhz, offset_khz, peak['power'])
+
+    def log_channel_onsets(self, rssi, peak_power, dominant_freq_info, center_freq):
+        """Запись в журнал каналов, ставших занятыми (для каждого кадра, даже неотрисованного)"""
+        channels = dominant_freq_info.get('channels')
+        if channels is None:
+            self._channels_busy = None
+            return
+        onsets = channel_onsets(self._channels_busy, channels)
+        self._channels_busy = channels['busy']
+        if not len(onsets) or not self.auto_log_checkbox.isChecked():
+            return
+        threshold = dominant_freq_info['channel_threshold']
+        now = time.time()
+        for channel in onsets:
+            self.detection_log.append(
+                now, channel['frequency'], channel['frequency'] - center_freq, rssi, peak_power, channel['power'], threshold
+            )
+        self.log_count += len(onsets)
+        self.log_count_label.setText(str(self.log_count))
+
     def update_data(self, fft_data, rssi, peak_power, dominant_freq_info, freq_axis, center_freq):
         """Обновление данных и графиков"""
+        timing = dominant_freq_info.get('timing')
+        if timing is not None:
+            timing['render_start'] = time.monotonic()
+
         # Обновляем частотную ось из полученных данных
         self.freq_axis = freq_axis
         
-        # Создаем абсолютную частотную ось (центральная частота + смещение)
-        absolute_freq_axis = freq_axis + center_freq
+        # Ось приходит из кэша движка спектра - абсолютную ось в МГц
+        # пересчитываем только при смене самой оси или центральной частоты
+        axis_changed = freq_axis is not self._axis_source or center_freq != self._axis_center_freq
+        if axis_changed:
+            self._axis_source = freq_axis
+            self._axis_center_freq = center_freq
+            self.absolute_freq_axis_mhz = (freq_axis + center_freq) / 1e6
+        absolute_freq_axis_mhz = self.absolute_freq_axis_mhz
         
-        # Устанавливаем диапазон частот на графике FFT (в МГц)
-        if len(absolute_freq_axis) > 0:
-            freq_min = absolute_freq_axis.min() / 1e6  # Конвертируем в МГц
-            freq_max = absolute_freq_axis.max() / 1e6
+        # Устанавливаем диапазон частот на графике FFT (в МГц);
+        # в профиле производительности - только когда ось сменилась после apply_settings
+        if len(absolute_freq_axis_mhz) > 0 and (axis_changed or not self.high_performance):
+            freq_min = absolute_freq_axis_mhz[0]
+            freq_max = absolute_freq_axis_mhz[-1]
             self.fft_plot.setXRange(freq_min, freq_max, padding=0.05)
+            # После перестройки выделение возвращается в полосу приема
+            start, stop = self.zoom_band
+            if axis_changed and self.pluto_thread.zoom_span is None and (start < freq_min or stop > freq_max):
+                half = min(stop - start, freq_max - freq_min) / 2
+                center = center_freq / 1e6
+                self.zoom_region.setRegion((center - half, center + half))
+                self.zoom_band = self.zoom_region.getRegion()
         # Обновляем статус
         if not self.disconnect_btn.isEnabled():
             self.connect_btn.setEnabled(False)
@@ -1045,20 +1567,16 @@ class PowerAnalyzer(QMainWindow):
             offset_khz = dominant_freq_info['freq_offset'] / 1e3
             power_db = dominant_freq_info['power']
             
-            self.dominant_freq_label.setText(f"{freq_mhz:.3f} МГц")
+            # Число остальных одновременно обнаруженных сигналов
+            others = len(dominant_freq_info['peaks']) - 1
+            self.dominant_freq_label.setText(f"{freq_mhz:.3f} МГц" + (f" (+{others})" if others else ""))
             self.freq_offset_label.setText(f"{offset_khz:+.1f} кГц")
             
-            # Детальное логирование с временным фильтром
-            if (self.auto_log_checkbox.isChecked() and 
-                power_db > self.log_threshold_spin.value() and
-                self.should_log_frequency(dominant_freq_info['frequency'])):
-                self.log_detailed_measurement(rssi, peak_power, freq_mhz, offset_khz, power_db)
         else:
             self.dominant_freq_label.setText(self.lang.get_text("not_detected"))
             self.freq_offset_label.setText("-")
 
         # Обновляем FFT график (используем абсолютные частоты в МГц)
-        absolute_freq_axis_mhz = absolute_freq_axis / 1e6
         self.fft_curve.setData(absolute_freq_axis_mhz, fft_data)
         
         # Обрабатываем HOLD данные
@@ -1068,26 +1586,33 @@ class PowerAnalyzer(QMainWindow):
                 # Инициализируем или пересоздаем массив HOLD данных
                 self.fft_hold_data = fft_data.copy()
             else:
-                # Обновляем максимальные значения
-                self.fft_hold_data = np.maximum(self.fft_hold_data, fft_data)
+                # Обновляем максимальные значения (на месте, без нового массива)
+                np.maximum(self.fft_hold_data, fft_data, out=self.fft_hold_data)
             
             # Обновляем кривую HOLD
             if hasattr(self, 'fft_hold_curve'):
                 self.fft_hold_curve.setData(absolute_freq_axis_mhz, self.fft_hold_data)
         
-        # Обновляем или добавляем маркер доминирующей частоты
-        if hasattr(self, 'peak_marker'):
+        # Обновляем кривую адаптивного порога
+        threshold = dominant_freq_info['threshold']
+        if threshold is not None:
+            self.cfar_curve.setData(absolute_freq_axis_mhz, threshold)
+        elif self.cfar_curve.xData is not None:
+            self.cfar_curve.clear()
+        
+        # Обновляем или добавляем маркеры обнаруженных сигналов
+        peaks = dominant_freq_info['peaks']
+        if self.high_performance:
+            self.peak_marker.setData(x=peaks['frequency'] / 1e6, y=peaks['power'])
+        elif hasattr(self, 'peak_marker'):
             self.fft_plot.removeItem(self.peak_marker)
         
-        if dominant_freq_info['detected']:
-            # Добавляем маркер на доминирующую частоту (используем абсолютную частоту)
-            absolute_freq_mhz = dominant_freq_info['frequency'] / 1e6  # Абсолютная частота в МГц
-            power_db = dominant_freq_info['power']
-            
-            # Создаем маркер в виде круга
+        if dominant_freq_info['detected'] and not self.high_performance:
+            # Добавляем маркеры на все найденные сигналы (используем абсолютные частоты в МГц)
+            # Создаем маркеры в виде кругов
             self.peak_marker = pg.ScatterPlotItem(
-                x=[absolute_freq_mhz], 
-                y=[power_db], 
+                x=peaks['frequency'] / 1e6, 
+                y=peaks['power'], 
                 symbol='o', 
                 size=15, 
                 brush='red', 
@@ -1095,21 +1620,277 @@ class PowerAnalyzer(QMainWindow):
             )
             self.fft_plot.addItem(self.peak_marker)
 
-        # Обновляем исторические данные
-        current_time = time.time() - self.start_time
-        self.time_history.append(current_time)
-        self.rssi_history.append(rssi)
-        self.peak_power_history.append(peak_power)
+        if self.show_waterfall:
+            self.redraw_waterfall()
 
-        # Ограничиваем историю (последние 1000 точек)
-        if len(self.time_history) > 1000:
-            self.time_history.pop(0)
-            self.rssi_history.pop(0)
-            self.peak_power_history.pop(0)
+        channels = dominant_freq_info.get('channels')
+        if channels is not None:
+            self.channel_levels = (channels, dominant_freq_info['channel_threshold'])
+            self.redraw_channels()
 
         # Обновляем временные графики
-        self.rssi_curve.setData(self.time_history, self.rssi_history)
-        self.power_curve.setData(self.time_history, self.peak_power_history)
+        self.redraw_history()
+
+        if timing is not None:
+            timing['render_end'] = time.monotonic()
+            self.pipeline_stats.record(timing)
+
+    def redraw_waterfall(self):
+        """Отрисовка водопада: последние строки кольца передаются в ImageItem без копирования"""
+        waterfall = self.waterfall
+        state = (waterfall.key, waterfall.count)
+        if waterfall.key is None or state == self._waterfall_drawn:
+            return
+        self._waterfall_drawn = state
+        self.waterfall_image.setImage(waterfall.view(), autoLevels=False)
+        # Прямоугольник изображения - по частоте как у спектра, по вертикали - строки
+        extent = (waterfall.extent, waterfall.depth)
+        if extent != self._waterfall_extent:
+            self._waterfall_extent = extent
+            left, width = waterfall.extent
+            self.waterfall_image.setRect(QRectF(left, 0, width, waterfall.depth))
+            self.waterfall_plot.setYRange(0, waterfall.depth, padding=0)
+
+    def redraw_channels(self):
+        """Столбцы мощности каналов плана и порог занятости"""
+        channels, threshold = self.channel_levels
+        frequencies = channels['frequency']
+        if self._channel_ticks is None or not np.array_equal(self._channel_ticks, frequencies):
+            self._channel_ticks = frequencies
+            # Подписи не налезают друг на друга: не больше 12 на оси
+            step = max(1, len(frequencies) // 12)
+            self.channel_plot.getAxis("bottom").setTicks(
+                [[(i, f"{frequencies[i] / 1e6:.3f}") for i in range(0, len(frequencies), step)]]
+            )
+            self.channel_plot.setXRange(-0.5, len(frequencies) - 0.5, padding=0.02)
+        # Столбцы начинаются на 10 дБ ниже шума банка; каналы вне полосы приема - пустые
+        base = threshold - SDRConfig.CHANNEL_BUSY_MARGIN - 10
+        heights = np.where(channels['in_band'], channels['power'] - base, 0.0)
+        brushes = [self.channel_busy_brush if busy else self.channel_idle_brush for busy in channels['busy']]
+        self.channel_bars.setOpts(x=np.arange(len(channels)), y0=base, height=heights, brushes=brushes)
+        self.channel_threshold_line.setPos(threshold)
+
+    def change_channel_plan(self, index):
+        """Смена плана каналов (применяется сразу, в том числе во время приема)"""
+        plan_name = self.channel_plan_combo.itemData(index)
+        SDRConfig.CHANNEL_PLAN = plan_name
+        self.pluto_thread.channel_plan = plan_name
+        self.channel_levels = None
+        self._channels_busy = None
+        self._channel_ticks = None
+        self.channel_bars.setOpts(x=[], height=[], brushes=None)
+        self.occupancy_table.setRowCount(0)
+        self.channels_group.setVisible(plan_name is not None)
+        self.log_message(self.lang.get_text("channel_plan_changed", self.channel_plan_combo.currentText()))
+
+    def change_occupancy_window(self, index):
+        """Смена окна таблицы занятости"""
+        self.occupancy_window_index = index
+        self.refresh_occupancy_table()
+
+    def refresh_occupancy_table(self):
+        """Таблица занятости каналов в выбранном окне (по таймеру, пока видна панель каналов)"""
+        occupancy = self.pluto_thread.occupancy
+        if occupancy is None or self.pluto_thread.channel_plan is None:
+            return
+        rows = occupancy.snapshot(time.time())
+        rows = rows[rows['window'] == self.occupancy_window_combo.currentData()]
+        table = self.occupancy_table
+        if table.rowCount() != len(rows):
+            table.setRowCount(len(rows))
+            for row in range(len(rows)):
+                for column in range(table.columnCount()):
+                    table.setItem(row, column, QTableWidgetItem())
+        for row, record in enumerate(rows):
+            observed = record['observed'] > 0
+            texts = (
+                f"{record['frequency'] / 1e6:.3f}",
+                f"{record['duty_cycle'] * 100:.2f}" if observed else "-",
+                str(record['bursts']),
+                f"{record['mean_power']:.1f}" if observed else "-",
+                f"{record['max_power']:.1f}" if observed else "-",
+            )
+            for column, text in enumerate(texts):
+                table.item(row, column).setText(text)
+
+    def export_occupancy(self):
+        """Сохранить занятость каналов во всех окнах в CSV в каталоге журналов"""
+        occupancy = self.pluto_thread.occupancy
+        if occupancy is None:
+            return
+        path = os.path.join(SDRConfig.LOG_DIRECTORY, time.strftime("occupancy_%Y%m%d_%H%M%S.csv"))
+        try:
+            write_occupancy_csv(path, occupancy.snapshot(time.time()))
+        except OSError as e:
+            self.log_message(self.lang.get_text("occupancy_export_error", str(e)))
+            return
+        self.log_message(self.lang.get_text("occupancy_exported", path))
+
+    def toggle_waterfall(self, checked):
+        """Показать или скрыть водопад; скрытый водопад не пополняется и начинается заново"""
+        self.show_waterfall = checked
+        self.waterfall.clear()
+        self.waterfall_plot.setVisible(checked)
+
+    def on_zoom_region_changed(self, region):
+        """Запомнить выделенную полосу масштабирования"""
+        self.zoom_band = tuple(region.getRegion())
+
+    def toggle_zoom(self, checked):
+        """Масштабирование выделенной полосы: спектр, пики и журнал - только по ней"""
+        if checked:
+            start, stop = self.zoom_band
+            thread = self.pluto_thread
+            # Полоса должна быть непустой и пересекаться с полосой приема (ZoomFFT обрезает ее по краям)
+            half = thread.sample_rate / 2e6
+            center = thread.center_freq / 1e6
+            low, high = max(start, center - half), min(stop, center + half)
+            if high <= low:
+                self.log_message(self.lang.get_text("zoom_invalid", start, stop))
+                self.zoom_btn.blockSignals(True)
+                self.zoom_btn.setChecked(False)
+                self.zoom_btn.blockSignals(False)
+                return
+            start, stop = low, high
+            decimation, size = zoom_parameters(
+                (stop - start) * 1e6, thread.sample_rate, thread.buffer_size,
+                SDRConfig.ZOOM_TAPS_PER_PHASE, SDRConfig.ZOOM_OVERSAMPLE
+            )
+            thread.zoom_span = (start * 1e6, stop * 1e6)
+            self.log_message(self.lang.get_text(
+                "zoom_enabled", start, stop, decimation, thread.sample_rate / decimation / size
+            ))
+        else:
+            self.pluto_thread.zoom_span = None
+            self.log_message(self.lang.get_text("zoom_disabled"))
+        self.zoom_region.setVisible(not checked)
+        # Спектры разных полос не сравниваются поэлементно
+        self.fft_hold_data = None
+
+    def change_waterfall_depth(self, depth):
+        """Новая глубина истории водопада (история начинается заново)"""
+        self.waterfall.resize(depth)
+
+    def redraw_history(self):
+        """Отрисовка истории, прореженной до ширины графика (min/max на пиксель)"""
+        # При обнаружении пакетов вместо RSSI кадров рисуется огибающая всех отсчетов
+        rssi_source = (self.envelope_history, 0) if self.pluto_thread.burst_detection else (self.history, 0)
+        for plot, curve, (history, channel) in ((self.rssi_plot, self.rssi_curve, rssi_source),
+                                                (self.power_plot, self.power_curve, (self.history, 1))):
+            view_box = plot.getViewBox()
+            # При ручном масштабе прореживается только видимый интервал
+            if view_box.autoRangeEnabled()[0]:
+                t_start = t_end = None
+            else:
+                t_start, t_end = view_box.viewRange()[0]
+            times, values = history.decimate(max(int(view_box.width()), 100), t_start, t_end)
+            curve.setData(times, values[:, channel])
+
+    def update_render_stats(self, stats):
+        """Отображение частоты приема и отрисовки кадров"""
+        self.render_stats_label.setText(self.lang.get_text(
+            "render_stats",
+            stats['received_fps'],
+            stats['rendered_fps'],
+            stats['skipped_frames'],
+        ))
+        self.render_stats_label.show()
+
+    def toggle_pipeline_stats(self, checked):
+        """Включение замеров задержек конвейера (статистика начинается заново)"""
+        self.pluto_thread.instrument = checked
+        self.pipeline_stats.clear()
+        if checked:
+            self.pipeline_label.setText(self.lang.get_text("pipeline_waiting"))
+            self.statusBar().show()
+            self.pipeline_timer.start()
+        else:
+            self.pipeline_timer.stop()
+            self.statusBar().hide()
+
+    def update_pipeline_stats(self):
+        """Панель задержек: p50/p95 по этапам в строке состояния, p99 и очереди - в подсказке"""
+        summary = self.pipeline_stats.summary()
+        stages = summary['stages']
+        if not stages:
+            return
+        self.pipeline_label.setText(self.lang.get_text("pipeline_stats", "  ".join(
+            f"{name} {values['p50']:.1f}/{values['p95']:.1f}" for name, values in stages.items()
+        )))
+        stage_lines = [f"{name}: p50 {values['p50']:.2f}  p95 {values['p95']:.2f}  p99 {values['p99']:.2f}  "
+                       f"max {values['max']:.2f}" for name, values in stages.items()]
+        queue_lines = [f"{name}: {values['mean']:.1f} / {values['max']:.0f}" for name, values in summary['queues'].items()]
+        self.pipeline_label.setToolTip(self.lang.get_text(
+            "pipeline_stats_tooltip", summary['frames'], "\n".join(stage_lines), "\n".join(queue_lines) or "-"
+        ))
+
+    def dump_pipeline_stats(self):
+        """Сохранить сводку и гистограммы задержек в JSON в каталоге журналов"""
+        path = os.path.join(SDRConfig.LOG_DIRECTORY, time.strftime("latency_%Y%m%d_%H%M%S.json"))
+        meta = {
+            'sample_rate': self.pluto_thread.sample_rate,
+            'buffer_size': self.pluto_thread.buffer_size,
+            'continuous': self.pluto_thread.continuous_mode,
+            'dsp_workers': self.pluto_thread.dsp_workers,
+            'display_fps': self.display_fps_spin.value(),
+            'render_profile': self.render_profile,
+        }
+        try:
+            os.makedirs(SDRConfig.LOG_DIRECTORY, exist_ok=True)
+            self.pipeline_stats.dump(path, meta)
+        except OSError as e:
+            self.log_message(self.lang.get_text("pipeline_dump_error", str(e)))
+            return
+        self.log_message(self.lang.get_text("pipeline_dumped", path))
+
+    def update_capture_stats(self, stats):
+        """Отображение статистики непрерывного захвата"""
+        self.capture_stats_label.setText(self.lang.get_text(
+            "capture_stats",
+            stats['duty_cycle'] * 100,
+            stats['dropped_blocks'],
+            stats['overflowed_blocks'],
+        ))
+        self.capture_stats_label.show()
+
+    def update_sweep_stats(self, stats):
+        """Отображение скорости панорамного обзора"""
+        self.capture_stats_label.setText(self.lang.get_text(
+            "sweep_stats",
+            stats['sweep_time'] * 1e3,
+            stats['steps'],
+            stats['rate'] / 1e6,
+        ))
+        self.capture_stats_label.show()
+
+    def update_record_stats(self, stats):
+        """Отображение статистики записи IQ"""
+        self.record_stats_label.setText(self.lang.get_text(
+            "record_stats",
+            stats['seconds'],
+            stats['throughput'],
+            stats['write_rate'],
+            stats['dropped_blocks'],
+        ))
+        self.record_stats_label.show()
+
+    def on_recording_finished(self, stats):
+        """Запись IQ завершена (остановлена, файл заполнен, сменилась частота дискретизации или ошибка)"""
+        self.record_btn.blockSignals(True)
+        self.record_btn.setChecked(False)
+        self.record_btn.blockSignals(False)
+        self.set_record_controls_enabled(True)
+        self.update_record_stats(stats)
+        if stats['error']:
+            self.log_message(self.lang.get_text("record_error", stats['error']))
+        self.log_message(self.lang.get_text(
+            "record_finished",
+            stats['path'],
+            stats['seconds'],
+            stats['throughput'],
+            stats['dropped_blocks'],
+            self.lang.get_text("record_reason_" + stats['reason']),
+        ))
 
     def handle_error(self, error_msg):
         """Обработка ошибок"""
@@ -1118,42 +1899,32 @@ class PowerAnalyzer(QMainWindow):
         self.progress_bar.hide()
         self.connect_btn.setEnabled(True)
         self.disconnect_btn.setEnabled(False)
+        self.set_session_controls_enabled(True)
 
     def log_message(self, message):
         """Добавление сообщения в лог"""
-        timestamp = time.strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
+        self.message_log.append(time.time(), message)
 
     def log_detailed_measurement(self, rssi, peak_power, freq_mhz, offset_khz, signal_power):
         """Детальное логирование измерений"""
-        timestamp = time.strftime("%H:%M:%S.%f")[:-3]  # С миллисекундами
         threshold = self.log_threshold_spin.value()
-        log_entry = (
-            f"[{timestamp}] "
-            f"Freq: {freq_mhz:8.3f} MHz | "
-            f"Offset: {offset_khz:+7.1f} kHz | "
-            f"RSSI: {rssi:6.1f} dBm | "
-            f"Peak: {peak_power:6.1f} dB | "
-            f"Signal: {signal_power:6.1f} dB | "
-            f"(T:{threshold:+3d}dB)"
-        )
-        self.detailed_log_text.append(log_entry)
+        self.detection_log.append(time.time(), freq_mhz * 1e6, offset_khz * 1e3, rssi, peak_power, signal_power, threshold)
         
         # Обновляем счетчик
         self.log_count += 1
         self.log_count_label.setText(str(self.log_count))
-        
-        # Автопрокрутка к последней записи
-        scrollbar = self.detailed_log_text.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+
+    def on_log_history_error(self, error_msg):
+        """Ошибка записи истории журнала на диск"""
+        self.log_message(self.lang.get_text("log_history_error", error_msg))
 
     def clear_detailed_log(self):
         """Очистка детального лога"""
-        self.detailed_log_text.clear()
+        self.detection_log.clear()
         self.log_count = 0
         self.log_count_label.setText("0")
         # Очищаем также историю частот
-        self.frequency_log_history.clear()
+        self.frequency_log_filter.clear()
         self.log_message(self.lang.get_text("log_cleared"))
 
     def update_log_threshold(self, value):
@@ -1168,11 +1939,13 @@ class PowerAnalyzer(QMainWindow):
     def update_log_timeout(self, value):
         """Обновление интервала временного фильтра"""
         SDRConfig.FREQUENCY_LOG_TIMEOUT = float(value)
+        self.frequency_log_filter.timeout = SDRConfig.FREQUENCY_LOG_TIMEOUT
         self.log_message(self.lang.get_text("log_interval_changed", value))
 
     def update_frequency_tolerance(self, value):
         """Обновление допуска частоты для определения того же канала"""
         SDRConfig.FREQUENCY_TOLERANCE = float(value * 1000)  # переводим кГц в Гц
+        self.frequency_log_filter.tolerance = SDRConfig.FREQUENCY_TOLERANCE
         self.log_message(self.lang.get_text("tolerance_changed", value))
 
     def update_detection_threshold(self, value):
@@ -1184,6 +1957,43 @@ class PowerAnalyzer(QMainWindow):
         self.detection_threshold_line.blockSignals(False)
         self.log_message(self.lang.get_text("detection_threshold_changed", value))
 
+    def update_detection_mode(self, *args):
+        """Смена режима порога обнаружения (применяется сразу)"""
+        mode = self.detection_mode_combo.currentData()
+        offset = self.cfar_offset_spin.value()
+        SDRConfig.DETECTION_MODE = mode
+        SDRConfig.CFAR_OFFSET = offset
+        self.pluto_thread.set_detection_mode(mode, offset)
+        self.update_detection_controls()
+        self.log_message(self.lang.get_text("detection_mode_changed", self.detection_mode_combo.currentText()))
+
+    def update_detection_controls(self):
+        """Доступность элементов фиксированного и адаптивного порога"""
+        adaptive = self.detection_mode_combo.currentData() == "adaptive"
+        self.detection_threshold_spin.setEnabled(not adaptive)
+        self.cfar_offset_spin.setEnabled(adaptive)
+        # Линия фиксированного порога в адаптивном режиме не используется
+        self.detection_threshold_line.setVisible(not adaptive)
+
+    def change_render_profile(self, index):
+        """Смена профиля отрисовки: графики пересоздаются с новыми настройками"""
+        profile = self.render_profile_combo.itemData(index)
+        if profile == self.render_profile:
+            return
+        self.render_profile = profile
+        apply_render_profile(profile)
+        self.recreate_interface()
+        self.log_message(self.lang.get_text("render_profile_changed", self.lang.get_text("render_profile_" + profile)))
+
+    def update_averaging(self, *args):
+        """Обновление режима усреднения спектра"""
+        mode = self.averaging_combo.currentData()
+        frames = self.averaging_frames_spin.value()
+        overlap = self.overlap_combo.currentData()
+        self.overlap_combo.setEnabled(mode == "welch")
+        self.pluto_thread.set_averaging(mode, frames, overlap)
+        self.log_message(self.lang.get_text("averaging_changed", self.averaging_combo.currentText(), frames))
+
     def clear_hold_data(self):
         """Очистка данных HOLD"""
         self.fft_hold_data = None
@@ -1215,32 +2025,7 @@ class PowerAnalyzer(QMainWindow):
 
     def should_log_frequency(self, frequency):
         """Проверить, нужно ли логировать данную частоту (временной фильтр)"""
-        current_time = time.time()
-        
-        # Ищем близкую частоту в истории
-        for logged_freq, last_time in list(self.frequency_log_history.items()):
-            # Проверяем, находится ли частота в пределах допуска
-            if abs(frequency - logged_freq) <= SDRConfig.FREQUENCY_TOLERANCE:
-                # Проверяем, прошло ли достаточно времени
-                if current_time - last_time < SDRConfig.FREQUENCY_LOG_TIMEOUT:
-                    return False  # Слишком рано для повторной записи
-                else:
-                    # Обновляем время для этой частоты
-                    del self.frequency_log_history[logged_freq]
-                    self.frequency_log_history[frequency] = current_time
-                    return True
-        
-        # Новая частота - добавляем в историю и разрешаем логирование
-        self.frequency_log_history[frequency] = current_time
-        
-        # Очищаем старые записи (старше 1 часа)
-        cutoff_time = current_time - 3600  # 1 час
-        self.frequency_log_history = {
-            freq: log_time for freq, log_time in self.frequency_log_history.items()
-            if log_time > cutoff_time
-        }
-        
-        return True
+        return self.frequency_log_filter.should_log(frequency)
 
     def save_splitter_state(self):
         """Сохранение состояния splitter"""
@@ -1262,9 +2047,14 @@ class PowerAnalyzer(QMainWindow):
         # Сохраняем состояние splitter
         self.save_splitter_state()
         
+        # Запись IQ дописывается до остановки потока, иначе файл останется без описания
+        self.pluto_thread.stop_recording(timeout=10.0)
         if self.pluto_thread.isRunning():
             self.pluto_thread.stop()
             self.pluto_thread.wait()
+        self.burst_writer.stop()
+        self.message_log.close()
+        self.detection_log.close()
         event.accept()
 
 
@@ -1272,7 +2062,7 @@ def main():
     app = QApplication(sys.argv)
 
     # Настройка стиля PyQtGraph
-    pg.setConfigOptions(antialias=True)
+    apply_render_profile(SDRConfig.RENDER_PROFILE)
     pg.setConfigOption("background", "w")
     pg.setConfigOption("foreground", "k")
 
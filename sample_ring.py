@@ -0,0 +1,147 @@
+"""
+Кольцевой буфер IQ-отсчетов и приемник непрерывного захвата
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class SampleRing:
+    """Предвыделенное кольцо блоков отсчетов (один писатель, один читатель)"""
+
+    def __init__(self, block_size, num_blocks=64, dtype=np.complex64, overwrite=True):
+        self.block_size = int(block_size)
+        self.num_blocks = int(num_blocks)
+        self.dtype = np.dtype(dtype)
+        # overwrite=False - писатель ждет читателя (воспроизведение файла без потерь)
+        self.overwrite = overwrite
+        self.blocks = np.zeros((self.num_blocks, self.block_size), dtype=self.dtype)
+        self.timestamps = np.zeros(self.num_blocks)
+        self.write_seq = 0          # номер следующего записываемого блока
+        self.read_seq = 0           # номер следующего читаемого блока
+        self.overflowed_blocks = 0  # блоки, перезаписанные до того, как их прочитали
+        self.last_read_time = 0.0   # время захвата последнего прочитанного блока
+        self.last_read_contiguous = True  # примыкает ли прочитанный блок к предыдущему
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write(self, samples, timestamp=None):
+        """Скопировать блок в кольцо (старые непрочитанные блоки перезаписываются)"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        n = min(len(samples), self.block_size)
+        with self._cond:
+            if not self.overwrite:
+                self._cond.wait_for(lambda: self.write_seq - self.read_seq < self.num_blocks or self.closed)
+                if self.closed:
+                    return
+            slot = self.write_seq % self.num_blocks
+            self.blocks[slot, :n] = samples[:n]
+            if n < self.block_size:
+                self.blocks[slot, n:] = 0
+            self.timestamps[slot] = timestamp
+            self.write_seq += 1
+            self._cond.notify()
+
+    def read(self, out=None, timeout=None):
+        """Прочитать следующий блок по порядку (None по таймауту или после close)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.write_seq > self.read_seq or self.closed, timeout):
+                return None
+            if self.write_seq == self.read_seq:
+                return None
+
+            # Читатель отстал больше, чем на длину кольца - часть блоков потеряна
+            lag = self.write_seq - self.read_seq
+            self.last_read_contiguous = lag <= self.num_blocks
+            if lag > self.num_blocks:
+                self.overflowed_blocks += lag - self.num_blocks
+                self.read_seq = self.write_seq - self.num_blocks
+
+            slot = self.read_seq % self.num_blocks
+            if out is None:
+                out = np.empty(self.block_size, dtype=self.dtype)
+            np.copyto(out, self.blocks[slot])
+            self.last_read_time = self.timestamps[slot]
+            self.read_seq += 1
+            self._cond.notify()
+        return out
+
+    def pending(self):
+        """Количество записанных, но еще не прочитанных блоков"""
+        with self._cond:
+            return min(self.write_seq - self.read_seq, self.num_blocks)
+
+    def close(self):
+        """Разбудить читателя и запретить дальнейшее ожидание"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class ContinuousReceiver(threading.Thread):
+    """Поток, непрерывно опустошающий буфер IIO в кольцо блоков"""
+
+    def __init__(self, sdr, ring, sample_rate, recorder=None):
+        super().__init__(daemon=True)
+        self.sdr = sdr
+        self.ring = ring
+        self.sample_rate = float(sample_rate)
+        self.recorder = recorder   # запись IQ получает каждый блок, даже если DSP отстает
+        self.running = False
+        self.error = None
+        self.blocks_captured = 0
+        self.captured_samples = 0  # отсчеты, полученные после первого блока
+        self.elapsed = 0.0         # секунды с момента получения первого блока
+
+    def run(self):
+        """Цикл приема: без пауз, только rx() и копирование в кольцо"""
+        self.running = True
+        start_time = None
+        while self.running:
+            try:
+                samples = self.sdr.rx()
+            except Exception as e:
+                self.error = e
+                break
+            now = time.monotonic()
+            self.ring.write(samples, now)
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.submit(samples)
+            self.blocks_captured += 1
+            # Время отсчитываем от конца первого блока, поэтому сам он не учитывается
+            if start_time is None:
+                start_time = now
+            else:
+                self.captured_samples += len(samples)
+                self.elapsed = now - start_time
+        self.running = False
+        self.ring.close()
+
+    def stop(self, timeout=1.0):
+        """Остановка приема"""
+        self.running = False
+        if not self.ring.overwrite:
+            self.ring.close()  # писатель может ждать места в кольце
+        self.join(timeout)
+
+    def stats(self):
+        """Статистика захвата: доля эфирного времени и потерянные блоки"""
+        # Для файла без темпа реального времени доля больше 100% - это скорость воспроизведения,
+        # а нехватка отсчетов означает медленную обработку, а не потери
+        expected_samples = self.elapsed * self.sample_rate
+        duty_cycle = self.captured_samples / expected_samples if expected_samples > 0 else 0.0
+        missing_samples = max(0.0, expected_samples - self.captured_samples)
+        if not getattr(self.sdr, "realtime", True):
+            missing_samples = 0.0
+        return {
+            'duty_cycle': duty_cycle,
+            'blocks_captured': self.blocks_captured,
+            'dropped_blocks': int(round(missing_samples / self.ring.block_size)),
+            'overflowed_blocks': self.ring.overflowed_blocks,
+            'ring_fill': self.ring.pending() / self.ring.num_blocks,
+        }
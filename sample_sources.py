@@ -0,0 +1,143 @@
+"""
+Источники отсчетов: ADALM-PLUTO, записанный IQ-файл и массив в памяти
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import os
+import time
+
+import numpy as np
+
+from iq_recorder import IQ_FORMATS, load_recording
+
+
+class SourceExhausted(Exception):
+    """Файл или массив воспроизведен до конца"""
+
+
+class RealtimeClock:
+    """Темп реального времени для программного источника отсчетов"""
+
+    MAX_LAG = 0.1  # секунды - отставание, которое покрывают буферы (как очередь буферов IIO в ядре)
+
+    def __init__(self):
+        self._next_time = None
+
+    def missed(self, sample_rate):
+        """Как у устройства: отсчеты за паузу между вызовами rx() дольше MAX_LAG теряются"""
+        now = time.monotonic()
+        if self._next_time is None or now - self._next_time <= self.MAX_LAG:
+            return 0
+        missed = int((now - self._next_time) * sample_rate)
+        self._next_time = now
+        return missed
+
+    def wait(self, count, sample_rate):
+        """Выдержать темп: блок из count отсчетов отдается не раньше, чем он был бы принят"""
+        now = time.monotonic()
+        if self._next_time is None:
+            self._next_time = now
+        self._next_time += count / float(sample_rate)
+        delay = self._next_time - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def open_pluto(uri=None):
+    """ADALM-PLUTO через pyadi-iio (библиотека импортируется только при подключении)"""
+    import adi
+    return adi.Pluto(uri) if uri else adi.Pluto()
+
+
+class ArraySource:
+    """Воспроизведение массива отсчетов блоками по rx_buffer_size с интерфейсом adi.Pluto"""
+
+    # PlutoThread настраивает источник теми же атрибутами, что и устройство, поэтому
+    # детектор, журналы и графики работают с записью без изменений. В режиме реального
+    # времени rx() выдает блоки с темпом sample_rate, иначе - сразу (обработка задает темп).
+
+    def __init__(self, samples, sample_rate, center_freq=0.0, realtime=True, loop=False):
+        self.samples = samples
+        self.rx_lo = int(center_freq)
+        self.sample_rate = int(sample_rate)
+        self.rx_rf_bandwidth = int(sample_rate)
+        self.rx_hardwaregain_chan0 = 0
+        self.rx_buffer_size = 2048
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.clock = RealtimeClock()
+
+    def __len__(self):
+        return len(self.samples)
+
+    def rx(self):
+        """Следующий блок (complex64); SourceExhausted в конце данных без повтора"""
+        n = int(self.rx_buffer_size)
+        total = len(self.samples)
+        if self.realtime:
+            self.position += self.clock.missed(self.sample_rate)
+            if self.loop and total > 0:
+                self.position %= total
+        if self.position >= total:
+            if not self.loop or total == 0:
+                raise SourceExhausted()
+            self.position = 0
+        block = self._read(self.position, min(n, total - self.position))
+        self.position += len(block)
+        if self.loop and len(block) < n and total > 0:
+            # На стыке повтора блок дополняется началом данных
+            self.position = n - len(block)
+            block = np.concatenate((block, self._read(0, min(self.position, total))))
+        if self.realtime:
+            self.clock.wait(len(block), self.sample_rate)
+        return block
+
+    def _read(self, start, count):
+        return np.array(self.samples[start:start + count], dtype=np.complex64)
+
+    def rx_destroy_buffer(self):
+        """Совместимость с adi.Pluto: буфер пересоздается при следующем rx()"""
+
+    def close(self):
+        """Освободить данные"""
+        self.samples = np.zeros(0, dtype=np.complex64)
+
+
+class FileSource(ArraySource):
+    """Воспроизведение IQ-файла: запись SigMF (ci16/cf32) или сырой файл .cf32/.ci16"""
+
+    # Файл отображается в память, поэтому длина записи не ограничена объемом ОЗУ.
+    # Для записи SigMF частоты берутся из описания, для сырого файла - из параметров.
+
+    def __init__(self, path, sample_rate=None, center_freq=None, realtime=True, loop=False):
+        base, ext = os.path.splitext(path)
+        self.metadata = None
+        if ext in (".sigmf-meta", ".sigmf-data") or os.path.exists(path + ".sigmf-meta"):
+            if ext not in (".sigmf-meta", ".sigmf-data"):
+                base = path
+            data, self.metadata = load_recording(base)
+            sample_rate = self.metadata["global"]["core:sample_rate"]
+            captures = self.metadata["captures"]
+            if captures:
+                center_freq = captures[0].get("core:frequency", center_freq)
+        else:
+            fmt = ext.lstrip(".")
+            if fmt not in IQ_FORMATS:
+                raise ValueError(f"Неизвестный формат IQ-файла: {path}")
+            if sample_rate is None:
+                raise ValueError("Для файла без описания SigMF нужна частота дискретизации")
+            item_dtype, items, _ = IQ_FORMATS[fmt]
+            data = np.memmap(path, dtype=item_dtype, mode="r")
+            data = data[:len(data) // items * items].reshape(-1, items) if items > 1 else data
+        self.path = path
+        super().__init__(data, sample_rate, center_freq or 0.0, realtime, loop)
+
+    def _read(self, start, count):
+        data = self.samples[start:start + count]
+        if data.ndim == 1:
+            return np.array(data, dtype=np.complex64)
+        block = np.empty(len(data), dtype=np.complex64)
+        block.real = data[:, 0]
+        block.imag = data[:, 1]
+        return block
@@ -0,0 +1,272 @@
+"""
+Централизованная конфигурация SDR, детектора, захвата и отображения (без зависимости от Qt)
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import os
+
+import numpy as np
+
+import dsp
+
+
+class SDRConfig:
+    """Централизованная конфигурация для всех настроек SDR"""
+    
+    # Основные параметры SDR
+    DEFAULT_FREQUENCY = 868e6      # Гц
+    DEFAULT_SAMPLE_RATE = 10.0e6   # Гц  
+    DEFAULT_BANDWIDTH = 5.0e6      # Гц
+    DEFAULT_GAIN = 30              # дБ
+    DEFAULT_BUFFER_SIZE = 2048     # отсчеты
+    
+    # Параметры детектора сигналов
+    SIGNAL_DETECTION_THRESHOLD = 100  # дБ - порог обнаружения доминирующей частоты
+    LOG_THRESHOLD = 100                # дБ - порог для записи в детальный лог
+    PEAK_MIN_SEPARATION = 100000.0     # Гц - минимальный разнос двух сигналов в одном кадре
+    PEAK_MIN_PROMINENCE = 6.0          # дБ - минимальная выраженность пика над окрестностью
+    MAX_PEAKS = 16                     # максимум сигналов в одном кадре
+    
+    # Параметры адаптивного порога (CFAR)
+    DETECTION_MODE = "fixed"           # fixed - порог SIGNAL_DETECTION_THRESHOLD, adaptive - CFAR по шумовому полу
+    CFAR_OFFSET = 12.0                 # дБ - превышение порога над оценкой шума
+    CFAR_TRAINING_CELLS = 16           # обучающих бинов с каждой стороны
+    CFAR_GUARD_CELLS = 2               # защитных бинов с каждой стороны
+    NOISE_FLOOR_FRAMES = 32            # кадров в экспоненциальном среднем шумового пола
+    
+    # Параметры временного фильтра для логирования
+    FREQUENCY_LOG_TIMEOUT = 10.0       # секунды - минимальный интервал между записями одной частоты
+    FREQUENCY_TOLERANCE = 50000.0      # Гц (50 кГц) - допуск для определения "того же" канала
+    FREQUENCY_LOG_RETENTION = 3600.0   # секунды - сколько помнить записанную частоту
+    
+    # Параметры журналов
+    LOG_VIEW_CAPACITY = 5000           # строк каждого журнала в окне (полная история - в файлах)
+    LOG_FLUSH_INTERVAL = 200           # мс - период пакетного добавления строк в журналы
+    LOG_DIRECTORY = "logs"             # каталог файлов истории журналов
+    DETECTION_FILE_FORMATS = ("text", "csv", "binary")  # файлы обнаружений: текст, CSV, записи для np.memmap
+    
+    # Параметры непрерывного захвата
+    CONTINUOUS_CAPTURE = False         # режим без пропусков по умолчанию выключен
+    RING_BUFFER_BLOCKS = 64            # блоков в кольцевом буфере отсчетов
+    RING_BUFFER_SAMPLES = 1 << 22      # предел отсчетов в кольце (32 МБ complex64) для больших буферов
+    KERNEL_BUFFERS = 4                 # буферов IIO в ядре для непрерывного приема
+    FRAME_EMIT_INTERVAL = 0.01         # секунды - минимальный интервал отправки кадров в GUI
+    CAPTURE_STATS_INTERVAL = 1.0       # секунды - период отправки статистики захвата
+    
+    # Замеры задержек конвейера
+    PIPELINE_INSTRUMENTATION = False   # метки времени этапов в каждом кадре (выключено - без затрат)
+    PIPELINE_WINDOW = 1024             # кадров в скользящем окне процентилей
+    PIPELINE_STATS_INTERVAL = 1000     # мс - период обновления панели в строке состояния
+    
+    # Панорамный обзор (перестройка rx_lo по диапазону)
+    SWEEP_START = 863e6                # Гц - начало диапазона обзора
+    SWEEP_STOP = 870e6                 # Гц - конец диапазона обзора
+    SWEEP_USABLE_FRACTION = 0.8        # доля полосы сегмента без спада фильтров (края отбрасываются)
+    SWEEP_SETTLE_BUFFERS = 2           # буферов, отбрасываемых после перестройки (установка синтезатора)
+    SWEEP_DWELL_BUFFERS = 1            # буферов, усредняемых на каждом шаге
+    
+    # Масштабирование спектра (zoom FFT выбранной полосы)
+    ZOOM_SPAN = 200e3                  # Гц - начальная ширина выделения на графике FFT
+    ZOOM_TAPS_PER_PHASE = 8            # длина ФНЧ в отсчетах после прореживания (крутизна спада)
+    ZOOM_OVERSAMPLE = 1.25             # запас выходной частоты над шириной полосы (переходная полоса ФНЧ)
+    
+    # Мощность каналов плана частот (многофазный банк фильтров)
+    CHANNEL_PLAN = None                # ключ CHANNEL_PLANS или None - выключено
+    CHANNEL_PLANS = {
+        "eu868_lora": {
+            "name": "EU868 LoRa",
+            "spacing": 200e3,          # Гц - шаг сетки каналов (ширина канала банка)
+            "channels": [867.1e6, 867.3e6, 867.5e6, 867.7e6, 867.9e6,
+                         868.1e6, 868.3e6, 868.5e6, 869.525e6],
+        },
+        "eu868_srd": {
+            "name": "EU868 SRD 100 kHz",
+            "spacing": 100e3,
+            "channels": [863.05e6 + 100e3 * i for i in range(70)],
+        },
+    }
+    CHANNEL_TAPS = 8                   # длина фильтра-прототипа в шагах каналов (подавление соседних)
+    CHANNEL_BUSY_MARGIN = 10.0         # дБ - превышение мощности канала над медианой банка (занят)
+    OCCUPANCY_WINDOWS = ((60, 60), (3600, 60), (86400, 96))  # скользящие окна занятости: (секунды, интервалов)
+    OCCUPANCY_REFRESH_INTERVAL = 1000  # мс - период обновления таблицы занятости
+    OCCUPANCY_EXPORT_INTERVAL = 60.0   # секунды - период перезаписи CSV занятости в мониторе
+    
+    # Обнаружение пакетов во временной области (огибающая мощности скользящим окном)
+    BURST_DETECTION = False            # выключено - огибающая не считается
+    BURST_WINDOW = 64                  # отсчетов в окне огибающей (края пакетов точны для пакетов не короче окна)
+    BURST_MARGIN = 6.0                 # дБ - превышение порога над шумовым полом огибающей
+    BURST_FLOOR_RISE = 3.0             # дБ/с - наибольшая скорость роста оценки шумового пола
+    BURST_ENVELOPE_POINTS = 256        # точек огибающей на блок для графика
+    
+    # Параметры записи IQ
+    IQ_RECORD_DIRECTORY = "recordings" # каталог записей (.sigmf-data + .sigmf-meta)
+    IQ_RECORD_FORMAT = "ci16"          # ci16 - целые 16 бит (как у АЦП), cf32 - комплексные float32
+    IQ_RECORD_SECONDS = 60             # секунды - размер предвыделенного файла записи
+    IQ_RECORD_QUEUE_SECONDS = 2.0      # секунды эфира в очереди записи (запас на задержки диска)
+    
+    # Источник отсчетов
+    SAMPLE_SOURCE = "pluto"            # pluto - устройство, file - воспроизведение IQ-файла, simulator - модель эфира
+    SAMPLE_SOURCES = ("pluto", "file", "simulator")
+    REPLAY_REALTIME = True             # файл и симулятор в темпе реального времени (иначе - как можно быстрее)
+    SIMULATOR_SEED = 0                 # начальное значение генератора шума симулятора
+    
+    # Параметры обработки
+    DSP_WORKERS = 0                    # процессов DSP (0 - обработка в потоке PLUTO)
+    # Блоки короче обрабатываются в потоке приема и при включенном пуле: копирование в
+    # разделяемую память и очереди стоят ~35 мкс на блок 2048 (столько же, сколько сама
+    # обработка), а до 16384 многопоточный FFT в одном процессе быстрее пула
+    DSP_POOL_MIN_BLOCK = 65536
+    FFT_WINDOW = "hann"                # окно FFT (rect, hann, hamming, blackman)
+    FFT_WORKERS = os.cpu_count() or 1  # потоков FFT для scipy.fft / pyFFTW
+    
+    # Параметры отображения
+    DISPLAY_FPS = 30                   # кадров в секунду на графиках (не зависит от скорости DSP)
+    RENDER_PROFILE = "quality"         # quality - сглаживание и толстые линии, performance - быстрая отрисовка
+    RENDER_PROFILES = ("quality", "performance")
+    DISPLAY_COLUMNS = 2048             # столбцов спектра в кадре для отображения (минимум и максимум на столбец)
+    HISTORY_CAPACITY = 1 << 20         # точек истории RSSI и пиковой мощности (~3 ч при 100 кадрах/с)
+    WATERFALL_ENABLED = True           # водопад под графиком FFT
+    WATERFALL_DEPTH = 1000             # строк (кадров) в истории водопада
+    WATERFALL_MAX_DEPTH = 10000
+    WATERFALL_LEVELS = None            # (минимум, максимум) дБ палитры; None - по уровню шума первого кадра
+    WATERFALL_COLORMAP = "viridis"     # палитра pyqtgraph.colormap
+    WATERFALL_HEIGHT = 200             # начальная высота панели водопада, пикселей
+    
+    # Параметры усреднения спектра
+    AVERAGING_MODE = "off"             # off, linear, exponential, welch
+    AVERAGING_FRAMES = 8               # кадров в среднем (для экспоненциального - эквивалентная длина)
+    WELCH_OVERLAP = 0.5                # перекрытие сегментов Уэлча (0.5 - 0.75)
+    
+    # Параметры для GUI
+    GUI_CONFIG = {
+        "frequency": {
+            "min": 70.0,           # МГц
+            "max": 6000.0,         # МГц
+            "default": 868.0,      # МГц (DEFAULT_FREQUENCY / 1e6)
+            "decimals": 3
+        },
+        "sample_rate": {
+            "min": 0.5,            # МГц
+            "max": 56.0,           # МГц
+            "default": 10.0,       # МГц (DEFAULT_SAMPLE_RATE / 1e6)
+            "decimals": 1
+        },
+        "bandwidth": {
+            "min": 0.2,            # МГц
+            "max": 56.0,           # МГц
+            "default": 5.0,        # МГц (DEFAULT_BANDWIDTH / 1e6)
+            "decimals": 1
+        },
+        "gain": {
+            "min": 0,              # дБ
+            "max": 76,             # дБ
+            "default": 30          # дБ (DEFAULT_GAIN)
+        },
+        "buffer_sizes": ["1024", "2048", "4096", "8192", "16384", "32768", "65536",
+                         "131072", "262144", "524288", "1048576"],
+        "default_buffer": "2048"   # str(DEFAULT_BUFFER_SIZE)
+    }
+    
+    @classmethod
+    def get_default_freq_axis(cls):
+        """Получить частотную ось по умолчанию"""
+        return dsp.make_freq_axis(cls.DEFAULT_SAMPLE_RATE, cls.DEFAULT_BUFFER_SIZE)
+    
+    @classmethod 
+    def get_default_fft_data(cls):
+        """Получить массив FFT данных по умолчанию"""
+        return np.zeros(cls.DEFAULT_BUFFER_SIZE)
+    
+    @classmethod
+    def get_presets(cls):
+        """Получить предустановленные конфигурации"""
+        return {
+            "lora_868": {
+                "frequency": {"default": 868.0},
+                "sample_rate": {"default": 1.0},
+                "bandwidth": {"default": 0.5},
+                "gain": {"default": 40},
+            },
+            "wifi_2.4g": {
+                "frequency": {"default": 2400.0},
+                "sample_rate": {"default": 20.0},
+                "bandwidth": {"default": 10.0},
+                "gain": {"default": 30},
+            },
+            "bluetooth": {
+                "frequency": {"default": 2440.0},
+                "sample_rate": {"default": 10.0},
+                "bandwidth": {"default": 5.0},
+                "gain": {"default": 35},
+            },
+            "868": {
+                "frequency": {"default": 868.0},
+                "sample_rate": {"default": 10.0},
+                "bandwidth": {"default": 5.0},
+                "gain": {"default": 35},
+            },
+            "915": {
+                "frequency": {"default": 915.0},
+                "sample_rate": {"default": 10.0},
+                "bandwidth": {"default": 26.0},
+                "gain": {"default": 35},
+            },
+            "fm_radio": {
+                "frequency": {"default": 100.0},
+                "sample_rate": {"default": 5.0},
+                "bandwidth": {"default": 2.0},
+                "gain": {"default": 25},
+            },
+            "gps_l1": {
+                "frequency": {"default": 1575.42},
+                "sample_rate": {"default": 10.0},
+                "bandwidth": {"default": 5.0},
+                "gain": {"default": 45},
+            },
+            "lte_2100": {
+                "frequency": {"default": 2100.0},
+                "sample_rate": {"default": 30.0},
+                "bandwidth": {"default": 20.0},
+                "gain": {"default": 30},
+            },
+        }
+    
+    @classmethod
+    def update_defaults(cls, frequency=None, sample_rate=None, bandwidth=None, gain=None, buffer_size=None):
+        """Обновить значения по умолчанию и синхронизировать GUI конфигурацию"""
+        if frequency is not None:
+            cls.DEFAULT_FREQUENCY = frequency
+            cls.GUI_CONFIG["frequency"]["default"] = frequency / 1e6
+            
+        if sample_rate is not None:
+            cls.DEFAULT_SAMPLE_RATE = sample_rate
+            cls.GUI_CONFIG["sample_rate"]["default"] = sample_rate / 1e6
+            
+        if bandwidth is not None:
+            cls.DEFAULT_BANDWIDTH = bandwidth
+            cls.GUI_CONFIG["bandwidth"]["default"] = bandwidth / 1e6
+            
+        if gain is not None:
+            cls.DEFAULT_GAIN = gain
+            cls.GUI_CONFIG["gain"]["default"] = gain
+            
+        if buffer_size is not None:
+            cls.DEFAULT_BUFFER_SIZE = buffer_size
+            cls.GUI_CONFIG["default_buffer"] = str(buffer_size)
+    
+    @classmethod
+    def update_log_threshold(cls, threshold):
+        """Обновить порог логирования"""
+        cls.LOG_THRESHOLD = threshold
+    
+    @classmethod
+    def update_detection_threshold(cls, threshold):
+        """Обновить порог обнаружения"""
+        cls.SIGNAL_DETECTION_THRESHOLD = threshold
+
+    @classmethod
+    def get_detection_params(cls):
+        """Текущие параметры детектора сигналов"""
+        return dsp.DetectionParams(
+            cls.SIGNAL_DETECTION_THRESHOLD, cls.PEAK_MIN_SEPARATION, cls.PEAK_MIN_PROMINENCE, cls.MAX_PEAKS
+        )
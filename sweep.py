@@ -0,0 +1,52 @@
+"""
+Панорамный обзор: шаги перестройки rx_lo по диапазону и сшивка спектров сегментов
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import math
+
+import numpy as np
+
+
+class SweepPlan:
+    """Центральные частоты шагов и панорама из центральных частей спектров сегментов"""
+
+    # Шаг перестройки - целое число бинов, поэтому бины всех сегментов ложатся на одну
+    # сетку панорамы без интерполяции. Соседние сегменты перекрываются на (1 - usable_fraction)
+    # полосы: края каждого спектра (спад фильтров АЦП и аналоговой полосы) отбрасываются,
+    # а центральные части стыкуются встык. Центр шага i - бин i*usable + usable/2 панорамы.
+
+    def __init__(self, start, stop, sample_rate, buffer_size, usable_fraction=0.8):
+        self.start = float(min(start, stop))
+        self.stop = float(max(start, stop))
+        self.sample_rate = float(sample_rate)
+        self.size = int(buffer_size)
+        self.bin_width = self.sample_rate / self.size
+        usable = int(self.size * usable_fraction) // 2 * 2
+        self.usable = max(2, min(self.size, usable))
+        self.trim = (self.size - self.usable) // 2
+        self.bins = max(1, math.ceil((self.stop - self.start) / self.bin_width))
+        self.steps = max(1, math.ceil(self.bins / self.usable))
+        self.centers = self.start + (np.arange(self.steps) * self.usable + self.usable // 2) * self.bin_width
+        self.freq_axis = self.start + np.arange(self.bins) * self.bin_width  # абсолютные частоты, Гц
+        self.center_freq = float(self.freq_axis[self.bins // 2])
+        self.offset_axis = self.freq_axis - self.center_freq               # как ось FFT кадра
+        self.power = np.zeros(self.steps * self.usable)
+        self.segment_power = np.zeros(self.steps)  # средняя мощность отсчетов шага (для RSSI)
+
+    @property
+    def key(self):
+        return (self.start, self.stop, self.sample_rate, self.size)
+
+    def add_segment(self, step, power, mean_power):
+        """Записать центральную часть спектра мощности шага (после fftshift) в панораму"""
+        self.power[step * self.usable:(step + 1) * self.usable] = power[self.trim:self.trim + self.usable]
+        self.segment_power[step] = mean_power
+
+    def spectrum_db(self):
+        """Панорама в дБ (та же шкала, что и спектр одного кадра), обрезанная до диапазона"""
+        return 10 * np.log10(self.power[:self.bins] + 1e-24)
+
+    def rssi(self):
+        """RSSI по всем шагам (та же калибровка, что и dsp.calculate_rssi)"""
+        return 10 * np.log10(self.segment_power.mean() + 1e-24) + 30
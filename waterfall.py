@@ -0,0 +1,84 @@
+"""
+Буфер водопада (спектрограммы): кольцо строк индексов палитры с прореживанием до ширины экрана
+Автор: ADALM-PLUTO Power Analyzer
+"""
+
+import numpy as np
+
+
+class WaterfallBuffer:
+    """Последние depth спектров в виде строк индексов палитры (uint8)"""
+
+    # Каждая строка пишется дважды - в позиции head и head + depth, поэтому последние
+    # depth строк всегда лежат в памяти подряд и view() отдает срез без копирования.
+    # Спектр квантуется в индексы палитры один раз при записи (O(ширины строки)), а цвета
+    # по таблице подставляет Qt при отрисовке (QImage Indexed8) - изображение целиком
+    # не пересчитывается. Строка прореживается до max_width столбцов максимумом по
+    # столбцу, чтобы узкие сигналы не пропадали.
+
+    def __init__(self, depth, max_width, levels=None):
+        self.depth = max(1, int(depth))
+        self.max_width = max(1, int(max_width))
+        self.fixed_levels = levels  # (минимум, максимум) дБ или None - по первой строке
+        self.levels = None
+        self.key = None
+        self.extent = None    # (левый край, ширина) по частоте, МГц
+        self.columns = 0
+        self.count = 0
+        self.head = 0
+        self._edges = None
+        self._row = None
+        self.rows = np.zeros((0, 0), dtype=np.uint8)
+
+    def resize(self, depth):
+        """Новая глубина истории (накопленные строки сбрасываются)"""
+        self.depth = max(1, int(depth))
+        self.key = None
+
+    def clear(self):
+        """Сброс истории (строки перезаписываются с нуля при следующем append)"""
+        self.key = None
+
+    def _configure(self, size, freq_axis, center_freq):
+        """Столбцы, границы прореживания и палитра для нового набора оси частот"""
+        self.columns = min(size, self.max_width)
+        self._edges = (np.arange(self.columns) * size) // self.columns if self.columns < size else None
+        self._row = np.empty(self.columns, dtype=np.float64)
+        self.rows = np.zeros((2 * self.depth, self.columns), dtype=np.uint8)
+        self.count = 0
+        self.head = 0
+        self.levels = self.fixed_levels
+        bin_width = (freq_axis[-1] - freq_axis[0]) / (size - 1) if size > 1 else 1.0
+        self.extent = ((freq_axis[0] + center_freq - bin_width / 2) / 1e6, size * bin_width / 1e6)
+
+    def append(self, spectrum_db, freq_axis, center_freq):
+        """Добавить спектр кадра (при смене оси частот история начинается заново)"""
+        size = len(spectrum_db)
+        key = (size, float(freq_axis[0]), float(freq_axis[-1]), float(center_freq), self.depth)
+        if key != self.key:
+            self._configure(size, freq_axis, center_freq)
+            self.key = key
+
+        row = self._row
+        if self._edges is not None:
+            np.maximum.reduceat(spectrum_db, self._edges, out=row)
+        else:
+            row[:] = spectrum_db
+        if self.levels is None:
+            # Без заданного диапазона: от уровня шума первой строки на 80 дБ вверх
+            floor = float(np.median(row)) - 10.0
+            self.levels = (floor, max(floor + 80.0, float(row.max()) + 5.0))
+        low, high = self.levels
+        row -= low
+        row *= 255.0 / (high - low)
+        np.clip(row, 0, 255, out=row)
+        indices = row.astype(np.uint8)
+
+        self.rows[self.head] = indices
+        self.rows[self.head + self.depth] = indices
+        self.head = (self.head + 1) % self.depth
+        self.count += 1
+
+    def view(self):
+        """Последние depth строк подряд: старые внизу (строка 0), новая - последней"""
+        return self.rows[self.head:self.head + self.depth]